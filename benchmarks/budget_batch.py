@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Parity check for calculate_budget_breakdown_batch
+
+Compares the vectorized batch function against calculate_budget_breakdown
+for randomized array inputs and for all-scalar inputs (including .5 ties
+such as 12.345), and fails (exit code 1) on any difference.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from src.tools.budget_calculator import (STYLE_MULTIPLIERS, calculate_budget_breakdown,  # noqa: E402
+                                         calculate_budget_breakdown_batch)
+
+# All-scalar calls whose results sit on rounding ties
+SCALAR_CASES = [
+    ("paris", 1, 12.345, "mixed", 1),
+    ("paris", 1, 0.1, "mixed", 1),
+    ("paris", 4, 0.1, "mixed", 1),
+    ("tokyo", 3, 1000.005, "luxury", 2),
+    ("nowhere", 7, 2.675, "budget", 3),
+]
+
+
+def scenario(batch, i=None):
+    """Return scenario ``i`` of a batch result (or the only one) as plain Python values"""
+    pick = (lambda value: value.item()) if i is None else (lambda value: value[i].item())
+    return {
+        key: ({name: pick(amounts) for name, amounts in value.items()} if isinstance(value, dict) else pick(value))
+        for key, value in batch.items()
+    }
+
+
+def check(label: str, ok: bool, detail: str) -> bool:
+    print(f"{'✅' if ok else '❌'} {label}: {detail}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenarios", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    styles = list(STYLE_MULTIPLIERS) + ["unknown"]
+    durations = [rng.randint(1, 30) for _ in range(args.scenarios)]
+    budgets = [round(rng.uniform(0, 20000), rng.choice([0, 1, 2, 3])) for _ in range(args.scenarios)]
+    trip_styles = [rng.choice(styles) for _ in range(args.scenarios)]
+    travelers = [rng.randint(1, 6) for _ in range(args.scenarios)]
+
+    start = time.perf_counter()
+    batch = calculate_budget_breakdown_batch("paris", np.array(durations), np.array(budgets),
+                                             np.array(trip_styles), np.array(travelers))
+    elapsed = time.perf_counter() - start
+    mismatches = sum(
+        scenario(batch, i) != calculate_budget_breakdown("paris", durations[i], budgets[i], trip_styles[i],
+                                                         travelers[i])
+        for i in range(args.scenarios)
+    )
+    ok = check("array inputs", mismatches == 0,
+               f"{mismatches} of {args.scenarios} scenarios differ (batch took {elapsed * 1000:.1f} ms)")
+
+    scalar_mismatches = [case for case in SCALAR_CASES
+                         if scenario(calculate_budget_breakdown_batch(*case))
+                         != calculate_budget_breakdown(*case)]
+    ok &= check("scalar inputs", not scalar_mismatches,
+                f"{len(scalar_mismatches)} of {len(SCALAR_CASES)} all-scalar calls differ {scalar_mismatches or ''}")
+
+    print("✅ Batch budget parity checks passed" if ok else "❌ Batch budget parity checks failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Destination data pack benchmark
+
+Builds a synthetic pack of many destinations (copies of the built-in ones)
+and a pack a tenth of its size, then measures lookup latency on the large
+pack and, in a separate pass under tracemalloc, the peak memory a catalog
+over each pack holds for the same lookups. Also checks that tool results
+match the built-in catalog and that a newly built pack is picked up without
+a restart. Fails (exit code 1) when a cold lookup exceeds the budget, the
+peak grows with the pack size, or a check fails.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.tools.budget_calculator import calculate_budget_breakdown  # noqa: E402
+from src.tools.catalog import DESTINATION_DATA, DestinationCatalog, set_catalog  # noqa: E402
+from src.tools.datapack import DataPackCatalog, build_data_pack  # noqa: E402
+from src.tools.destination_research import research_destination  # noqa: E402
+from src.tools.weather_checker import get_seasonal_weather  # noqa: E402
+
+
+def write_source(path: str, count: int, extra=None):
+    templates = list(DESTINATION_DATA.values())
+    destinations = {f"city {i:05d}": templates[i % len(templates)] for i in range(count)}
+    destinations.update(extra or {})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"destinations": destinations}, f)
+
+
+def tool_results():
+    results = []
+    for destination in list(DESTINATION_DATA) + ["nowhere"]:
+        results.append(research_destination(destination, ["culture", "food"]))
+        results.append(get_seasonal_weather(destination, "May"))
+        results.append(calculate_budget_breakdown(destination, 5, 2500, "mixed", 2))
+    return results
+
+
+def time_lookups(pack: str, ids):
+    """Return the open time and cold and warm lookup times, without tracemalloc"""
+    start = time.perf_counter()
+    catalog = DataPackCatalog(pack)
+    open_seconds = time.perf_counter() - start
+    try:
+        cold = []
+        for destination_id in ids:
+            start = time.perf_counter()
+            catalog.get(destination_id)
+            cold.append(time.perf_counter() - start)
+        warm = []
+        for destination_id in ids:
+            start = time.perf_counter()
+            catalog.get(destination_id)
+            warm.append(time.perf_counter() - start)
+    finally:
+        catalog.close()
+    return open_seconds, cold, warm
+
+
+def peak_memory(pack: str, ids) -> int:
+    """Return the peak traced bytes of opening a pack and looking up (and indexing) ``ids``"""
+    tracemalloc.start()
+    try:
+        catalog = DataPackCatalog(pack)
+        for destination_id in ids:
+            catalog.get(destination_id)
+            catalog.interest_index(destination_id)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    catalog.close()
+    return peak
+
+
+def check(label: str, ok: bool, detail: str) -> bool:
+    print(f"{'✅' if ok else '❌'} {label}: {detail}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--destinations", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--budget-us", type=float, default=500.0, help="median cold lookup budget in microseconds")
+    parser.add_argument("--memory-tolerance", type=float, default=0.2,
+                        help="max relative growth of the peak from the small to the large pack")
+    args = parser.parse_args(argv)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "destinations.json")
+        pack = os.path.join(tmp, "destinations.pack")
+        small_pack = os.path.join(tmp, "destinations-small.pack")
+        small_size = max(args.destinations // 10, 1)
+        write_source(source, small_size)
+        build_data_pack([source], small_pack, include_builtin=True)
+        write_source(source, args.destinations)
+        stats = build_data_pack([source], pack, include_builtin=True)
+        print(f"Built {stats['destinations']} destinations ({stats['bytes'] / 1024 / 1024:.1f} MiB) "
+              f"in {stats['seconds']:.2f} s")
+
+        # The same ids exist in both packs
+        ids = [f"city {i:05d}" for i in random.Random(0).sample(range(small_size),
+                                                               min(args.lookups, small_size))]
+        open_seconds, cold, warm = time_lookups(pack, ids)
+        cold_us = statistics.median(cold) * 1e6
+        print(f"Opened in {open_seconds * 1000:.1f} ms; median lookup {cold_us:.0f} µs cold, "
+              f"{statistics.median(warm) * 1e6:.1f} µs warm")
+        ok &= check("lookup latency", cold_us <= args.budget_us,
+                    f"median cold lookup {cold_us:.0f} µs (budget {args.budget_us:.0f} µs)")
+
+        # Only looked-up entries are decoded: memory tracks the LRU, not the pack
+        small_peak = peak_memory(small_pack, ids)
+        peak = peak_memory(pack, ids)
+        ok &= check("memory", peak <= small_peak * (1 + args.memory_tolerance),
+                    f"peak {peak / 1024:.0f} KiB with {stats['destinations']} destinations vs "
+                    f"{small_peak / 1024:.0f} KiB with {small_size + len(DESTINATION_DATA)} "
+                    f"for the same {len(ids)} lookups")
+
+        catalog = DataPackCatalog(pack)
+        expected = tool_results()
+        set_catalog(catalog)
+        try:
+            ok &= check("tool results", tool_results() == expected,
+                        "research, weather and budget match the built-in catalog")
+
+            catalog.reload_interval = 0.05
+            write_source(source, args.destinations, {"atlantis": DESTINATION_DATA["paris"]})
+            build_data_pack([source], pack, include_builtin=True)
+            time.sleep(0.1)
+            reloaded = catalog.get("Atlantis") is not None and "atlantis" in catalog.ids()
+            ok &= check("hot reload", reloaded and catalog.reloads == 1,
+                        f"new pack picked up after {catalog.reloads} reload(s)")
+        finally:
+            set_catalog(DestinationCatalog(DESTINATION_DATA))
+            catalog.close()
+
+    print("✅ Data pack checks passed" if ok else "❌ Data pack checks failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
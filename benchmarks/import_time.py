@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the Travel Itinerary Agent
+
+Imports src.agent in fresh interpreters and fails (exit code 1) when a
+heavy tool dependency is loaded eagerly, or when the median cold import is
+more than --max-ratio times that of the framework packages src.agent itself
+needs (langgraph, langchain), measured alongside it in the same run. The
+ratio keeps the wall-clock check stable across machines and noisy runs.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported when a tool actually needs them
+LAZY_MODULES = ["matplotlib", "numpy", "folium", "geopy", "src.tools.budget_calculator",
+                "src.tools.map_visualizer", "src.tools.interactive_map", "src.tools.datapack"]
+
+# Third-party imports src.agent cannot avoid; their cold import is the baseline
+BASELINE_IMPORT = "import langgraph.graph, langchain_openai, langchain_core.messages, langchain_core.runnables"
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def _probe(statement: str):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE % (statement, LAZY_MODULES)], cwd=ROOT, check=True,
+        capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_import(runs: int = 5):
+    """Return the cold import times of src.agent and of the baseline, and any
+    eagerly loaded heavy modules
+
+    The two imports alternate so machine load affects both alike.
+    """
+    timings, baseline = [], []
+    loaded = set()
+    for _ in range(runs):
+        baseline.append(_probe(BASELINE_IMPORT)["seconds"])
+        result = _probe("import src.agent")
+        timings.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return timings, baseline, sorted(loaded)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-ratio", type=float, default=1.5,
+                        help="max median import time of src.agent relative to the baseline import")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    timings, baseline, loaded = measure_import(args.runs)
+    median = statistics.median(timings)
+    baseline_median = statistics.median(baseline)
+    ratio = median / baseline_median
+    print(f"⏱️  import src.agent: median {median * 1000:.0f} ms over {args.runs} runs, "
+          f"{ratio:.2f}x the {baseline_median * 1000:.0f} ms baseline (max {args.max_ratio:.2f}x)")
+
+    ok = True
+    if loaded:
+        print(f"❌ Heavy modules imported eagerly: {', '.join(loaded)}")
+        ok = False
+    if ratio > args.max_ratio:
+        print("❌ Cold import regressed past the budget")
+        ok = False
+    if ok:
+        print("✅ Import time within budget")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Peak-memory check for streamed itineraries
+
+Streams itineraries of growing duration from iter_daily_itinerary through
+ReportRenderer.write (all formats) and fails (exit code 1) when peak traced memory grows with the duration instead
+of staying bounded.
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.report import FORMATS, ReportRenderer  # noqa: E402
+from src.tools.itinerary_builder import build_daily_itinerary, iter_daily_itinerary  # noqa: E402
+
+ATTRACTIONS = ["Louvre Museum", "Eiffel Tower", "Notre-Dame", "Montmartre", "Seine River Cruise"]
+
+
+class NullSink:
+    """A text stream that only counts what is written to it"""
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, chunk: str) -> int:
+        self.chars += len(chunk)
+        return len(chunk)
+
+
+def itinerary(duration: int):
+    return iter_daily_itinerary("Paris", duration, "cultural", ATTRACTIONS)
+
+
+def stream_plan(duration: int) -> int:
+    """Write a plan of ``duration`` days in every format; returns characters written"""
+    renderer = ReportRenderer()
+    sink = NullSink()
+    for fmt in FORMATS:
+        state = {"destination": "Paris", "daily_itinerary": itinerary(duration)}
+        renderer.write(state, sink, fmt=fmt)
+    return sink.chars
+
+
+def peak_bytes(func, *args) -> int:
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--durations", type=int, nargs="+", default=[30, 90, 365, 3650])
+    parser.add_argument("--slack", type=int, default=64 * 1024,
+                        help="bytes the peak may exceed the shortest plan's peak by")
+    args = parser.parse_args(argv)
+
+    durations = sorted(args.durations)
+    stream_plan(durations[0])  # warm up imports and interned strings
+    baseline = None
+    ok = True
+    for duration in durations:
+        peak = peak_bytes(stream_plan, duration)
+        listed = peak_bytes(build_daily_itinerary, "Paris", duration, "cultural", ATTRACTIONS)
+        baseline = peak if baseline is None else baseline
+        bounded = peak <= baseline + args.slack
+        ok = ok and bounded
+        print(f"{'✅' if bounded else '❌'} {duration} days: streamed peak {peak / 1024:.1f} KiB "
+              f"(a materialized list alone peaks at {listed / 1024:.1f} KiB)")
+    print("✅ Peak memory is bounded" if ok else "❌ Peak memory grows with the duration")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Live weather provider check against a local stub server
+
+Starts an Open-Meteo compatible stub on localhost and fails (exit code 1)
+unless concurrent identical lookups share one upstream request, repeated
+lookups are served from the TTL cache, and a slow upstream falls back to
+seasonal data within the timeout.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.tools.live_weather import HTTPWeatherProvider  # noqa: E402
+from src.tools.weather_checker import get_seasonal_weather, set_weather_provider  # noqa: E402
+
+FORECAST = {"daily": {
+    "time": ["2024-05-01", "2024-05-02", "2024-05-03"],
+    "temperature_2m_max": [21.0, 23.5, 19.0],
+    "temperature_2m_min": [11.0, 12.5, 10.0],
+    "precipitation_sum": [0.0, 4.2, 1.1],
+    "daylight_duration": [52000.0, 52200.0, 52400.0],
+}}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    requests = 0
+
+    def do_GET(self):
+        type(self).requests += 1
+        time.sleep(type(self).delay)
+        body = json.dumps(FORECAST).encode("utf-8")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except OSError:
+            pass  # the client gave up (timeout test)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def concurrent_lookups(count: int):
+    with ThreadPoolExecutor(count) as pool:
+        return list(pool.map(lambda _: get_seasonal_weather("Paris"), range(count)))
+
+
+def check(label: str, ok: bool, detail: str) -> bool:
+    print(f"{'✅' if ok else '❌'} {label}: {detail}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=0.3, help="provider timeout in seconds")
+    args = parser.parse_args(argv)
+
+    server, base_url = start_stub()
+    ok = True
+    try:
+        StubHandler.delay = 0.05
+        provider = set_weather_provider(HTTPWeatherProvider(base_url, timeout=args.timeout))
+        results = concurrent_lookups(args.concurrency)
+        ok &= check("singleflight", StubHandler.requests == 1 and all(
+            result["special_notes"].startswith("Live") for result in results),
+            f"{args.concurrency} concurrent lookups -> {StubHandler.requests} upstream request(s)")
+
+        start = time.perf_counter()
+        concurrent_lookups(args.concurrency)
+        ok &= check("ttl cache", StubHandler.requests == 1,
+                    f"repeat lookups in {(time.perf_counter() - start) * 1000:.1f} ms, "
+                    f"stats {provider.stats()}")
+
+        StubHandler.delay = args.timeout * 3
+        StubHandler.requests = 0
+        set_weather_provider(HTTPWeatherProvider(base_url, timeout=args.timeout))
+        start = time.perf_counter()
+        results = concurrent_lookups(args.concurrency)
+        elapsed = time.perf_counter() - start
+        set_weather_provider(None)
+        seasonal = get_seasonal_weather("Paris")
+        ok &= check("timeout fallback", StubHandler.requests == 1 and elapsed < args.timeout * 3 and all(
+            result == seasonal for result in results),
+            f"slow upstream fell back to seasonal data in {elapsed * 1000:.0f} ms")
+    finally:
+        set_weather_provider(None)
+        server.shutdown()
+
+    print("✅ Live weather provider checks passed" if ok else "❌ Live weather provider checks failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Parallel rendering benchmark for paged itinerary maps
+
+Renders the map of a long trip (one page per 5 days) in-process and with
+worker processes, both with a cold render cache, and fails (exit code 1)
+when the pages differ or the workers are not at least --min-speedup times
+faster. Needs 2+ cores to measure a speedup; on a single core the timing
+check is skipped and only the page parity is checked.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.tools.itinerary_builder import build_daily_itinerary  # noqa: E402
+from src.tools.map_visualizer import DAYS_PER_PAGE, generate_itinerary_map, set_map_render_workers  # noqa: E402
+from src.tools.render_cache import configure_render_cache  # noqa: E402
+
+ATTRACTIONS = ["Louvre Museum", "Eiffel Tower", "Notre-Dame", "Montmartre", "Seine River Cruise"]
+
+
+def render_seconds(itinerary, runs: int):
+    """Return the median cold render time and the page artifact ids"""
+    timings = []
+    for _ in range(runs):
+        configure_render_cache()
+        start = time.perf_counter()
+        result = generate_itinerary_map("Paris", itinerary, ATTRACTIONS, output="png")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), [page["artifact_id"] for page in result["pages"]]
+
+
+def check(label: str, ok: bool, detail: str) -> bool:
+    print(f"{'✅' if ok else '❌'} {label}: {detail}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--min-speedup", type=float, default=1.3,
+                        help="required serial/parallel time ratio with 2+ workers")
+    args = parser.parse_args(argv)
+    # Map labels use emoji the default matplotlib font lacks (the environment
+    # variable carries the filter into the spawned render workers)
+    warnings.filterwarnings("ignore", message="Glyph .* missing")
+    os.environ["PYTHONWARNINGS"] = "ignore:Glyph"
+
+    itinerary = build_daily_itinerary("Paris", args.days, "cultural", ATTRACTIONS)
+    pages = -(-args.days // DAYS_PER_PAGE)
+    workers = min(args.workers, pages)
+
+    set_map_render_workers(1)
+    render_seconds(itinerary, 1)  # import matplotlib and load fonts, untimed
+    serial, serial_pages = render_seconds(itinerary, args.runs)
+    set_map_render_workers(workers)
+    try:
+        render_seconds(itinerary, 1)  # start the worker processes, untimed
+        parallel, parallel_pages = render_seconds(itinerary, args.runs)
+    finally:
+        set_map_render_workers(1)
+
+    speedup = serial / parallel
+    print(f"{args.days} days ({pages} pages): {serial * 1000:.0f} ms in-process, "
+          f"{parallel * 1000:.0f} ms with {workers} workers ({speedup:.2f}x)")
+    ok = check("pages", parallel_pages == serial_pages, f"{len(parallel_pages)} identical pages either way")
+    if (os.cpu_count() or 1) < 2 or workers < 2:
+        print(f"⚠️ Speedup not checked: {os.cpu_count()} core(s), {workers} worker(s)")
+    else:
+        ok &= check("speedup", speedup >= args.min_speedup,
+                    f"{speedup:.2f}x with {workers} workers (need {args.min_speedup:.2f}x)")
+
+    print("✅ Map rendering checks passed" if ok else "❌ Map rendering checks failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
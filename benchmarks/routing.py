@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Geo routing benchmark for build_daily_itinerary
+
+Routes synthetic cities of random points of interest (a 20 x 20 km box) and
+fails (exit code 1) when the median time to build a routed itinerary
+exceeds the budget for any size. A dense case also routes every point of
+each city as a single day; it is reported for information only and does
+not count toward the result.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.tools.itinerary_builder import build_daily_itinerary  # noqa: E402
+
+
+def make_city(size: int, seed: int = 0):
+    """Return (names, coordinates) for a synthetic city around Paris"""
+    rng = random.Random(seed)
+    names = [f"POI {i}" for i in range(size)]
+    coordinates = {name: (48.76 + rng.random() * 0.18, 2.22 + rng.random() * 0.27) for name in names}
+    return names, coordinates
+
+
+def time_routing(size: int, days: int, runs: int, dense: bool = False):
+    names, coordinates = make_city(size)
+    # A dense day has no time limit and zero-length visits, so it takes every point
+    options = {"day_minutes": float("inf"), "visit_minutes": dict.fromkeys(names, 0)} if dense else {}
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        itinerary = build_daily_itinerary("Paris", days, "cultural", names, coordinates=coordinates, **options)
+        timings.append(time.perf_counter() - start)
+    scheduled = sum(len(day.get("route", ())) for day in itinerary)
+    return timings, scheduled
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000])
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 30, 250],
+                        help="trip lengths; the longest routes every point of a 1000-POI city")
+    parser.add_argument("--budget", type=float, default=0.05, help="max median seconds per itinerary")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    ok = True
+    for size in args.sizes:
+        for days in args.days:
+            timings, scheduled = time_routing(size, days, args.runs)
+            median = statistics.median(timings)
+            status = "✅" if median <= args.budget else "❌"
+            print(f"{status} {size} POIs, {days} days: median {median * 1000:.1f} ms "
+                  f"({scheduled} attractions scheduled)")
+            ok = ok and median <= args.budget
+        timings, scheduled = time_routing(size, 1, args.runs, dense=True)
+        median = statistics.median(timings)
+        print(f"ℹ️  {size} POIs, one dense day: median {median * 1000:.1f} ms "
+              f"({scheduled} attractions scheduled, not budgeted)")
+    print("✅ Routing within budget" if ok else "❌ Routing over budget")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the travel planning tools and the full agent graph
+
+Runs microbenchmarks for each tool (including the batch budget and weather
+variants), the chart, map and interactive map renderers and the report
+synthesizer, plus an end-to-end plan_trip through the graph with a
+deterministic stub chat model (no network, configurable latency). Each
+benchmark reports p50/p95 latency and peak traced memory.
+
+    python benchmarks/suite.py --save-baseline    # record this machine's baseline
+    python benchmarks/suite.py                    # compare against it
+
+Results are compared against the JSON baseline, and the run fails (exit
+code 1) when a p50, p95 or peak memory figure regresses past the tolerance,
+or when there is no baseline (or it lacks a benchmark that ran), so a gate
+can never pass without comparing. Baselines are machine specific and not
+committed: record one per machine, or in CI on the base commit first:
+
+    git checkout <base> && python benchmarks/suite.py --save-baseline
+    git checkout <change> && python benchmarks/suite.py
+
+--allow-missing-baseline only warns instead, for exploratory local runs.
+--checks also runs the standalone benchmark scripts next to this file;
+--instrument records spans, to compare against an uninstrumented run.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+from langchain_core.messages import AIMessage  # noqa: E402
+
+from src.agent import TravelPlannerAgent  # noqa: E402
+from src.compaction import estimate_tokens  # noqa: E402
+from src.report import ReportRenderer  # noqa: E402
+from src.tools.budget_calculator import (calculate_budget_breakdown, calculate_budget_breakdown_batch,  # noqa: E402
+                                         generate_budget_chart)
+from src.tools.destination_research import research_destination  # noqa: E402
+from src.tools.instrumentation import InMemoryExporter, add_exporter  # noqa: E402
+from src.tools.interactive_map import generate_interactive_map  # noqa: E402
+from src.tools.itinerary_builder import build_daily_itinerary  # noqa: E402
+from src.tools.map_visualizer import generate_budget_vs_duration_chart, generate_itinerary_map  # noqa: E402
+from src.tools.render_cache import configure_render_cache  # noqa: E402
+from src.tools.weather_checker import get_seasonal_weather, get_seasonal_weather_many  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Standalone check scripts run by --checks
+CHECK_SCRIPTS = ["import_time.py", "routing.py", "itinerary_memory.py", "live_weather.py", "datapack.py",
+                 "budget_batch.py", "map_render.py"]
+
+REQUEST = {"destination": "Paris", "duration": 5, "budget": 2500, "travel_style": "cultural",
+           "traveler_count": 2, "interests": ["museums", "food"], "travel_month": "May"}
+
+
+class StubChatModel:
+    """Deterministic chat model for offline runs.
+
+    Answers after ``latency`` seconds: with ``tool_calls`` once tools are
+    bound (the planner), else with ``content`` (report enrichment). Token
+    usage is reported like a real model's, from estimated counts.
+    """
+
+    def __init__(self, tool_calls: List[Dict[str, Any]], latency: float = 0.0,
+                 content: str = "Book museum tickets ahead.", bound: bool = False):
+        self.tool_calls = tool_calls
+        self.latency = latency
+        self.content = content
+        self.bound = bound
+        self.calls = 0
+
+    def bind_tools(self, tools) -> "StubChatModel":
+        return StubChatModel(self.tool_calls, self.latency, self.content, bound=True)
+
+    def _respond(self, messages) -> AIMessage:
+        self.calls += 1
+        if self.bound:
+            message = AIMessage(content="", tool_calls=[dict(call) for call in self.tool_calls])
+            output_tokens = estimate_tokens(json.dumps(self.tool_calls))
+        else:
+            message = AIMessage(content=self.content)
+            output_tokens = estimate_tokens(self.content)
+        input_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        message.usage_metadata = {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                                  "total_tokens": input_tokens + output_tokens}
+        return message
+
+    def invoke(self, messages, **kwargs) -> AIMessage:
+        time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def ainvoke(self, messages, **kwargs) -> AIMessage:
+        import asyncio
+        await asyncio.sleep(self.latency)
+        return self._respond(messages)
+
+
+class Benchmark(NamedTuple):
+    name: str
+    run: Callable[[], Any]
+    # Called untimed before every iteration, e.g. to drop render caches
+    reset: Optional[Callable[[], Any]] = None
+    iterations: Optional[int] = None
+
+
+def make_agent(llm_latency: float) -> TravelPlannerAgent:
+    planner = TravelPlannerAgent(planner_mode="deterministic", speculate=False)
+    state = planner.build_initial_state(**REQUEST)
+    llm = StubChatModel(planner.build_tool_plan(state), latency=llm_latency)
+    return TravelPlannerAgent(llm=llm)
+
+
+def build_benchmarks(llm_latency: float, e2e_iterations: int) -> List[Benchmark]:
+    request = REQUEST
+    research = research_destination(request["destination"], request["interests"])
+    attractions = research["attractions"]
+    itinerary = build_daily_itinerary(request["destination"], request["duration"], request["travel_style"],
+                                      attractions)
+    breakdown = calculate_budget_breakdown(request["destination"], request["duration"], request["budget"],
+                                           request["travel_style"], request["traveler_count"])
+    # A what-if grid: every duration, budget and style combination for the request
+    durations, budgets, styles = np.meshgrid(np.arange(1, 31), np.linspace(500, 20000, 40),
+                                             ["budget", "mixed", "luxury"], indexing="ij")
+    months = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+              "October", "November", "December"]
+    weather_pairs = [(destination, month) for destination in ("Paris", "Tokyo", "New York", "Nowhere")
+                     for month in months]
+    agent = make_agent(llm_latency)
+    state = agent.plan_trip(**request)
+
+    def fresh_renderer():
+        agent.report_renderer = ReportRenderer()
+
+    def cold_request():
+        # A new request: nothing rendered or memoized yet
+        configure_render_cache()
+        fresh_renderer()
+
+    return [
+        Benchmark("research_destination", lambda: research_destination(request["destination"],
+                                                                       request["interests"])),
+        Benchmark("build_daily_itinerary", lambda: build_daily_itinerary(
+            request["destination"], request["duration"], request["travel_style"], attractions)),
+        Benchmark("calculate_budget_breakdown", lambda: calculate_budget_breakdown(
+            request["destination"], request["duration"], request["budget"], request["travel_style"],
+            request["traveler_count"])),
+        Benchmark("calculate_budget_batch", lambda: calculate_budget_breakdown_batch(
+            request["destination"], durations, budgets, styles, request["traveler_count"])),
+        Benchmark("get_seasonal_weather", lambda: get_seasonal_weather(request["destination"],
+                                                                       request["travel_month"])),
+        Benchmark("get_seasonal_weather_many", lambda: get_seasonal_weather_many(weather_pairs)),
+        # Charts are measured cold: a fresh render cache forces a real render
+        Benchmark("generate_budget_chart", lambda: generate_budget_chart(breakdown["budget_breakdown"]),
+                  reset=configure_render_cache, iterations=10),
+        Benchmark("generate_itinerary_map", lambda: generate_itinerary_map(request["destination"], itinerary,
+                                                                           attractions),
+                  reset=configure_render_cache, iterations=10),
+        Benchmark("generate_budget_vs_duration", lambda: generate_budget_vs_duration_chart(request["destination"],
+                                                                                          breakdown),
+                  reset=configure_render_cache, iterations=10),
+        Benchmark("interactive_map_html", lambda: generate_interactive_map(request["destination"], attractions,
+                                                                          itinerary, output="html"),
+                  reset=configure_render_cache),
+        Benchmark("interactive_map_geojson", lambda: generate_interactive_map(request["destination"], attractions,
+                                                                             itinerary, output="geojson"),
+                  reset=configure_render_cache),
+        Benchmark("synthesizer_node", lambda: agent.synthesizer_node(state), reset=fresh_renderer),
+        Benchmark("plan_trip", lambda: agent.plan_trip(**request), reset=cold_request, iterations=e2e_iterations),
+    ]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(benchmark: Benchmark, iterations: int, warmup: int = 1) -> Dict[str, Any]:
+    """Time ``iterations`` runs, then trace one more for peak memory"""
+    iterations = benchmark.iterations or iterations
+    timings = []
+    for i in range(warmup + iterations):
+        if benchmark.reset:
+            benchmark.reset()
+        start = time.perf_counter()
+        benchmark.run()
+        if i >= warmup:
+            timings.append(time.perf_counter() - start)
+
+    if benchmark.reset:
+        benchmark.reset()
+    tracemalloc.start()
+    try:
+        benchmark.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(statistics.median(timings) * 1000, 4),
+        "p95_ms": round(percentile(timings, 0.95) * 1000, 4),
+        "mean_ms": round(statistics.mean(timings) * 1000, 4),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], latency_tolerance: float,
+            memory_tolerance: float, latency_slack_ms: float, memory_slack_kib: float) -> List[str]:
+    """Return a description of every regression against the baseline"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            limit = previous[metric] * (1 + latency_tolerance) + latency_slack_ms
+            if current[metric] > limit:
+                regressions.append(f"{name} {metric}: {current[metric]:.3f} > {limit:.3f} "
+                                   f"(baseline {previous[metric]:.3f})")
+        limit = previous["peak_kib"] * (1 + memory_tolerance) + memory_slack_kib
+        if current["peak_kib"] > limit:
+            regressions.append(f"{name} peak_kib: {current['peak_kib']:.1f} > {limit:.1f} "
+                               f"(baseline {previous['peak_kib']:.1f})")
+    return regressions
+
+
+def run_checks() -> bool:
+    ok = True
+    for script in CHECK_SCRIPTS:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), script)
+        completed = subprocess.run([sys.executable, path], capture_output=True, text=True)
+        passed = completed.returncode == 0
+        ok &= passed
+        print(f"{'✅' if passed else '❌'} {script}")
+        if not passed:
+            print(completed.stdout + completed.stderr)
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=30, help="timed runs per microbenchmark")
+    parser.add_argument("--e2e-iterations", type=int, default=10, help="timed runs of plan_trip")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="stub chat model latency")
+    parser.add_argument("--only", nargs="*", help="run only these benchmarks")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="only warn when there is no baseline, or it lacks a benchmark that ran")
+    parser.add_argument("--output", help="also write the results JSON here")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5, help="allowed p50/p95 growth (0.5 = 50%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.2, help="allowed peak memory growth")
+    parser.add_argument("--latency-slack-ms", type=float, default=0.05,
+                        help="absolute latency allowance, so microsecond timings are not flaky")
+    parser.add_argument("--memory-slack-kib", type=float, default=16.0, help="absolute memory allowance")
+    parser.add_argument("--checks", action="store_true", help="also run the standalone benchmark scripts")
+    parser.add_argument("--instrument", action="store_true",
+                        help="record spans in memory, to measure instrumentation overhead")
+    args = parser.parse_args(argv)
+    if args.instrument:
+        add_exporter(InMemoryExporter(max_spans=1000))
+    # Map labels use emoji the default matplotlib font lacks
+    warnings.filterwarnings("ignore", message="Glyph .* missing")
+
+    benchmarks = build_benchmarks(args.llm_latency_ms / 1000, args.e2e_iterations)
+    if args.only:
+        unknown = set(args.only) - {benchmark.name for benchmark in benchmarks}
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+        benchmarks = [benchmark for benchmark in benchmarks if benchmark.name in args.only]
+
+    results = {}
+    print(f"{'benchmark':<28}{'p50 ms':>10}{'p95 ms':>10}{'peak KiB':>11}")
+    for benchmark in benchmarks:
+        results[benchmark.name] = measure(benchmark, args.iterations)
+        result = results[benchmark.name]
+        print(f"{benchmark.name:<28}{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}{result['peak_kib']:>11.1f}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "llm_latency_ms": args.llm_latency_ms,
+            "instrumented": args.instrument,
+        },
+        "benchmarks": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    ok = True
+    if args.save_baseline:
+        # Keep entries for benchmarks skipped with --only
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                previous = json.load(f)["benchmarks"]
+            report["benchmarks"] = {**previous, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Saved baseline to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("llm_latency_ms") != args.llm_latency_ms:
+            print(f"⚠️ Baseline was recorded with --llm-latency-ms {baseline['meta'].get('llm_latency_ms')}")
+        regressions = compare(results, baseline["benchmarks"], args.latency_tolerance, args.memory_tolerance,
+                              args.latency_slack_ms, args.memory_slack_kib)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        ok = not regressions
+        missing = sorted(set(results) - set(baseline["benchmarks"]))
+        if missing:
+            print(f"{'⚠️' if args.allow_missing_baseline else '❌'} Not in the baseline (unchecked): "
+                  f"{', '.join(missing)}")
+            ok &= args.allow_missing_baseline
+        if ok:
+            print(f"✅ No regressions against {args.baseline}")
+    elif args.allow_missing_baseline:
+        print(f"⚠️ No baseline at {args.baseline}; run with --save-baseline to record one")
+    else:
+        print(f"❌ No baseline at {args.baseline}; record one with --save-baseline first")
+        ok = False
+
+    if args.checks:
+        ok &= run_checks()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
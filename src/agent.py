@@ -1,44 +1,142 @@
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from contextvars import copy_context
+import asyncio
 import json
-from typing import Dict, Any, List
+import logging
+import queue
+import threading
+import uuid
+from typing import Dict, Any, AsyncIterator, Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 # Use absolute imports instead of relative
 from src.state import TravelState
-from src.tools.destination_research import research_destination
-from src.tools.itinerary_builder import build_daily_itinerary
-from src.tools.budget_calculator import calculate_budget_breakdown, generate_budget_chart
-from src.tools.weather_checker import get_seasonal_weather
-from src.tools.map_visualizer import generate_itinerary_map
+from src.compaction import ToolResultCompactor
+from src.llm_cache import PlannerCache, planner_cache_key
+from src.report import ReportRenderer
+from src.tools.instrumentation import current_span, increment, span
+from src.tools.registry import get_tools
+
+logger = logging.getLogger(__name__)
+
+# State key filled by each tool (research_destination fills two, see state_updates)
+TOOL_STATE_KEYS = {
+    "build_daily_itinerary": "daily_itinerary",
+    "calculate_budget_breakdown": "budget_breakdown",
+    "get_seasonal_weather": "weather_info",
+    "generate_itinerary_map": "itinerary_map",
+    "generate_budget_chart": "budget_chart",
+    "generate_interactive_map": "interactive_map",
+}
+
+PLANNER_MODES = ("llm", "deterministic")
+
+# Tools whose calls are predictable from state alone and safe to run early
+SPECULATIVE_TOOLS = ("research_destination", "get_seasonal_weather", "calculate_budget_breakdown")
+
+# In-flight speculative calls of one run, keyed by (tool name, canonical args)
+Speculation = Dict[Tuple[str, str], Future]
+
+# Sections that can be streamed as soon as a single tool result arrives
+STREAMED_SECTIONS = ("overview", "itinerary", "budget", "weather")
+
+class PlanEvent(NamedTuple):
+    """Progress event yielded by plan_trip_stream.
+    
+    kind is one of:
+    - "node_started" / "node_finished": name is the graph node, data the node status (finished only)
+    - "tool_result": name is the tool, data is {"id", "result", "error"}
+    - "section": name is the report section, data its Markdown
+    - "plan_completed": data is the final state, as returned by plan_trip
+    """
+    kind: str
+    name: str
+    data: Any = None
+
+class StreamClosed(Exception):
+    """Raised inside a streamed run once its consumer has stopped iterating"""
+
+class EventSink:
+    """Delivers the events of one streamed run and remembers the sections sent"""
+    def __init__(self, put: Callable[[PlanEvent], None]):
+        self._put = put
+        self.sections_sent = set()
+        self.closed = False
+    
+    def put(self, event: PlanEvent):
+        # The run's next event after the consumer left aborts the run
+        if self.closed:
+            raise StreamClosed()
+        self._put(event)
+    
+    def close(self):
+        self.closed = True
+
+class PlanResult(NamedTuple):
+    """Outcome of one request in a plan_trips batch"""
+    index: int
+    request: Dict[str, Any]
+    result: Optional[Dict[str, Any]]
+    error: Optional[Exception]
 
 class TravelPlannerAgent:
-    def __init__(self, model: str = "gpt-3.5-turbo"):
-        self.llm = ChatOpenAI(model=model, temperature=0.7)
+    def __init__(self, model: str = "gpt-3.5-turbo", max_tool_workers: int = 4,
+                 llm=None, llm_cache: Optional[PlannerCache] = None,
+                 planner_mode: str = "llm", enrich: bool = False, speculate: bool = True,
+                 compact_tool_messages: bool = True, max_render_workers: Optional[int] = None):
+        # llm lets callers inject any chat model (e.g. a stub for offline runs);
+        # llm_cache is opt-in and replays planner responses for repeat requests.
+        # planner_mode="deterministic" builds the tool plan from state without
+        # an LLM call; enrich asks the LLM for free-text travel notes.
+        # speculate starts predictable tool calls while the planner LLM runs.
+        # compact_tool_messages sends the LLM token-bounded tool result summaries.
+        # max_render_workers sets how many processes render itinerary map pages
+        # (a process-wide setting; None keeps $TRAVEL_MAP_RENDER_WORKERS or 1).
+        if planner_mode not in PLANNER_MODES:
+            raise ValueError(f"Unknown planner_mode: {planner_mode}")
+        self.model = model
+        self.planner_mode = planner_mode
+        self.enrich = enrich
+        if llm is None and (planner_mode == "llm" or enrich):
+            llm = ChatOpenAI(model=model, temperature=0.7)
+        self.llm = llm
+        self.llm_cache = llm_cache
+        self.speculate = speculate
+        self._speculations: Dict[str, Speculation] = {}
+        self._speculation_lock = threading.Lock()
+        self.speculation_hits = 0
+        self.speculation_misses = 0
+        # Event sinks of streamed runs, keyed by run_id; used from node and tool threads
+        self._event_sinks: Dict[str, EventSink] = {}
+        self._event_sinks_lock = threading.Lock()
+        self.report_renderer = ReportRenderer()
+        self.compactor = ToolResultCompactor(enabled=compact_tool_messages)
+        self.tool_executor = ThreadPoolExecutor(max_workers=max_tool_workers, thread_name_prefix="travel-tool")
+        if max_render_workers is not None:
+            # Imported here: the map tool is otherwise loaded lazily on first use
+            from src.tools.map_visualizer import set_map_render_workers
+            set_map_render_workers(max_render_workers)
         self.setup_tools()
         self.build_graph()
     
     def setup_tools(self):
         """Setup all our travel planning tools"""
-        self.tools = [
-            research_destination,
-            build_daily_itinerary,
-            calculate_budget_breakdown, 
-            get_seasonal_weather,
-            generate_itinerary_map,
-            generate_budget_chart
-        ]
+        # Tools are lazy: their modules are imported on first call, not here
+        self.tools = get_tools()
+        self.tool_registry = {tool.__name__: tool for tool in self.tools}
         
-        # Bind tools to LLM
-        self.llm_with_tools = self.llm.bind_tools(self.tools)
+        # Bind tool schemas to LLM (the deterministic planner never calls it)
+        if self.planner_mode == "llm":
+            self.llm_with_tools = self.llm.bind_tools([tool.schema for tool in self.tools])
+        else:
+            self.llm_with_tools = None
     
-    def planner_node(self, state: TravelState) -> Dict[str, Any]:
-        """Main planning node - decides which tools to use"""
-        print(f"🔍 Planning trip to {state['destination']}...")
-        
-        # Create planning prompt
-        prompt = f"""
+    def build_planner_prompt(self, state: TravelState) -> str:
+        """Create the planning prompt for the current state"""
+        return f"""
         Plan a {state['trip_duration']}-day trip to {state['destination']} for {state['traveler_count']} travelers.
         Budget: ${state['budget']}, Style: {state['travel_style']}
         Interests: {', '.join(state['interests'])}
@@ -53,127 +151,450 @@ class TravelPlannerAgent:
         
         Return a complete travel plan.
         """
+    
+    def build_tool_plan(self, state: TravelState) -> List[Dict[str, Any]]:
+        """Build the fixed tool-call plan for a trip straight from state.
         
-        messages = [HumanMessage(content=prompt)]
-        response = self.llm_with_tools.invoke(messages)
+        Arguments that come from another tool's result (attractions, itinerary,
+        budget breakdown) get empty placeholders; tools_node fills them in from
+        the dependency once it has run (see LazyTool.depends_on).
+        """
+        destination = state['destination']
+        plan = [
+            ("research_destination", {"destination": destination, "interests": state['interests']}),
+            ("build_daily_itinerary", {"destination": destination, "duration": state['trip_duration'],
+                                       "travel_style": state['travel_style'], "attractions": []}),
+            ("calculate_budget_breakdown", {"destination": destination, "duration": state['trip_duration'],
+                                            "total_budget": state['budget'], "travel_style": state['travel_style'],
+                                            "traveler_count": state['traveler_count']}),
+            ("get_seasonal_weather", {"destination": destination, "travel_month": state['travel_month']}),
+            ("generate_itinerary_map", {"destination": destination, "itinerary": [], "attractions": []}),
+            ("generate_budget_chart", {"budget_breakdown": {}}),
+            ("generate_interactive_map", {"destination": destination, "attractions": [], "itinerary": []}),
+        ]
+        return [{"name": name, "args": args, "id": f"plan_{name}"} for name, args in plan]
+    
+    def planner_node(self, state: TravelState) -> Dict[str, Any]:
+        """Main planning node - decides which tools to use"""
+        logger.info("🔍 Planning trip to %s...", state['destination'])
+        
+        if self.planner_mode == "deterministic":
+            return {"messages": [AIMessage(content="", tool_calls=self.build_tool_plan(state))],
+                    "status": "planning_started"}
+        
+        cache_key = planner_cache_key(state, self.model) if self.llm_cache else None
+        response = self.llm_cache.get(cache_key) if cache_key else None
+        if cache_key:
+            current_span().set_attribute("llm_cache_hit", response is not None)
+        if response is None:
+            self.start_speculation(state)
+            messages = [HumanMessage(content=self.build_planner_prompt(state))]
+            with span("planner", "llm", model=self.model) as llm_span:
+                response = self.llm_with_tools.invoke(messages)
+                self.record_usage(llm_span, response)
+            if cache_key:
+                self.llm_cache.put(cache_key, response)
         
         return {"messages": [response], "status": "planning_started"}
     
+    async def aplanner_node(self, state: TravelState) -> Dict[str, Any]:
+        """Async planning node - awaits the LLM without holding a thread"""
+        if self.planner_mode == "deterministic":
+            return self.planner_node(state)
+        
+        logger.info("🔍 Planning trip to %s...", state['destination'])
+        
+        cache_key = planner_cache_key(state, self.model) if self.llm_cache else None
+        # PlannerCache reads and writes SQLite (and commits); keep that off the event loop
+        response = await asyncio.to_thread(self.llm_cache.get, cache_key) if cache_key else None
+        if cache_key:
+            current_span().set_attribute("llm_cache_hit", response is not None)
+        if response is None:
+            self.start_speculation(state)
+            messages = [HumanMessage(content=self.build_planner_prompt(state))]
+            with span("planner", "llm", model=self.model) as llm_span:
+                response = await self.llm_with_tools.ainvoke(messages)
+                self.record_usage(llm_span, response)
+            if cache_key:
+                await asyncio.to_thread(self.llm_cache.put, cache_key, response)
+        
+        return {"messages": [response], "status": "planning_started"}
+    
+    @staticmethod
+    def record_usage(llm_span, response: Any):
+        """Copy the token counts a chat model reports (usage_metadata) onto an LLM span"""
+        usage = getattr(response, "usage_metadata", None) or {}
+        for key in ("input_tokens", "output_tokens", "total_tokens"):
+            if usage.get(key) is not None:
+                llm_span.set_attribute(key, usage[key])
+    
     def tools_node(self, state: TravelState) -> Dict[str, Any]:
         """Execute tools based on LLM decisions"""
-        print("🛠️ Executing tools...")
+        logger.info("🛠️ Executing tools...")
         
         last_message = state["messages"][-1]
+        speculation = self.take_speculation(state.get("run_id"))
         
-        if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-            tool_calls = last_message.tool_calls
-            tool_messages = []
-            
-            for tool_call in tool_calls:
-                tool_name = tool_call['name']
-                tool_args = tool_call['args']
-                
-                print(f"  🔧 Calling tool: {tool_name}")
-                
-                # Find and execute the tool
-                for tool in self.tools:
-                    if tool.__name__ == tool_name:
-                        try:
-                            result = tool(**tool_args)
-                            
-                            # Store results in state based on tool type
-                            if tool_name == "research_destination":
-                                state["researched_destinations"] = result
-                                state["attractions"] = result.get("attractions", [])
-                            elif tool_name == "build_daily_itinerary":
-                                state["daily_itinerary"] = result
-                            elif tool_name == "calculate_budget_breakdown":
-                                state["budget_breakdown"] = result
-                            elif tool_name == "get_seasonal_weather":
-                                state["weather_info"] = result
-                            elif tool_name == "generate_itinerary_map":
-                                state["itinerary_map"] = result
-                            elif tool_name == "generate_budget_chart":
-                                state["budget_chart"] = result
-                                
-                            tool_messages.append(ToolMessage(
-                                content=json.dumps(result) if isinstance(result, (dict, list)) else str(result),
-                                tool_call_id=tool_call['id']
-                            ))
-                            
-                        except Exception as e:
-                            tool_messages.append(ToolMessage(
-                                content=f"Error: {str(e)}",
-                                tool_call_id=tool_call['id']
-                            ))
-                        break
-            
-            return {"messages": tool_messages, "status": "tools_executed"}
+        try:
+            if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
+                tool_calls = last_message.tool_calls
+                on_result = self.tool_result_listener(state, tool_calls)
+                return self.merge_tool_outcomes(tool_calls, self.execute_tool_calls(tool_calls, speculation, on_result))
+        finally:
+            self.discard_speculation(speculation)
         
         return {"status": "no_tools_called"}
     
+    async def atools_node(self, state: TravelState) -> Dict[str, Any]:
+        """Async tools node - tool work runs on the tool executor"""
+        logger.info("🛠️ Executing tools...")
+        
+        last_message = state["messages"][-1]
+        speculation = self.take_speculation(state.get("run_id"))
+        
+        try:
+            if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
+                tool_calls = last_message.tool_calls
+                on_result = self.tool_result_listener(state, tool_calls)
+                return self.merge_tool_outcomes(tool_calls, await self.aexecute_tool_calls(tool_calls, speculation, on_result))
+        finally:
+            self.discard_speculation(speculation)
+        
+        return {"status": "no_tools_called"}
+    
+    def start_speculation(self, state: TravelState):
+        """Start the predictable tool calls of a run on the tool executor.
+        
+        Runs while the planner waits on the LLM; tools_node reuses a result
+        only when the real call has the same tool name and canonical args.
+        """
+        run_id = state.get("run_id")
+        if not self.speculate or not run_id:
+            return
+        speculation = {}
+        for tool_call in self.build_tool_plan(state):
+            if tool_call['name'] not in SPECULATIVE_TOOLS:
+                continue
+            canonical = self.tool_registry[tool_call['name']].canonical_args(tool_call['args'])
+            if canonical is not None:
+                speculation[(tool_call['name'], canonical)] = self._submit_tool(tool_call['name'], tool_call['args'])
+        with self._speculation_lock:
+            self._speculations[run_id] = speculation
+    
+    def take_speculation(self, run_id: Optional[str]) -> Speculation:
+        """Remove and return the in-flight speculative calls of a run"""
+        with self._speculation_lock:
+            return self._speculations.pop(run_id, {})
+    
+    def _claim_speculative(self, speculation: Speculation, tool_name: str, args: Dict[str, Any]) -> Optional[Future]:
+        """Return (and consume) a speculative call matching this call, if any"""
+        tool = self.tool_registry.get(tool_name)
+        if not speculation or tool is None:
+            return None
+        future = speculation.pop((tool_name, tool.canonical_args(args)), None)
+        if future is not None:
+            with self._speculation_lock:
+                self.speculation_hits += 1
+            increment("speculation_hits", tool=tool_name)
+        return future
+    
+    def discard_speculation(self, speculation: Speculation):
+        """Cancel speculative calls no real tool call asked for"""
+        for (tool_name, _), future in speculation.items():
+            future.cancel()
+            increment("speculation_misses", tool=tool_name)
+        with self._speculation_lock:
+            self.speculation_misses += len(speculation)
+        speculation.clear()
+    
+    def speculation_stats(self) -> Dict[str, Any]:
+        """Return speculative tool execution hit/miss counters
+
+        The same hits and misses go to the instrumentation exporters as the
+        ``speculation_hits`` and ``speculation_misses`` counters, per tool.
+        """
+        with self._speculation_lock:
+            total = self.speculation_hits + self.speculation_misses
+            return {
+                "hits": self.speculation_hits,
+                "misses": self.speculation_misses,
+                "hit_ratio": self.speculation_hits / total if total else 0.0,
+                "in_flight_runs": len(self._speculations),
+            }
+    
+    def event_sink(self, state: TravelState) -> Optional[EventSink]:
+        """Return the event sink of a streamed run, or None"""
+        with self._event_sinks_lock:
+            return self._event_sinks.get(state.get("run_id"))
+    
+    def register_event_sink(self, run_id: str, sink: Optional[EventSink]):
+        """Start (or, with None, stop) sending a run's events to sink"""
+        with self._event_sinks_lock:
+            if sink is None:
+                self._event_sinks.pop(run_id, None)
+            else:
+                self._event_sinks[run_id] = sink
+    
+    def emit(self, state: TravelState, kind: str, name: str, data: Any = None):
+        """Send an event to the run's stream, if the run is being streamed"""
+        sink = self.event_sink(state)
+        if sink is not None:
+            sink.put(PlanEvent(kind, name, data))
+    
+    def emit_sections(self, sink: EventSink, state: TravelState, notes: Optional[str] = None,
+                      names: Iterable[str] = None):
+        """Send every report section that is ready and has not been sent yet"""
+        for name, text in self.report_sections(state, notes, names):
+            if name not in sink.sections_sent:
+                sink.sections_sent.add(name)
+                sink.put(PlanEvent("section", name, text))
+    
+    def tool_result_listener(self, state: TravelState, tool_calls: List[Dict[str, Any]]
+                             ) -> Optional[Callable[[int, Tuple[Any, Optional[Exception]]], None]]:
+        """Build the on_result callback that streams tool results and ready sections"""
+        sink = self.event_sink(state)
+        if sink is None:
+            return None
+        partial_state = dict(state)
+        
+        def on_result(index: int, outcome: Tuple[Any, Optional[Exception]]):
+            result, error = outcome
+            tool_call = tool_calls[index]
+            sink.put(PlanEvent("tool_result", tool_call['name'], {"id": tool_call['id'], "result": result, "error": error}))
+            if error is None:
+                partial_state.update(self.state_updates(tool_call['name'], result))
+                self.emit_sections(sink, partial_state, names=STREAMED_SECTIONS)
+        
+        return on_result
+    
+    def merge_tool_outcomes(self, tool_calls: List[Dict[str, Any]],
+                            outcomes: List[Tuple[Any, Optional[Exception]]]) -> Dict[str, Any]:
+        """Merge tool results back into state in the order of the original tool calls.
+        
+        State gets the full results; the ToolMessages get compacted summaries.
+        """
+        updates = {}
+        tool_messages = []
+        for tool_call, (result, error) in zip(tool_calls, outcomes):
+            if error is None:
+                updates.update(self.state_updates(tool_call['name'], result))
+                content = self.compactor.compact(tool_call['name'], result)
+            else:
+                content = f"Error: {str(error)}"
+            tool_messages.append(ToolMessage(content=content, tool_call_id=tool_call['id']))
+        
+        return {**updates, "messages": tool_messages, "status": "tools_executed"}
+    
+    def tool_dependencies(self, tool_calls: List[Dict[str, Any]]) -> List[set]:
+        """Return, for every call, the indexes of the calls it has to wait for"""
+        dependencies = []
+        for tool_call in tool_calls:
+            tool = self.tool_registry.get(tool_call['name'])
+            wanted = tool.dependency_names if tool else frozenset()
+            dependencies.append({j for j, other in enumerate(tool_calls) if other['name'] in wanted})
+        return dependencies
+    
+    @staticmethod
+    def acyclic_dependencies(dependencies: List[set]) -> List[set]:
+        """Drop the dependency edges that close a cycle.
+        
+        Calls are taken in the order execute_tool_calls starts them: when no
+        call is ready, the first waiting one runs without the dependencies
+        that have not finished yet.
+        """
+        acyclic = [set() for _ in dependencies]
+        waiting = list(range(len(dependencies)))
+        started = set()
+        while waiting:
+            ready = [index for index in waiting if dependencies[index] <= started] or waiting[:1]
+            for index in ready:
+                waiting.remove(index)
+                acyclic[index] = dependencies[index] & started
+            started.update(ready)
+        return acyclic
+    
+    def execute_tool_calls(self, tool_calls: List[Dict[str, Any]], speculation: Optional[Speculation] = None,
+                           on_result: Callable[[int, Tuple[Any, Optional[Exception]]], None] = None
+                           ) -> List[Tuple[Any, Optional[Exception]]]:
+        """Run tool calls on the worker pool, respecting tool dependencies.
+        
+        Independent calls run concurrently; a call whose tool depends on another
+        tool in the same batch is submitted once that call has finished. A call
+        matching a speculative call reuses it instead of running again.
+        ``on_result`` is called with each call's index and outcome as it
+        finishes. Returns one ``(result, error)`` pair per call, in the original
+        order.
+        """
+        dependencies = self.tool_dependencies(tool_calls)
+        outcomes: List[Optional[Tuple[Any, Optional[Exception]]]] = [None] * len(tool_calls)
+        waiting = list(range(len(tool_calls)))
+        running = {}
+        while waiting or running:
+            ready = [index for index in waiting if all(outcomes[j] is not None for j in dependencies[index])]
+            if not ready and not running:
+                # A dependency cycle can never become ready; run it rather than stall
+                ready = waiting[:1]
+            for index in ready:
+                waiting.remove(index)
+                tool_call = tool_calls[index]
+                finished = [(tool_calls[j]['name'], outcomes[j]) for j in sorted(dependencies[index]) if outcomes[j] is not None]
+                args = self._resolve_dependencies(tool_call, finished)
+                future = self._claim_speculative(speculation, tool_call['name'], args)
+                if future is None:
+                    future = self._submit_tool(tool_call['name'], args)
+                running[future] = index
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                outcomes[index] = future.result()
+                if on_result is not None:
+                    on_result(index, outcomes[index])
+        return outcomes
+    
+    async def aexecute_tool_calls(self, tool_calls: List[Dict[str, Any]], speculation: Optional[Speculation] = None,
+                                  on_result: Callable[[int, Tuple[Any, Optional[Exception]]], None] = None
+                                  ) -> List[Tuple[Any, Optional[Exception]]]:
+        """Async counterpart of execute_tool_calls.
+        
+        Each call awaits the calls it depends on and then runs on the tool
+        executor, so the event loop stays free while tools work.
+        """
+        loop = asyncio.get_running_loop()
+        # Calls awaiting each other in a cycle would wait forever; break the cycles up front
+        dependencies = self.acyclic_dependencies(self.tool_dependencies(tool_calls))
+        outcomes = [loop.create_future() for _ in tool_calls]
+        
+        async def run(index: int):
+            try:
+                finished = []
+                for j in sorted(dependencies[index]):
+                    finished.append((tool_calls[j]['name'], await outcomes[j]))
+                args = self._resolve_dependencies(tool_calls[index], finished)
+                future = self._claim_speculative(speculation, tool_calls[index]['name'], args)
+                if future is None:
+                    future = self._submit_tool(tool_calls[index]['name'], args)
+                outcome = await asyncio.wrap_future(future)
+            except Exception as e:
+                # Fail this call like a failed tool, so the calls depending on it still run
+                logger.warning("⚠️ Tool call %s failed: %s", tool_calls[index]['name'], e)
+                outcome = (None, e)
+            except BaseException as e:
+                # e.g. cancellation: wake the calls awaiting this one instead of leaving them hanging
+                if isinstance(e, asyncio.CancelledError):
+                    outcomes[index].cancel()
+                else:
+                    outcomes[index].set_exception(e)
+                raise
+            outcomes[index].set_result(outcome)
+            if on_result is not None:
+                on_result(index, outcome)
+            return outcome
+        
+        return list(await asyncio.gather(*(run(index) for index in range(len(tool_calls)))))
+    
+    def _resolve_dependencies(self, tool_call: Dict[str, Any], finished: List[Tuple[str, Tuple[Any, Optional[Exception]]]]) -> Dict[str, Any]:
+        """Fill arguments that come from the results of dependency tools"""
+        args = dict(tool_call['args'])
+        tool = self.tool_registry.get(tool_call['name'])
+        if tool is None:
+            return args
+        for arg_name, (dependency, result_key) in tool.depends_on.items():
+            for name, (result, error) in finished:
+                if name == dependency and error is None:
+                    args[arg_name] = result if result_key is None else result[result_key]
+        return args
+    
+    def _run_tool(self, tool_name: str, tool_args: Dict[str, Any]) -> Tuple[Any, Optional[Exception]]:
+        logger.debug("🔧 Calling tool: %s", tool_name)
+        with span(tool_name, "tool") as tool_span:
+            tool = self.tool_registry.get(tool_name)
+            if tool is None:
+                error = ValueError(f"Unknown tool: {tool_name}")
+                tool_span.set_error(error)
+                return None, error
+            try:
+                return tool(**tool_args), None
+            except Exception as e:
+                logger.warning("⚠️ Tool %s failed: %s", tool_name, e)
+                tool_span.set_error(e)
+                return None, e
+    
+    def _submit_tool(self, tool_name: str, tool_args: Dict[str, Any]) -> Future:
+        # Run in a copy of the caller's context so tool spans nest under the node span
+        return self.tool_executor.submit(copy_context().run, self._run_tool, tool_name, tool_args)
+    
+    @staticmethod
+    def state_updates(tool_name: str, result: Any) -> Dict[str, Any]:
+        """Map a tool result onto the TravelState keys it fills"""
+        if tool_name == "research_destination":
+            return {"researched_destinations": result, "attractions": result.get("attractions", [])}
+        if tool_name in TOOL_STATE_KEYS:
+            return {TOOL_STATE_KEYS[tool_name]: result}
+        return {}
+    
+    def build_enrichment_prompt(self, state: TravelState) -> str:
+        """Create the prompt for the optional free-text travel notes"""
+        attractions = ', '.join(state.get("attractions") or []) or 'N/A'
+        return f"""
+        Write a short, friendly overview (3-4 sentences) of a {state['trip_duration']}-day
+        {state['travel_style']} trip to {state['destination']} in {state['travel_month']}
+        for {state['traveler_count']} travelers interested in {', '.join(state['interests'])}.
+        Planned highlights: {attractions}
+        """
+    
+    def enrich_report(self, state: TravelState) -> Optional[str]:
+        """Ask the LLM for travel notes; the plan is complete without them"""
+        try:
+            with span("enrichment", "llm", model=self.model) as llm_span:
+                response = self.llm.invoke([HumanMessage(content=self.build_enrichment_prompt(state))])
+                self.record_usage(llm_span, response)
+            return response.content
+        except Exception as e:
+            logger.warning("⚠️ Skipping travel notes: %s", e)
+            return None
+    
+    async def aenrich_report(self, state: TravelState) -> Optional[str]:
+        """Async counterpart of enrich_report"""
+        try:
+            with span("enrichment", "llm", model=self.model) as llm_span:
+                response = await self.llm.ainvoke([HumanMessage(content=self.build_enrichment_prompt(state))])
+                self.record_usage(llm_span, response)
+            return response.content
+        except Exception as e:
+            logger.warning("⚠️ Skipping travel notes: %s", e)
+            return None
+    
     def synthesizer_node(self, state: TravelState) -> Dict[str, Any]:
         """Synthesize all information into final report"""
-        print("📝 Generating final report...")
-        
-        # Create comprehensive travel report
-        report_parts = []
-        
-        # Destination overview
-        if "researched_destinations" in state:
-            dest_info = state["researched_destinations"]
-            report_parts.append(f"# 🌍 {state['destination'].upper()} TRAVEL PLAN")
-            report_parts.append(f"**Description**: {dest_info.get('description', 'N/A')}")
-            report_parts.append(f"**Best Season**: {dest_info.get('best_season', 'N/A')}")
-            report_parts.append(f"**Cost Level**: {dest_info.get('cost_level', 'N/A')}")
-            report_parts.append("")
-        
-        # Itinerary
-        if "daily_itinerary" in state:
-            report_parts.append("## 📅 DAILY ITINERARY")
-            for day in state["daily_itinerary"]:
-                report_parts.append(f"### Day {day['day']}")
-                report_parts.append(f"- **Morning**: {day['morning']}")
-                report_parts.append(f"- **Afternoon**: {day['afternoon']}")
-                report_parts.append(f"- **Evening**: {day['evening']}")
-                report_parts.append(f"- **Meals**: {day['meals']}")
-                report_parts.append(f"- **Accommodation**: {day['accommodation_type']}")
-                report_parts.append("")
-        
-        # Budget
-        if "budget_breakdown" in state:
-            budget = state["budget_breakdown"]
-            report_parts.append("## 💰 BUDGET BREAKDOWN")
-            report_parts.append(f"**Total Budget**: ${budget['total_budget']}")
-            report_parts.append(f"**Budget Level**: {budget['budget_level']}")
-            report_parts.append(f"**Daily Budget**: ${budget['budget_per_day']}")
-            report_parts.append(f"**Per Person**: ${budget['budget_per_person']}")
-            report_parts.append("")
-            report_parts.append("**Category Breakdown**:")
-            for category, amount in budget["budget_breakdown"].items():
-                category_name = category.replace('_', ' ').title()
-                report_parts.append(f"- {category_name}: ${amount}")
-            report_parts.append("")
-        
-        # Weather
-        if "weather_info" in state:
-            weather = state["weather_info"]
-            report_parts.append("## 🌤️ WEATHER & PACKING")
-            report_parts.append(f"**Temperature**: {weather['temperature']}")
-            report_parts.append(f"**Conditions**: {weather['weather_conditions']}")
-            report_parts.append(f"**Rainfall**: {weather['average_rainfall']}")
-            report_parts.append(f"**Sunlight**: {weather['daily_sunlight']}")
-            report_parts.append("")
-            report_parts.append("**Packing Recommendations**:")
-            for item in weather["packing_recommendations"]:
-                report_parts.append(f"- {item}")
-        
-        final_report = "\n".join(report_parts)
+        logger.info("📝 Generating final report...")
+        notes = self.enrich_report(state) if self.enrich else None
+        return self.build_report(state, notes)
+    
+    async def asynthesizer_node(self, state: TravelState) -> Dict[str, Any]:
+        """Async synthesizer node - only the optional enrichment call is awaited"""
+        logger.info("📝 Generating final report...")
+        notes = await self.aenrich_report(state) if self.enrich else None
+        return self.build_report(state, notes)
+    
+    def report_sections(self, state: TravelState, notes: Optional[str] = None,
+                        names: Iterable[str] = None) -> List[Tuple[str, str]]:
+        """Render the Markdown report sections whose inputs exist in state, in report order"""
+        return self.report_renderer.sections(state, notes, names=names)
+    
+    def build_report(self, state: TravelState, notes: Optional[str] = None) -> Dict[str, Any]:
+        """Assemble the final report and its state update"""
+        sink = self.event_sink(state)
+        if sink is not None:
+            # Sections already streamed from tools_node are not sent again
+            self.emit_sections(sink, state, notes=notes)
+        
+        final_report = self.report_renderer.render(state, notes)
         
         return {
             "final_report": final_report,
             "status": "completed",
-            "messages": [HumanMessage(content=f"Travel plan completed! Report:\n\n{final_report}")]
+            # The report lives in final_report; don't copy it into the message history
+            "messages": [HumanMessage(content="Travel plan completed! The full report is in final_report.")]
         }
     
     def should_continue(self, state: TravelState) -> str:
@@ -190,14 +611,35 @@ class TravelPlannerAgent:
             
         return "continue"
     
+    def traced_node(self, name: str, func: Callable, afunc: Callable) -> RunnableLambda:
+        """Wrap a node in a span, and send node_started/node_finished events to streamed runs"""
+        def node(state: TravelState) -> Dict[str, Any]:
+            self.emit(state, "node_started", name)
+            with span(name, "node", run_id=state.get("run_id")) as node_span:
+                update = func(state)
+                node_span.set_attribute("status", update.get("status"))
+            self.emit(state, "node_finished", name, update.get("status"))
+            return update
+        
+        async def anode(state: TravelState) -> Dict[str, Any]:
+            self.emit(state, "node_started", name)
+            with span(name, "node", run_id=state.get("run_id")) as node_span:
+                update = await afunc(state)
+                node_span.set_attribute("status", update.get("status"))
+            self.emit(state, "node_finished", name, update.get("status"))
+            return update
+        
+        return RunnableLambda(node, afunc=anode)
+    
     def build_graph(self):
         """Build the LangGraph workflow"""
         workflow = StateGraph(TravelState)
         
-        # Add nodes
-        workflow.add_node("planner", self.planner_node)
-        workflow.add_node("tools", self.tools_node)
-        workflow.add_node("synthesizer", self.synthesizer_node)
+        # Add nodes; each has a sync and an async implementation so the same
+        # graph serves both invoke (plan_trip) and ainvoke (aplan_trip)
+        workflow.add_node("planner", self.traced_node("planner", self.planner_node, self.aplanner_node))
+        workflow.add_node("tools", self.traced_node("tools", self.tools_node, self.atools_node))
+        workflow.add_node("synthesizer", self.traced_node("synthesizer", self.synthesizer_node, self.asynthesizer_node))
         
         # Define workflow
         workflow.set_entry_point("planner")
@@ -214,15 +656,15 @@ class TravelPlannerAgent:
         
         self.graph = workflow.compile()
     
-    def plan_trip(self, 
-                 destination: str,
-                 duration: int,
-                 budget: float,
-                 travel_style: str = "mixed",
-                 traveler_count: int = 1,
-                 interests: List[str] = None,
-                 travel_month: str = None) -> Dict[str, Any]:
-        """Main method to plan a complete trip"""
+    def build_initial_state(self,
+                            destination: str,
+                            duration: int,
+                            budget: float,
+                            travel_style: str = "mixed",
+                            traveler_count: int = 1,
+                            interests: List[str] = None,
+                            travel_month: str = None) -> Dict[str, Any]:
+        """Build the initial graph state for a trip request"""
         
         if interests is None:
             interests = ["sightseeing"]
@@ -230,7 +672,7 @@ class TravelPlannerAgent:
         if travel_month is None:
             travel_month = "May"  # Default to spring
         
-        initial_state = {
+        return {
             "destination": destination,
             "trip_duration": duration,
             "budget": budget,
@@ -239,11 +681,211 @@ class TravelPlannerAgent:
             "interests": interests,
             "travel_month": travel_month,
             "messages": [],
-            "status": "initialized"
+            "status": "initialized",
+            "run_id": uuid.uuid4().hex
         }
+    
+    def run_graph(self, initial_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoke the graph, dropping any speculation the run left behind"""
+        try:
+            with span("plan", "plan", run_id=initial_state.get("run_id"),
+                      destination=initial_state.get("destination")):
+                return self.graph.invoke(initial_state)
+        finally:
+            self.discard_speculation(self.take_speculation(initial_state.get("run_id")))
+    
+    async def arun_graph(self, initial_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of run_graph"""
+        try:
+            with span("plan", "plan", run_id=initial_state.get("run_id"),
+                      destination=initial_state.get("destination")):
+                return await self.graph.ainvoke(initial_state)
+        finally:
+            self.discard_speculation(self.take_speculation(initial_state.get("run_id")))
+    
+    def plan_trip(self, 
+                 destination: str,
+                 duration: int,
+                 budget: float,
+                 travel_style: str = "mixed",
+                 traveler_count: int = 1,
+                 interests: List[str] = None,
+                 travel_month: str = None) -> Dict[str, Any]:
+        """Main method to plan a complete trip"""
+        
+        initial_state = self.build_initial_state(destination, duration, budget, travel_style,
+                                                 traveler_count, interests, travel_month)
+        
+        logger.info("🚀 Starting travel planning for %s...", destination)
+        result = self.run_graph(initial_state)
+        logger.info("✅ Travel planning completed!")
+        
+        return result
+    
+    async def aplan_trip(self,
+                         destination: str,
+                         duration: int,
+                         budget: float,
+                         travel_style: str = "mixed",
+                         traveler_count: int = 1,
+                         interests: List[str] = None,
+                         travel_month: str = None) -> Dict[str, Any]:
+        """Plan a complete trip on the running event loop.
+        
+        The LLM call is awaited and tools run on the tool executor, so a single
+        event loop can keep many plans in flight at once.
+        """
+        
+        initial_state = self.build_initial_state(destination, duration, budget, travel_style,
+                                                 traveler_count, interests, travel_month)
+        
+        logger.info("🚀 Starting travel planning for %s...", destination)
+        result = await self.arun_graph(initial_state)
+        logger.info("✅ Travel planning completed!")
+        
+        return result
+    
+    def plan_trip_stream(self,
+                         destination: str,
+                         duration: int,
+                         budget: float,
+                         travel_style: str = "mixed",
+                         traveler_count: int = 1,
+                         interests: List[str] = None,
+                         travel_month: str = None) -> Iterator[PlanEvent]:
+        """Plan a trip, yielding PlanEvents as the run progresses.
+        
+        Report sections are yielded as soon as the tool results they need
+        arrive, ahead of the final report; the last event is "plan_completed"
+        carrying the same state plan_trip returns. The graph runs on a
+        background thread; errors are re-raised from the generator. Closing
+        the generator early stops the run at its next event (the node or
+        tool call in progress finishes first).
+        """
+        
+        initial_state = self.build_initial_state(destination, duration, budget, travel_style,
+                                                 traveler_count, interests, travel_month)
+        run_id = initial_state["run_id"]
+        events: "queue.Queue[Optional[PlanEvent]]" = queue.Queue()
+        outcome = {}
+        
+        sink = EventSink(events.put)
+        
+        def run():
+            try:
+                outcome["result"] = self.run_graph(initial_state)
+            except StreamClosed:
+                logger.debug("Streamed run %s stopped: the consumer closed the stream", run_id)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                self.register_event_sink(run_id, None)
+                events.put(None)
+        
+        logger.info("🚀 Starting travel planning for %s...", destination)
+        self.register_event_sink(run_id, sink)
+        worker = threading.Thread(target=run, name="travel-plan-stream", daemon=True)
+        try:
+            worker.start()
+            while True:
+                event = events.get()
+                if event is None:
+                    break
+                yield event
+            if "error" in outcome:
+                raise outcome["error"]
+            logger.info("✅ Travel planning completed!")
+            yield PlanEvent("plan_completed", "plan", outcome["result"])
+        finally:
+            # If the caller stops early, the run stops at its next event; the
+            # worker unregisters the sink once the graph has returned
+            sink.close()
+            if not worker.is_alive():
+                self.register_event_sink(run_id, None)
+    
+    async def aplan_trip_stream(self,
+                                destination: str,
+                                duration: int,
+                                budget: float,
+                                travel_style: str = "mixed",
+                                traveler_count: int = 1,
+                                interests: List[str] = None,
+                                travel_month: str = None) -> AsyncIterator[PlanEvent]:
+        """Async counterpart of plan_trip_stream; the graph runs as a task on the running loop"""
+        
+        initial_state = self.build_initial_state(destination, duration, budget, travel_style,
+                                                 traveler_count, interests, travel_month)
+        run_id = initial_state["run_id"]
+        loop = asyncio.get_running_loop()
+        events: "asyncio.Queue[Optional[PlanEvent]]" = asyncio.Queue()
+        
+        logger.info("🚀 Starting travel planning for %s...", destination)
+        # Events may come from tool threads, so hand them over to the loop
+        sink = EventSink(lambda event: loop.call_soon_threadsafe(events.put_nowait, event))
+        self.register_event_sink(run_id, sink)
+        task = asyncio.ensure_future(self.arun_graph(initial_state))
+        # Mark the outcome retrieved: after an early close nobody awaits the task
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        task.add_done_callback(lambda _: loop.call_soon_threadsafe(events.put_nowait, None))
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            result = task.result()
+            logger.info("✅ Travel planning completed!")
+            yield PlanEvent("plan_completed", "plan", result)
+        finally:
+            # Tool threads still running see the closed sink and stop the run too
+            sink.close()
+            self.register_event_sink(run_id, None)
+            if not task.done():
+                task.cancel()
+    
+    def write_report(self, result: Dict[str, Any], stream, fmt: str = "markdown") -> int:
+        """Write the report of a finished plan to a file or socket stream.
+        
+        fmt is "markdown", "html" or "json". Sections are streamed in chunks,
+        so large itineraries are never held as one string.
+        """
+        return self.report_renderer.write(result, stream, fmt=fmt)
+    
+    def plan_trips(self, requests: Iterable[Dict[str, Any]], max_concurrency: int = 8) -> Iterator[PlanResult]:
+        """Plan many trips with one compiled graph, yielding results as they finish.
+        
+        Each request is a dict of ``plan_trip`` keyword arguments. Identical
+        requests are planned once and their result is yielded for every index
+        (the same result object is shared). At most ``max_concurrency`` plans,
+        and therefore LLM calls, are in flight at once. A failing request yields
+        a PlanResult with ``error`` set instead of aborting the batch.
+        """
+        requests = list(requests)
         
-        print(f"🚀 Starting travel planning for {destination}...")
-        result = self.graph.invoke(initial_state)
-        print("✅ Travel planning completed!")
+        # Deduplicate on the fully defaulted initial state, ignoring its run id
+        unique_states: Dict[str, Dict[str, Any]] = {}
+        indexes_by_key: Dict[str, List[int]] = {}
+        for index, request in enumerate(requests):
+            try:
+                state = self.build_initial_state(**request)
+            except TypeError as e:
+                yield PlanResult(index, request, None, e)
+                continue
+            key = json.dumps({k: v for k, v in state.items() if k != "run_id"}, sort_keys=True, default=str)
+            unique_states.setdefault(key, state)
+            indexes_by_key.setdefault(key, []).append(index)
         
-        return result
\ No newline at end of file
+        logger.info("🚀 Planning %d unique trips (%d requests)...", len(unique_states), len(requests))
+        pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="travel-plan")
+        try:
+            futures = {pool.submit(self.run_graph, state): key for key, state in unique_states.items()}
+            for future in as_completed(futures):
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, e
+                for index in indexes_by_key[futures[future]]:
+                    yield PlanResult(index, requests[index], result, error)
+        finally:
+            # Stop queued plans if the caller abandons the generator early
+            pool.shutdown(wait=False, cancel_futures=True)
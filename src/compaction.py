@@ -0,0 +1,186 @@
+from collections.abc import Iterable, Mapping
+from typing import Any, Callable, Dict, Optional
+import json
+import math
+import threading
+
+from src.tools.records import json_default
+
+# Sentinel: the tokenizer has not been looked up yet
+_UNSET = object()
+_encoding = _UNSET
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """Return the tiktoken encoding, or None when tiktoken (or its data) is unavailable"""
+    global _encoding
+    if _encoding is _UNSET:
+        with _encoding_lock:
+            if _encoding is _UNSET:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    # Not installed, or the encoding file cannot be downloaded
+                    _encoding = None
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Count tokens with tiktoken when available, else estimate ~4 characters per token"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def _is_binary_string(value: str) -> bool:
+    return value.startswith("data:") and ";base64," in value[:100]
+
+
+class CompactionPolicy:
+    """How to shrink one tool's result before it is sent back to the LLM.
+
+    - ``max_list_items``: longer lists keep their first items plus a count of the rest
+    - ``float_digits``: floats are rounded to this many digits
+    - ``max_string_chars``: longer strings are truncated
+    - ``drop_keys``: dict keys that are removed entirely
+    - ``summarize``: optional callable replacing the result before the generic rules
+    - ``max_tokens``: the compacted content is tightened until it fits this budget
+    """
+
+    def __init__(self, max_list_items: int = 5, float_digits: int = 2, max_string_chars: int = 200,
+                 drop_keys: tuple = (), summarize: Optional[Callable[[Any], Any]] = None,
+                 max_tokens: int = 400):
+        self.max_list_items = max_list_items
+        self.float_digits = float_digits
+        self.max_string_chars = max_string_chars
+        self.drop_keys = frozenset(drop_keys)
+        self.summarize = summarize
+        self.max_tokens = max_tokens
+
+    def compact(self, value: Any, max_list_items: Optional[int] = None) -> Any:
+        """Apply the generic rules recursively"""
+        if max_list_items is None:
+            max_list_items = self.max_list_items
+        if isinstance(value, Mapping):
+            if "artifact_id" in value:
+                # The LLM only needs to know an artifact exists, not where it lives
+                return {key: value[key] for key in ("artifact_id", "content_type") if key in value}
+            return {key: self.compact(item, max_list_items) for key, item in value.items()
+                    if key not in self.drop_keys}
+        if isinstance(value, (list, tuple)):
+            items = [self.compact(item, max_list_items) for item in value[:max_list_items]]
+            if len(value) > max_list_items:
+                items.append(f"... (+{len(value) - max_list_items} more)")
+            return items
+        if isinstance(value, float):
+            return round(value, self.float_digits)
+        if isinstance(value, str):
+            if _is_binary_string(value):
+                return f"<binary data omitted, {len(value)} chars>"
+            if len(value) > self.max_string_chars:
+                return value[:self.max_string_chars] + "..."
+        return value
+
+
+def _summarize_itinerary(itinerary: Any) -> Any:
+    # The LLM already knows the daily template; the morning slot carries the day's focus
+    if isinstance(itinerary, (Mapping, str)) or not isinstance(itinerary, Iterable):
+        return itinerary
+    # Single pass, so streamed itineraries (iter_daily_itinerary) work too
+    accommodation_type, mornings = None, []
+    for day in itinerary:
+        if not mornings:
+            accommodation_type = day.get("accommodation_type")
+        mornings.append(day.get("morning"))
+    return {"days": len(mornings), "accommodation_type": accommodation_type, "mornings": mornings}
+
+
+DEFAULT_POLICY = CompactionPolicy()
+
+# Per-tool policies; tools not listed use DEFAULT_POLICY
+TOOL_POLICIES: Dict[str, CompactionPolicy] = {
+    "research_destination": CompactionPolicy(max_list_items=6, drop_keys=("activities",)),
+    "build_daily_itinerary": CompactionPolicy(max_list_items=7, max_string_chars=120,
+                                              summarize=_summarize_itinerary),
+    # daily_breakdown is the total breakdown divided by trip_duration
+    "calculate_budget_breakdown": CompactionPolicy(float_digits=0, drop_keys=("daily_breakdown",)),
+    "get_seasonal_weather": CompactionPolicy(max_list_items=5),
+    "generate_itinerary_map": CompactionPolicy(max_tokens=50),
+    "generate_budget_chart": CompactionPolicy(max_tokens=50),
+    "generate_interactive_map": CompactionPolicy(max_tokens=50),
+}
+
+
+class ToolResultCompactor:
+    """Turns tool results into token-bounded ToolMessage content.
+
+    The full result stays in graph state; only the message sent back to the
+    LLM is compacted. Keeps running token totals per tool so the savings can
+    be checked with ``stats()``.
+    """
+
+    def __init__(self, policies: Dict[str, CompactionPolicy] = None, enabled: bool = True):
+        self.policies = TOOL_POLICIES if policies is None else policies
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def serialize(result: Any) -> str:
+        """The uncompacted message content (the previous ToolMessage format)"""
+        return json.dumps(result, default=json_default) if isinstance(result, (Mapping, list)) else str(result)
+
+    def compact(self, tool_name: str, result: Any) -> str:
+        """Return the ToolMessage content for a tool result"""
+        raw = self.serialize(result)
+        if not self.enabled or not isinstance(result, (Mapping, list)):
+            content = raw
+        else:
+            content = self._compact(self.policies.get(tool_name, DEFAULT_POLICY), result)
+        self._record(tool_name, raw, content)
+        return content
+
+    def _compact(self, policy: CompactionPolicy, result: Any) -> str:
+        value = policy.summarize(result) if policy.summarize else result
+        max_list_items = policy.max_list_items
+        while True:
+            content = json.dumps(policy.compact(value, max_list_items), separators=(",", ":"),
+                                 ensure_ascii=False, default=str)
+            if estimate_tokens(content) <= policy.max_tokens:
+                return content
+            if max_list_items <= 1:
+                break
+            max_list_items //= 2
+        # Still over budget: cut the text (about 4 characters per token)
+        return content[:policy.max_tokens * 4] + "...[truncated]"
+
+    def _record(self, tool_name: str, raw: str, content: str):
+        raw_tokens = estimate_tokens(raw)
+        sent_tokens = raw_tokens if content is raw else estimate_tokens(content)
+        with self._lock:
+            totals = self._totals.setdefault(tool_name, {"calls": 0, "raw_tokens": 0, "sent_tokens": 0})
+            totals["calls"] += 1
+            totals["raw_tokens"] += raw_tokens
+            totals["sent_tokens"] += sent_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """Return token totals per tool and overall, including tokens saved"""
+        with self._lock:
+            per_tool = {name: dict(totals, saved_tokens=totals["raw_tokens"] - totals["sent_tokens"])
+                        for name, totals in self._totals.items()}
+        raw_tokens = sum(totals["raw_tokens"] for totals in per_tool.values())
+        sent_tokens = sum(totals["sent_tokens"] for totals in per_tool.values())
+        return {
+            "raw_tokens": raw_tokens,
+            "sent_tokens": sent_tokens,
+            "saved_tokens": raw_tokens - sent_tokens,
+            "saved_ratio": (raw_tokens - sent_tokens) / raw_tokens if raw_tokens else 0.0,
+            "tools": per_tool,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
@@ -0,0 +1,130 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+
+from src.tools.paths import cache_path
+
+# Bump when the planner prompt changes so stale plans are not replayed
+PROMPT_VERSION = 1
+
+
+def _normalize_text(value: Any) -> str:
+    return " ".join(str(value).lower().split())
+
+
+def planner_cache_key(state: Dict[str, Any], model: str) -> str:
+    """Hash the state fields that fully determine the planner prompt.
+
+    Case, whitespace and interest ordering are normalized so equivalent
+    requests share one cache entry.
+    """
+    fields = {
+        "prompt_version": PROMPT_VERSION,
+        "model": model,
+        "destination": _normalize_text(state["destination"]),
+        "trip_duration": int(state["trip_duration"]),
+        "traveler_count": int(state["traveler_count"]),
+        "budget": float(state["budget"]),
+        "travel_style": _normalize_text(state["travel_style"]),
+        "interests": sorted({_normalize_text(interest) for interest in state["interests"]}),
+        "travel_month": _normalize_text(state["travel_month"]),
+    }
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PlannerCache:
+    """SQLite-backed cache of planner LLM responses with TTL and LRU eviction.
+
+    Stores the full serialized AIMessage (content and tool calls), so a hit can
+    be replayed through the graph exactly like a fresh model response. The
+    database defaults to planner_cache.sqlite3 in the user cache directory
+    (see tools.paths); use ``path=":memory:"`` for a process-local cache.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = 24 * 3600,
+                 max_entries: int = 10000):
+        path = cache_path("planner_cache.sqlite3", path)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS planner_cache ("
+            " key TEXT PRIMARY KEY, message TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS planner_cache_lru ON planner_cache (last_access)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[BaseMessage]:
+        """Return the cached response for key, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT message, created_at FROM planner_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM planner_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expirations += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE planner_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return messages_from_dict(json.loads(row[0]))[0]
+
+    def put(self, key: str, message: BaseMessage):
+        """Store a response, evicting least recently used entries beyond max_entries"""
+        now = time.time()
+        payload = json.dumps(messages_to_dict([message]))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO planner_cache (key, message, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now)
+            )
+            evicted = self._conn.execute(
+                "DELETE FROM planner_cache WHERE key IN ("
+                " SELECT key FROM planner_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._conn.commit()
+            self.evictions += max(evicted, 0)
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM planner_cache")
+            self._conn.commit()
+            self.hits = self.misses = self.expirations = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss metrics and the current entry count"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM planner_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "entries": entries,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
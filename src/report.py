@@ -0,0 +1,309 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import html
+import io
+import json
+import threading
+
+from src.tools.records import to_plain
+from src.tools.render_cache import make_cache_key
+
+# Report sections in report order
+REPORT_SECTIONS = ("overview", "itinerary", "budget", "weather", "visualizations", "notes")
+
+FORMATS = ("markdown", "html", "json")
+
+# Rendered sections kept by a ReportRenderer, least recently used evicted first
+REPORT_MEMO_SIZE = 64
+
+# Visualization state keys and their labels
+VISUALS = (("Itinerary Map", "itinerary_map"), ("Budget Chart", "budget_chart"),
+           ("Interactive Map", "interactive_map"))
+
+
+def _compile(template: str) -> Callable[..., str]:
+    # Bound format methods are created once at import and reused for every render
+    return template.format
+
+
+MARKDOWN = {
+    "overview": _compile("# 🌍 {destination} TRAVEL PLAN\n"
+                         "**Description**: {description}\n"
+                         "**Best Season**: {best_season}\n"
+                         "**Cost Level**: {cost_level}\n"),
+    "itinerary": _compile("## 📅 DAILY ITINERARY\n"),
+    "day": _compile("### Day {day}\n"
+                    "- **Morning**: {morning}\n"
+                    "- **Afternoon**: {afternoon}\n"
+                    "- **Evening**: {evening}\n"
+                    "- **Meals**: {meals}\n"
+                    "- **Accommodation**: {accommodation_type}\n"),
+    "day_separator": _compile("\n"),
+    "budget": _compile("## 💰 BUDGET BREAKDOWN\n"
+                       "**Total Budget**: ${total_budget}\n"
+                       "**Budget Level**: {budget_level}\n"
+                       "**Daily Budget**: ${budget_per_day}\n"
+                       "**Per Person**: ${budget_per_person}\n"
+                       "\n"
+                       "**Category Breakdown**:\n"),
+    "category": _compile("- {name}: ${amount}\n"),
+    "weather": _compile("## 🌤️ WEATHER & PACKING\n"
+                        "**Temperature**: {temperature}\n"
+                        "**Conditions**: {weather_conditions}\n"
+                        "**Rainfall**: {average_rainfall}\n"
+                        "**Sunlight**: {daily_sunlight}\n"
+                        "\n"
+                        "**Packing Recommendations**:\n"),
+    "packing_item": _compile("- {item}\n"),
+    "visualizations": _compile("## 📊 VISUALIZATIONS\n"),
+    "visual": _compile("- [{label}]({url})\n"),
+    "notes": _compile("## ✨ TRAVEL NOTES\n{notes}\n"),
+    "header": _compile(""),
+    "section_separator": _compile("\n"),
+    "footer": _compile(""),
+}
+
+HTML = {
+    "overview": _compile("<section id=\"overview\">\n"
+                         "<h1>🌍 {destination} TRAVEL PLAN</h1>\n"
+                         "<p><strong>Description</strong>: {description}</p>\n"
+                         "<p><strong>Best Season</strong>: {best_season}</p>\n"
+                         "<p><strong>Cost Level</strong>: {cost_level}</p>\n"),
+    "itinerary": _compile("<section id=\"itinerary\">\n<h2>📅 DAILY ITINERARY</h2>\n"),
+    "day": _compile("<h3>Day {day}</h3>\n<ul>\n"
+                    "<li><strong>Morning</strong>: {morning}</li>\n"
+                    "<li><strong>Afternoon</strong>: {afternoon}</li>\n"
+                    "<li><strong>Evening</strong>: {evening}</li>\n"
+                    "<li><strong>Meals</strong>: {meals}</li>\n"
+                    "<li><strong>Accommodation</strong>: {accommodation_type}</li>\n"
+                    "</ul>\n"),
+    "day_separator": _compile(""),
+    "budget": _compile("<section id=\"budget\">\n<h2>💰 BUDGET BREAKDOWN</h2>\n"
+                       "<p><strong>Total Budget</strong>: ${total_budget}</p>\n"
+                       "<p><strong>Budget Level</strong>: {budget_level}</p>\n"
+                       "<p><strong>Daily Budget</strong>: ${budget_per_day}</p>\n"
+                       "<p><strong>Per Person</strong>: ${budget_per_person}</p>\n"
+                       "<h3>Category Breakdown</h3>\n"),
+    "category": _compile("<li>{name}: ${amount}</li>\n"),
+    "weather": _compile("<section id=\"weather\">\n<h2>🌤️ WEATHER &amp; PACKING</h2>\n"
+                        "<p><strong>Temperature</strong>: {temperature}</p>\n"
+                        "<p><strong>Conditions</strong>: {weather_conditions}</p>\n"
+                        "<p><strong>Rainfall</strong>: {average_rainfall}</p>\n"
+                        "<p><strong>Sunlight</strong>: {daily_sunlight}</p>\n"
+                        "<h3>Packing Recommendations</h3>\n"),
+    "packing_item": _compile("<li>{item}</li>\n"),
+    "visualizations": _compile("<section id=\"visualizations\">\n<h2>📊 VISUALIZATIONS</h2>\n"),
+    "visual": _compile("<li><a href=\"{url}\">{label}</a></li>\n"),
+    "notes": _compile("<section id=\"notes\">\n<h2>✨ TRAVEL NOTES</h2>\n<p>{notes}</p>\n"),
+    "header": _compile("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+                       "<title>{destination} travel plan</title>\n</head>\n<body>\n"),
+    "section_separator": _compile(""),
+    "footer": _compile("</body>\n</html>\n"),
+}
+
+# Lists inside HTML sections are wrapped in <ul>; every section is closed with </section>
+HTML_LIST_OPEN = "<ul>\n"
+HTML_LIST_CLOSE = "</ul>\n"
+HTML_SECTION_CLOSE = "</section>\n"
+
+
+def _is_one_shot(value: Any) -> bool:
+    return isinstance(value, Iterator)
+
+
+class ReportRenderer:
+    """Renders a travel plan report as Markdown, HTML or JSON.
+
+    Sections are produced as a stream of small chunks, so a report can be
+    written to a file or socket without building the whole string first.
+    Rendered sections are memoized in a bounded LRU keyed on the format,
+    section and a digest of the inputs, so concurrent runs sharing a renderer
+    do not evict each other's sections. ``daily_itinerary`` may also be an
+    iterator, such as iter_daily_itinerary, which is consumed day by day.
+    """
+
+    def __init__(self, memoize: bool = True, memo_size: int = REPORT_MEMO_SIZE):
+        self.memoize = memoize
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def section_inputs(name: str, state: Dict[str, Any], notes: Optional[str] = None) -> Optional[Tuple[Any, ...]]:
+        """Return the values a section is rendered from, or None if it cannot be rendered yet"""
+        if name == "overview":
+            if state.get("researched_destinations") is None:
+                return None
+            return state["destination"], state["researched_destinations"]
+        if name == "itinerary":
+            return None if state.get("daily_itinerary") is None else (state["daily_itinerary"],)
+        if name == "budget":
+            return None if state.get("budget_breakdown") is None else (state["budget_breakdown"],)
+        if name == "weather":
+            return None if state.get("weather_info") is None else (state["weather_info"],)
+        if name == "visualizations":
+            refs = tuple(state.get(key) for _, key in VISUALS)
+            return refs if any(refs) else None
+        if name == "notes":
+            return (notes,) if notes else None
+        raise ValueError(f"Unknown report section: {name}")
+
+    def iter_section(self, name: str, inputs: Tuple[Any, ...], fmt: str = "markdown") -> Iterator[str]:
+        """Yield the chunks of one section (no memoization)"""
+        if fmt == "json":
+            yield from self._json_section(name, inputs)
+            return
+        templates, escape = (HTML, html.escape) if fmt == "html" else (MARKDOWN, str)
+        is_html = fmt == "html"
+
+        if name == "overview":
+            destination, dest_info = inputs
+            yield templates["overview"](
+                destination=escape(destination.upper()),
+                description=escape(str(dest_info.get('description', 'N/A'))),
+                best_season=escape(str(dest_info.get('best_season', 'N/A'))),
+                cost_level=escape(str(dest_info.get('cost_level', 'N/A'))),
+            )
+        elif name == "itinerary":
+            yield templates["itinerary"]()
+            for i, day in enumerate(inputs[0]):
+                if i:
+                    yield templates["day_separator"]()
+                yield templates["day"](**{key: escape(str(day[key])) for key in
+                                          ("day", "morning", "afternoon", "evening", "meals", "accommodation_type")})
+        elif name == "budget":
+            budget = inputs[0]
+            yield templates["budget"](**{key: escape(str(budget[key])) for key in
+                                         ("total_budget", "budget_level", "budget_per_day", "budget_per_person")})
+            if is_html:
+                yield HTML_LIST_OPEN
+            for category, amount in budget["budget_breakdown"].items():
+                yield templates["category"](name=escape(category.replace('_', ' ').title()), amount=escape(str(amount)))
+            if is_html:
+                yield HTML_LIST_CLOSE
+        elif name == "weather":
+            weather = inputs[0]
+            yield templates["weather"](**{key: escape(str(weather[key])) for key in
+                                          ("temperature", "weather_conditions", "average_rainfall", "daily_sunlight")})
+            if is_html:
+                yield HTML_LIST_OPEN
+            for item in weather["packing_recommendations"]:
+                yield templates["packing_item"](item=escape(str(item)))
+            if is_html:
+                yield HTML_LIST_CLOSE
+        elif name == "visualizations":
+            yield templates["visualizations"]()
+            if is_html:
+                yield HTML_LIST_OPEN
+            for (label, _), ref in zip(VISUALS, inputs):
+                if ref:
+                    yield templates["visual"](label=escape(label), url=escape(ref['url']))
+            if is_html:
+                yield HTML_LIST_CLOSE
+        elif name == "notes":
+            yield templates["notes"](notes=escape(inputs[0].strip()))
+        if is_html:
+            yield HTML_SECTION_CLOSE
+
+    @staticmethod
+    def _json_section(name: str, inputs: Tuple[Any, ...]) -> Iterator[str]:
+        dump = lambda value: json.dumps(to_plain(value), default=str)
+        yield f"{dump(name)}: "
+        if name == "overview":
+            _, dest_info = inputs
+            yield dump({key: dest_info.get(key, 'N/A') for key in ("description", "best_season", "cost_level")})
+        elif name == "itinerary":
+            # One chunk per day keeps long itineraries streaming
+            yield "["
+            for i, day in enumerate(inputs[0]):
+                yield (", " if i else "") + dump(day)
+            yield "]"
+        elif name == "visualizations":
+            yield dump({key: ref for (_, key), ref in zip(VISUALS, inputs) if ref})
+        elif name == "notes":
+            yield dump(inputs[0].strip())
+        else:
+            yield dump(inputs[0])
+
+    def section(self, name: str, state: Dict[str, Any], notes: Optional[str] = None,
+                fmt: str = "markdown") -> Optional[str]:
+        """Render one section, or return None if its inputs do not exist yet"""
+        inputs = self.section_inputs(name, state, notes)
+        if inputs is None:
+            return None
+        return "".join(self._memoized_chunks(name, inputs, fmt))
+
+    def sections(self, state: Dict[str, Any], notes: Optional[str] = None, fmt: str = "markdown",
+                 names: Iterable[str] = None) -> List[Tuple[str, str]]:
+        """Render every section that is ready, in report order"""
+        wanted = REPORT_SECTIONS if names is None else [name for name in REPORT_SECTIONS if name in names]
+        rendered = []
+        for name in wanted:
+            text = self.section(name, state, notes, fmt)
+            if text is not None:
+                rendered.append((name, text))
+        return rendered
+
+    def _memoized_chunks(self, name: str, inputs: Tuple[Any, ...], fmt: str) -> Iterator[str]:
+        # Generators (e.g. iter_daily_itinerary) are streamed straight through:
+        # they cannot be rendered twice, and caching their text would hold the
+        # whole section in memory
+        if not self.memoize or any(_is_one_shot(value) for value in inputs):
+            yield from self.iter_section(name, inputs, fmt)
+            return
+        key = (fmt, name, make_cache_key("report_section", inputs))
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        for chunk in self.iter_section(name, inputs, fmt):
+            chunks.append(chunk)
+            yield chunk
+        with self._lock:
+            self._memo[key] = "".join(chunks)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    def iter_report(self, state: Dict[str, Any], notes: Optional[str] = None, fmt: str = "markdown") -> Iterator[str]:
+        """Yield the full report as a stream of chunks"""
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown report format: {fmt}")
+        if fmt == "json":
+            yield '{"destination": %s, "sections": {' % json.dumps(state.get("destination"))
+            separator = ", "
+        else:
+            templates = HTML if fmt == "html" else MARKDOWN
+            yield templates["header"](destination=html.escape(str(state.get("destination"))))
+            separator = templates["section_separator"]()
+        first = True
+        for name in REPORT_SECTIONS:
+            inputs = self.section_inputs(name, state, notes)
+            if inputs is None:
+                continue
+            if not first and separator:
+                yield separator
+            first = False
+            yield from self._memoized_chunks(name, inputs, fmt)
+        yield "}}" if fmt == "json" else templates["footer"]()
+
+    def render(self, state: Dict[str, Any], notes: Optional[str] = None, fmt: str = "markdown") -> str:
+        """Render the full report as a string"""
+        return "".join(self.iter_report(state, notes, fmt))
+
+    def write(self, state: Dict[str, Any], stream, notes: Optional[str] = None, fmt: str = "markdown",
+              encoding: str = "utf-8") -> int:
+        """Write the report chunk by chunk to a text or binary stream.
+
+        Works with files, ``socket.makefile()`` objects and anything else with
+        a ``write`` method. Returns the number of characters written.
+        """
+        binary = isinstance(stream, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(stream, "mode", "")
+        written = 0
+        for chunk in self.iter_report(state, notes, fmt):
+            stream.write(chunk.encode(encoding) if binary else chunk)
+            written += len(chunk)
+        return written
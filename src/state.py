@@ -21,10 +21,14 @@ class TravelState(TypedDict):
     budget_breakdown: Dict[str, Any]
     weather_info: Dict[str, Any]
     
-    # Visualizations
-    itinerary_map: str
-    budget_chart: str
+    # Visualizations (artifact references, see src.tools.artifacts)
+    itinerary_map: Dict[str, Any]
+    budget_chart: Dict[str, Any]
+    interactive_map: Dict[str, Any]
     
     # Final output
     final_report: str
-    status: str
\ No newline at end of file
+    status: str
+    
+    # Identifies one planning run (keys in-flight speculative tool calls)
+    run_id: str
\ No newline at end of file
@@ -0,0 +1,166 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from .instrumentation import span
+from .render_cache import get_render_cache
+
+# File extension used for each artifact content type
+CONTENT_TYPE_EXTENSIONS = {
+    "image/png": ".png",
+    "application/pdf": ".pdf",
+    "text/html": ".html",
+    "application/geo+json": ".geojson",
+}
+
+
+class ArtifactStore(ABC):
+    """Base class for artifact storage backends.
+
+    Artifacts are immutable blobs addressed by a content hash. ``put`` returns a
+    small reference dict (``artifact_id``, ``url``, ``content_type``, ``size``)
+    that is cheap to keep in state and to send through LLM messages.
+    """
+
+    @abstractmethod
+    def put(self, data: bytes, content_type: str = "image/png") -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def get(self, artifact_id: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def exists(self, artifact_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def url(self, artifact_id: str) -> str:
+        ...
+
+    @staticmethod
+    def make_id(data: bytes, content_type: str) -> str:
+        """Derive the content-addressed id of an artifact"""
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        return digest + CONTENT_TYPE_EXTENSIONS.get(content_type, ".bin")
+
+    def make_ref(self, artifact_id: str, content_type: str, size: int) -> Dict[str, Any]:
+        return {
+            "artifact_id": artifact_id,
+            "url": self.url(artifact_id),
+            "content_type": content_type,
+            "size": size,
+        }
+
+
+class LocalArtifactStore(ArtifactStore):
+    """Stores artifacts as files in a local directory.
+
+    ``base_url`` can point at an HTTP server that serves ``root``; without it
+    references carry ``file://`` URLs.
+    """
+
+    def __init__(self, root: Optional[str] = None, base_url: Optional[str] = None):
+        self.root = root or os.path.join(tempfile.gettempdir(), "travel-agent-artifacts")
+        self.base_url = base_url.rstrip("/") if base_url else None
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, artifact_id: str) -> str:
+        if os.path.basename(artifact_id) != artifact_id:
+            raise ValueError(f"Invalid artifact id: {artifact_id}")
+        return os.path.join(self.root, artifact_id)
+
+    def put(self, data: bytes, content_type: str = "image/png") -> Dict[str, Any]:
+        artifact_id = self.make_id(data, content_type)
+        path = self._path(artifact_id)
+        # Content addressing makes repeated writes of the same bytes a no-op
+        if not os.path.exists(path):
+            tmp_path = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return self.make_ref(artifact_id, content_type, len(data))
+
+    def get(self, artifact_id: str) -> bytes:
+        with open(self._path(artifact_id), "rb") as f:
+            return f.read()
+
+    def exists(self, artifact_id: str) -> bool:
+        return os.path.exists(self._path(artifact_id))
+
+    def url(self, artifact_id: str) -> str:
+        if self.base_url:
+            return f"{self.base_url}/{artifact_id}"
+        return "file://" + os.path.abspath(self._path(artifact_id))
+
+
+_artifact_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the process-wide artifact store (a LocalArtifactStore by default)"""
+    global _artifact_store
+    if _artifact_store is None:
+        with _store_lock:
+            if _artifact_store is None:
+                _artifact_store = LocalArtifactStore()
+    return _artifact_store
+
+
+def set_artifact_store(store: ArtifactStore) -> ArtifactStore:
+    """Install a different artifact store backend for this process"""
+    global _artifact_store
+    _artifact_store = store
+    return store
+
+
+def get_or_render_artifact(cache_key: str, render: Callable[[], bytes],
+                           content_type: str = "image/png", name: str = "artifact") -> Dict[str, Any]:
+    """Return the artifact reference for a render, rendering and storing it only on a cache miss.
+
+    ``name`` labels the render span (e.g. "budget_chart").
+    """
+    ref = lookup_artifact(cache_key)
+    if ref is None:
+        with span(name, "render", content_type=content_type) as render_span:
+            data = render()
+            render_span.set_attribute("bytes", len(data))
+        ref = store_artifact(cache_key, data, content_type)
+    return ref
+
+
+def lookup_artifact(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached artifact reference for a render, or None if it must be rendered"""
+    cached = get_render_cache().get(cache_key)
+    if cached is not None:
+        ref = json.loads(cached)
+        if get_artifact_store().exists(ref["artifact_id"]):
+            return ref
+    return None
+
+
+def store_artifact(cache_key: str, data: bytes, content_type: str = "image/png") -> Dict[str, Any]:
+    """Store rendered bytes and remember their reference under the render's cache key"""
+    ref = get_artifact_store().put(data, content_type)
+    get_render_cache().put(cache_key, json.dumps(ref))
+    return ref
+
+
+def load_artifact(ref) -> bytes:
+    """Resolve an artifact reference (dict or id) to its bytes"""
+    artifact_id = ref["artifact_id"] if isinstance(ref, dict) else ref
+    return get_artifact_store().get(artifact_id)
+
+
+def to_data_uri(ref) -> str:
+    """Resolve an artifact reference into an inline data URI, e.g. for notebooks"""
+    if isinstance(ref, str) and ref.startswith("data:"):
+        return ref
+    content_type = ref.get("content_type", "image/png") if isinstance(ref, dict) else "image/png"
+    return f"data:{content_type};base64," + base64.b64encode(load_artifact(ref)).decode()
@@ -1,40 +1,53 @@
-from typing import Dict, List
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING, Any, Dict, List
 import io
-import base64
+
+from .catalog import get_catalog
+from .records import Amounts, BudgetBreakdown
+from .artifacts import get_or_render_artifact
+from .render_cache import make_cache_key, share_signature
+
+if TYPE_CHECKING:
+    # numpy is imported lazily by the batch functions; this is for annotations only
+    import numpy as np
+
+# Style multipliers
+STYLE_MULTIPLIERS = {
+    "luxury": 1.8,
+    "comfort": 1.2,
+    "cultural": 1.0,
+    "adventure": 0.9,
+    "relaxation": 1.3,
+    "budget": 0.6,
+    "mixed": 1.0
+}
+
+# Budget allocation percentages
+BUDGET_ALLOCATION = {
+    "accommodation": 0.35,
+    "food_dining": 0.25,
+    "activities_entertainment": 0.20,
+    "transportation": 0.12,
+    "shopping_souvenirs": 0.05,
+    "emergency_misc": 0.03
+}
+
+# Shared by every breakdown's Amounts mappings
+BUDGET_CATEGORIES = tuple(BUDGET_ALLOCATION)
 
 def calculate_budget_breakdown(destination: str, duration: int, total_budget: float, 
-                             travel_style: str, traveler_count: int = 1) -> Dict[str, float]:
+                             travel_style: str, traveler_count: int = 1) -> Dict:
     """Calculate detailed budget breakdown for a trip"""
     
-    # Cost multipliers based on destination
-    destination_costs = {
-        "paris": {"base_daily": 150, "multiplier": 1.3},
-        "tokyo": {"base_daily": 180, "multiplier": 1.5},
-        "bali": {"base_daily": 80, "multiplier": 0.8},
-        # Pakistan cities - ADDED NEW DATA
-        "islamabad": {"base_daily": 60, "multiplier": 1.1},
-        "karachi": {"base_daily": 50, "multiplier": 1.0},
-        "lahore": {"base_daily": 45, "multiplier": 0.9},
-        "hunza": {"base_daily": 40, "multiplier": 0.8},
-        "swat": {"base_daily": 35, "multiplier": 0.7},
-        "default": {"base_daily": 120, "multiplier": 1.0}
-    }
-    
-    # Style multipliers
-    style_multipliers = {
-        "luxury": 1.8,
-        "comfort": 1.2,
-        "cultural": 1.0,
-        "adventure": 0.9,
-        "relaxation": 1.3,
-        "budget": 0.6,
-        "mixed": 1.0
-    }
+    return calculate_budget_breakdown_record(destination, duration, total_budget, travel_style,
+                                             traveler_count).to_dict()
+
+def calculate_budget_breakdown_record(destination: str, duration: int, total_budget: float,
+                                      travel_style: str, traveler_count: int = 1) -> BudgetBreakdown:
+    """Like calculate_budget_breakdown, as a compact read-only BudgetBreakdown record"""
     
     # Get destination cost data
-    dest_data = destination_costs.get(destination.lower(), destination_costs["default"])
-    style_multiplier = style_multipliers.get(travel_style, 1.0)
+    dest_data = get_catalog().costs(destination)
+    style_multiplier = STYLE_MULTIPLIERS.get(travel_style, 1.0)
     
     # Calculate base daily budget per person
     base_daily = dest_data["base_daily"] * style_multiplier * dest_data["multiplier"]
@@ -43,26 +56,83 @@ def calculate_budget_breakdown(destination: str, duration: int, total_budget: fl
     # Adjust if user's budget is different from our calculation
     budget_adjustment = total_budget / total_base if total_base > 0 else 1.0
     
-    # Budget allocation percentages
-    allocation = {
-        "accommodation": 0.35,
-        "food_dining": 0.25,
-        "activities_entertainment": 0.20,
-        "transportation": 0.12,
-        "shopping_souvenirs": 0.05,
-        "emergency_misc": 0.03
-    }
-    
     # Calculate actual amounts
-    budget_breakdown = {}
-    for category, percentage in allocation.items():
-        budget_breakdown[category] = round(total_budget * percentage, 2)
+    amounts = tuple(round(total_budget * percentage, 2) for percentage in BUDGET_ALLOCATION.values())
     
     # Calculate per-day amounts
-    daily_breakdown = {
-        category: round(amount / duration, 2) 
-        for category, amount in budget_breakdown.items()
-    }
+    daily_amounts = tuple(round(amount / duration, 2) for amount in amounts)
+    
+    return BudgetBreakdown(
+        total_budget=total_budget,
+        trip_duration=duration,
+        traveler_count=traveler_count,
+        budget_breakdown=Amounts(BUDGET_CATEGORIES, amounts),
+        daily_breakdown=Amounts(BUDGET_CATEGORIES, daily_amounts),
+        budget_per_day=round(total_budget / duration, 2),
+        budget_per_person=round(total_budget / traveler_count, 2),
+        budget_level=_budget_level(base_daily)
+    )
+
+def _budget_level(base_daily: float) -> str:
+    return "Luxury" if base_daily > 200 else "Comfort" if base_daily > 120 else "Budget"
+
+def _round2(values: "np.ndarray") -> "np.ndarray":
+    """Round to 2 decimals with exactly the same results as the builtin round(x, 2)"""
+    import numpy as np
+    
+    shape = np.shape(values)
+    # At least 1-d: with 0-d input rint returns a numpy scalar, and the
+    # tie fix-up below would write into a temporary copy of it
+    values = np.array(values, dtype=np.float64, ndmin=1)
+    scaled = values * 100.0
+    rounded = np.rint(scaled) / 100.0
+    # rint agrees with round() unless the scaled value sits within float error of a
+    # .5 tie or is too large to be exact; those few elements go through round() itself
+    with np.errstate(invalid="ignore"):
+        suspect = ~(np.abs(scaled - np.floor(scaled) - 0.5) > 4 * np.spacing(scaled))
+        suspect |= ~(np.abs(scaled) < 2.0 ** 52)
+    if suspect.any():
+        for idx in np.flatnonzero(suspect):
+            rounded.flat[idx] = round(float(values.flat[idx]), 2)
+    return rounded.reshape(shape)
+
+def calculate_budget_breakdown_batch(destination: str, duration, total_budget, travel_style,
+                                     traveler_count=1) -> Dict[str, object]:
+    """Calculate budget breakdowns for many scenarios of one destination at once.
+
+    ``duration``, ``total_budget``, ``travel_style`` and ``traveler_count`` may be
+    scalars or array-likes and are broadcast against each other. The result has
+    the same keys as ``calculate_budget_breakdown`` but every value is a NumPy
+    array (one element per scenario), and the numbers match the scalar function
+    exactly.
+    """
+    import numpy as np
+    
+    duration, total_budget, travel_style, traveler_count = np.broadcast_arrays(
+        np.asarray(duration), np.asarray(total_budget),
+        np.asarray(travel_style, dtype=object), np.asarray(traveler_count)
+    )
+    if np.any(duration == 0):
+        raise ZeroDivisionError("duration must be non-zero")
+    if np.any(traveler_count == 0):
+        raise ZeroDivisionError("traveler_count must be non-zero")
+    
+    # Budget level only depends on the travel style, so classify each distinct style once
+    dest_data = get_catalog().costs(destination)
+    styles, style_idx = np.unique(travel_style.astype(str), return_inverse=True)
+    levels = np.array([
+        _budget_level(dest_data["base_daily"] * STYLE_MULTIPLIERS.get(style, 1.0) * dest_data["multiplier"])
+        for style in styles
+    ])
+    
+    budget = total_budget.astype(np.float64)
+    days = duration.astype(np.float64)
+    budget_breakdown = {}
+    daily_breakdown = {}
+    for category, percentage in BUDGET_ALLOCATION.items():
+        amount = _round2(budget * percentage)
+        budget_breakdown[category] = amount
+        daily_breakdown[category] = _round2(amount / days)
     
     return {
         "total_budget": total_budget,
@@ -70,14 +140,28 @@ def calculate_budget_breakdown(destination: str, duration: int, total_budget: fl
         "traveler_count": traveler_count,
         "budget_breakdown": budget_breakdown,
         "daily_breakdown": daily_breakdown,
-        "budget_per_day": round(total_budget / duration, 2),
-        "budget_per_person": round(total_budget / traveler_count, 2),
-        "budget_level": "Luxury" if base_daily > 200 else "Comfort" if base_daily > 120 else "Budget"
+        "budget_per_day": _round2(budget / days),
+        "budget_per_person": _round2(budget / traveler_count.astype(np.float64)),
+        "budget_level": levels[style_idx].reshape(budget.shape)
     }
 
-def generate_budget_chart(budget_breakdown: Dict[str, float]) -> str:
+def generate_budget_chart(budget_breakdown: Dict[str, float]) -> Dict[str, Any]:
     """Generate a pie chart visualization of the budget breakdown"""
     
+    # The pie only depends on each category's share, so proportional breakdowns share a render
+    key = make_cache_key("budget_chart", {
+        "shares": share_signature(budget_breakdown),
+        "order": list(budget_breakdown),
+        "dpi": 100
+    })
+    return get_or_render_artifact(key, lambda: _render_budget_chart(budget_breakdown), name="budget_chart")
+
+def _render_budget_chart(budget_breakdown: Dict[str, float]) -> bytes:
+    """Render the budget pie chart as PNG bytes"""
+    # Imported lazily so planning without charts never pays for matplotlib. The
+    # object-oriented Figure API (no pyplot state) is safe to use from worker threads.
+    from matplotlib.figure import Figure
+    
     # Prepare data for plotting
     categories = []
     amounts = []
@@ -89,10 +173,11 @@ def generate_budget_chart(budget_breakdown: Dict[str, float]) -> str:
         amounts.append(amount)
     
     # Create pie chart
-    plt.figure(figsize=(10, 8))
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
     colors = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99', '#ff99cc', '#c2c2f0']
     
-    wedges, texts, autotexts = plt.pie(
+    wedges, texts, autotexts = ax.pie(
         amounts, 
         labels=categories, 
         colors=colors,
@@ -101,7 +186,7 @@ def generate_budget_chart(budget_breakdown: Dict[str, float]) -> str:
     )
     
     # Style the chart
-    plt.title('Trip Budget Breakdown', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title('Trip Budget Breakdown', fontsize=16, fontweight='bold', pad=20)
     
     # Improve text styling
     for autotext in autotexts:
@@ -109,13 +194,10 @@ def generate_budget_chart(budget_breakdown: Dict[str, float]) -> str:
         autotext.set_fontweight('bold')
     
     # Equal aspect ratio ensures pie is drawn as circle
-    plt.axis('equal')
+    ax.axis('equal')
     
-    # Convert plot to base64 for display
+    # Convert plot to PNG bytes for the artifact store
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight', dpi=100)
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode()
-    plt.close()
+    fig.savefig(buf, format='png', bbox_inches='tight', dpi=100)
     
-    return f"data:image/png;base64,{img_str}"
\ No newline at end of file
+    return buf.getvalue()
\ No newline at end of file
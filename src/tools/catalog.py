@@ -0,0 +1,386 @@
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Optional, Tuple
+import os
+import threading
+
+from .interest_index import InterestIndex
+
+# Destination knowledge shared by every tool, one entry per destination id
+DESTINATION_DATA = {
+    # Pakistan Cities
+    "islamabad": {
+        "attractions": ["Faisal Mosque", "Daman-e-Koh", "Pakistan Monument", "Lok Virsa Museum", "Margalla Hills", "Rawal Lake"],
+        "activities": ["Hiking in Margalla Hills", "Mosque visits", "Museum tours", "Boating", "Cultural shows"],
+        "best_season": "Spring (March-May) and Autumn (September-November)",
+        "cost_level": "Medium",
+        "description": "Capital city with beautiful mountains and modern architecture",
+        "costs": {"base_daily": 60, "multiplier": 1.1},
+        "climate": "four_season",
+        "seasons": {
+            "spring": {
+                "temperature": "15-25°C",
+                "conditions": "Pleasant with blooming flowers",
+                "recommendations": ["Light jacket", "Comfortable shoes", "Sunglasses"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "12-14 hours"
+            },
+            "summer": {
+                "temperature": "25-35°C",
+                "conditions": "Warm with occasional rain",
+                "recommendations": ["Light clothing", "Umbrella", "Sunscreen"],
+                "avg_rainfall": "Moderate",
+                "sunlight_hours": "14-15 hours"
+            },
+            "autumn": {
+                "temperature": "18-28°C",
+                "conditions": "Mild and pleasant",
+                "recommendations": ["Light layers", "Walking shoes", "Camera"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "11-13 hours"
+            },
+            "winter": {
+                "temperature": "5-18°C",
+                "conditions": "Cool and crisp",
+                "recommendations": ["Warm jacket", "Sweaters", "Comfortable boots"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "10-11 hours"
+            }
+        }
+    },
+    "karachi": {
+        "attractions": ["Clifton Beach", "Mazar-e-Quaid", "Frere Hall", "Port Grand", "Mohatta Palace", "Churna Island"],
+        "activities": ["Beach activities", "Historical site visits", "Seafood dining", "Shopping", "Island trips"],
+        "best_season": "Winter (November-February)",
+        "cost_level": "Medium",
+        "description": "Vibrant coastal metropolis and economic hub",
+        "costs": {"base_daily": 50, "multiplier": 1.0},
+        "climate": "two_season",
+        "seasons": {
+            "summer": {
+                "temperature": "28-35°C",
+                "conditions": "Hot and humid",
+                "recommendations": ["Light cotton clothing", "Sunscreen", "Water bottle", "Hat"],
+                "avg_rainfall": "Very Low",
+                "sunlight_hours": "13-14 hours"
+            },
+            "winter": {
+                "temperature": "15-25°C",
+                "conditions": "Mild and pleasant",
+                "recommendations": ["Light jacket", "Comfortable clothing", "Sunglasses"],
+                "avg_rainfall": "Very Low",
+                "sunlight_hours": "10-12 hours"
+            }
+        }
+    },
+    "lahore": {
+        "attractions": ["Lahore Fort", "Badshahi Mosque", "Shalimar Gardens", "Lahore Museum", "Wagah Border", "Anarkali Bazaar"],
+        "activities": ["Historical tours", "Food street visits", "Shopping in bazaars", "Cultural shows", "Border ceremony"],
+        "best_season": "Winter (October-March)",
+        "cost_level": "Low",
+        "description": "Cultural heart of Pakistan with Mughal heritage",
+        "costs": {"base_daily": 45, "multiplier": 0.9},
+        "climate": "two_season",
+        "seasons": {
+            "summer": {
+                "temperature": "25-40°C",
+                "conditions": "Hot and dry",
+                "recommendations": ["Light breathable fabric", "Hat", "Sunscreen", "Water"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "14-15 hours"
+            },
+            "winter": {
+                "temperature": "5-20°C",
+                "conditions": "Cool with fog",
+                "recommendations": ["Warm layers", "Jacket", "Scarf", "Comfortable shoes"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "9-11 hours"
+            }
+        }
+    },
+    "hunza": {
+        "attractions": ["Baltit Fort", "Attabad Lake", "Passu Cones", "Rakaposhi View", "Eagle's Nest", "Khunjerab Pass"],
+        "activities": ["Mountain trekking", "Lake visits", "Fort exploration", "Photography", "Cultural immersion"],
+        "best_season": "Summer (May-September)",
+        "cost_level": "Low",
+        "description": "Breathtaking mountain valley in the Karakoram range",
+        "costs": {"base_daily": 40, "multiplier": 0.8},
+        "climate": "two_season",
+        "seasons": {
+            "summer": {
+                "temperature": "10-25°C",
+                "conditions": "Pleasant with clear skies",
+                "recommendations": ["Layered clothing", "Warm jacket", "Sunglasses", "Hiking boots"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "14-16 hours"
+            },
+            "winter": {
+                "temperature": "-10 to 10°C",
+                "conditions": "Cold with snow",
+                "recommendations": ["Heavy winter coat", "Thermal wear", "Gloves", "Warm boots"],
+                "avg_rainfall": "Moderate snow",
+                "sunlight_hours": "9-10 hours"
+            }
+        }
+    },
+    "swat": {
+        "attractions": ["Malam Jabba", "Mahodand Lake", "White Palace", "Ushu Forest", "Butkara Stupa", "Swat Museum"],
+        "activities": ["Skiing", "Hiking", "Lake visits", "Historical exploration", "Photography"],
+        "best_season": "Summer (April-September)",
+        "cost_level": "Low",
+        "description": "Switzerland of Pakistan with stunning valleys",
+        "costs": {"base_daily": 35, "multiplier": 0.7},
+        "climate": "two_season",
+        "seasons": {
+            "summer": {
+                "temperature": "15-30°C",
+                "conditions": "Pleasant with cool breezes",
+                "recommendations": ["Light layers", "Comfortable shoes", "Light jacket", "Camera"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "13-15 hours"
+            },
+            "winter": {
+                "temperature": "-5 to 15°C",
+                "conditions": "Cold with snow in mountains",
+                "recommendations": ["Warm clothing", "Winter jacket", "Boots", "Gloves"],
+                "avg_rainfall": "Moderate snow",
+                "sunlight_hours": "9-11 hours"
+            }
+        }
+    },
+
+    # Original destinations
+    "paris": {
+        "attractions": ["Eiffel Tower", "Louvre Museum", "Notre-Dame", "Montmartre", "Seine River Cruise"],
+        "activities": ["Museum tours", "River cruise", "Food tasting", "Shopping", "Photography"],
+        "best_season": "Spring (March-May)",
+        "cost_level": "Medium",
+        "description": "City of Lights with rich history and culture",
+        "costs": {"base_daily": 150, "multiplier": 1.3},
+        "map_position": {"x": 50, "y": 50, "color": "#FF6B6B"},
+        "climate": "four_season",
+        "seasons": {
+            "spring": {
+                "temperature": "10-18°C",
+                "conditions": "Mild with occasional rain",
+                "recommendations": ["Light jacket", "Umbrella", "Layered clothing"],
+                "avg_rainfall": "Moderate",
+                "sunlight_hours": "12-14 hours"
+            },
+            "summer": {
+                "temperature": "18-25°C",
+                "conditions": "Warm and pleasant",
+                "recommendations": ["Light clothing", "Sunglasses", "Sun protection"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "14-16 hours"
+            },
+            "autumn": {
+                "temperature": "8-15°C",
+                "conditions": "Cool and crisp",
+                "recommendations": ["Sweaters", "Waterproof jacket", "Comfortable shoes"],
+                "avg_rainfall": "Moderate",
+                "sunlight_hours": "10-12 hours"
+            },
+            "winter": {
+                "temperature": "2-8°C",
+                "conditions": "Cold with possible snow",
+                "recommendations": ["Warm coat", "Scarf", "Gloves", "Boots"],
+                "avg_rainfall": "Low to Moderate",
+                "sunlight_hours": "8-9 hours"
+            }
+        }
+    },
+    "tokyo": {
+        "attractions": ["Sensoji Temple", "Tokyo Skytree", "Shibuya Crossing", "Meiji Shrine", "Akihabara"],
+        "activities": ["Temple visits", "Sushi making", "Anime shopping", "Gardens", "Karaoke"],
+        "best_season": "Autumn (September-November)",
+        "cost_level": "High",
+        "description": "Blend of traditional and ultra-modern experiences",
+        "costs": {"base_daily": 180, "multiplier": 1.5},
+        "map_position": {"x": 80, "y": 30, "color": "#4ECDC4"},
+        "climate": "four_season",
+        "seasons": {
+            "spring": {
+                "temperature": "12-20°C",
+                "conditions": "Mild with cherry blossoms",
+                "recommendations": ["Light layers", "Comfortable walking shoes", "Camera"],
+                "avg_rainfall": "Moderate",
+                "sunlight_hours": "12-14 hours"
+            },
+            "summer": {
+                "temperature": "22-30°C",
+                "conditions": "Hot and humid",
+                "recommendations": ["Light breathable clothing", "Hat", "Water bottle", "Sunscreen"],
+                "avg_rainfall": "High",
+                "sunlight_hours": "13-15 hours"
+            },
+            "autumn": {
+                "temperature": "15-22°C",
+                "conditions": "Cool and comfortable",
+                "recommendations": ["Light jacket", "Layered clothing", "Walking shoes"],
+                "avg_rainfall": "Moderate",
+                "sunlight_hours": "11-13 hours"
+            },
+            "winter": {
+                "temperature": "2-10°C",
+                "conditions": "Cold and dry",
+                "recommendations": ["Warm coat", "Thermal layers", "Scarf", "Gloves"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "9-10 hours"
+            }
+        }
+    },
+    "bali": {
+        "attractions": ["Uluwatu Temple", "Tegallalang Rice Terrace", "Ubud Monkey Forest", "Waterfalls", "Beaches"],
+        "activities": ["Beach relaxation", "Temple tours", "Yoga classes", "Water sports", "Spa treatments"],
+        "best_season": "Dry season (April-October)",
+        "cost_level": "Low",
+        "description": "Tropical paradise with rich culture and nature",
+        "costs": {"base_daily": 80, "multiplier": 0.8},
+        "map_position": {"x": 60, "y": 70, "color": "#45B7D1"},
+        "climate": "tropical",
+        "seasons": {
+            "dry_season": {
+                "temperature": "26-32°C",
+                "conditions": "Warm and sunny",
+                "recommendations": ["Light clothing", "Swimwear", "Sunscreen", "Hat"],
+                "avg_rainfall": "Low",
+                "sunlight_hours": "12 hours",
+                "season_note": "Dry Season (April-September)"
+            },
+            "wet_season": {
+                "temperature": "24-30°C",
+                "conditions": "Warm with heavy rainfall",
+                "recommendations": ["Light rain jacket", "Quick-dry clothing", "Waterproof bag"],
+                "avg_rainfall": "High",
+                "sunlight_hours": "10-11 hours",
+                "season_note": "Wet Season (October-March)"
+            }
+        }
+    }
+}
+
+# Fallbacks for destinations that are not in the catalog
+DEFAULT_PROFILE = {
+    "attractions": ["City Center", "Local Markets", "Historical Sites", "Main Square"],
+    "activities": ["Sightseeing", "Local cuisine", "Cultural experiences", "Shopping"],
+    "best_season": "All year",
+    "cost_level": "Medium",
+    "description": "Popular travel destination with diverse experiences",
+    "recommended_activities": ["Sightseeing", "Local cuisine"]
+}
+DEFAULT_COSTS = {"base_daily": 120, "multiplier": 1.0}
+DEFAULT_MAP_POSITION = {"x": 50, "y": 50, "color": "#96CEB4"}
+
+
+def normalize_destination(destination: str) -> str:
+    """Normalize a user supplied destination name into a catalog id"""
+    return " ".join(str(destination).lower().split())
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into read-only equivalents"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class DestinationCatalog:
+    """Immutable destination catalog shared by all tools.
+
+    Every accessor returns read-only views (``MappingProxyType`` and tuples),
+    so callers that need to modify data must copy it first.
+    """
+
+    def __init__(self, data: Mapping[str, Mapping[str, Any]]):
+        self._entries = MappingProxyType({
+            normalize_destination(destination_id): _freeze(entry)
+            for destination_id, entry in data.items()
+        })
+        self._init_shared()
+
+    def _init_shared(self):
+        # State shared by every catalog backend (see datapack.DataPackCatalog)
+        self.default_profile = _freeze(DEFAULT_PROFILE)
+        self.default_costs = _freeze(DEFAULT_COSTS)
+        self.default_map_position = _freeze(DEFAULT_MAP_POSITION)
+        self._interest_indexes = {}
+        self._index_lock = threading.Lock()
+
+    def __contains__(self, destination: str) -> bool:
+        return normalize_destination(destination) in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ids(self) -> Tuple[str, ...]:
+        """Return all destination ids in catalog order"""
+        return tuple(self._entries)
+
+    def get(self, destination: str) -> Optional[Mapping[str, Any]]:
+        """Return the read-only entry for a destination, or None if unknown"""
+        return self._entries.get(normalize_destination(destination))
+
+    def costs(self, destination: str) -> Mapping[str, float]:
+        """Return cost data for a destination, falling back to the default"""
+        entry = self.get(destination)
+        return entry["costs"] if entry is not None else self.default_costs
+
+    def map_position(self, destination: str) -> Mapping[str, Any]:
+        """Return the itinerary map position for a destination"""
+        entry = self.get(destination)
+        if entry is not None and "map_position" in entry:
+            return entry["map_position"]
+        return self.default_map_position
+
+    def interest_index(self, destination: str) -> Optional[InterestIndex]:
+        """Return the interest index for a destination, building it on first use"""
+        destination_id = normalize_destination(destination)
+        index = self._interest_indexes.get(destination_id)
+        if index is None:
+            entry = self.get(destination_id)
+            if entry is None:
+                return None
+            with self._index_lock:
+                index = self._interest_indexes.get(destination_id)
+                if index is None:
+                    index = InterestIndex(entry["activities"], entry["attractions"])
+                    self._interest_indexes[destination_id] = index
+        return index
+
+
+_catalog: Optional[DestinationCatalog] = None
+_catalog_lock = threading.Lock()
+
+# Environment variable naming a compiled data pack to use instead of DESTINATION_DATA
+DATA_PACK_ENV = "TRAVEL_DATA_PACK"
+
+
+def get_catalog() -> DestinationCatalog:
+    """Return the process-wide destination catalog, building it on first use.
+
+    Uses the data pack named by $TRAVEL_DATA_PACK when set (see datapack),
+    else the built-in DESTINATION_DATA.
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                pack_path = os.environ.get(DATA_PACK_ENV)
+                if pack_path:
+                    from .datapack import DataPackCatalog
+                    _catalog = DataPackCatalog(pack_path)
+                else:
+                    _catalog = DestinationCatalog(DESTINATION_DATA)
+    return _catalog
+
+
+def set_catalog(catalog: DestinationCatalog) -> DestinationCatalog:
+    """Install a different catalog for this process, e.g. a DataPackCatalog"""
+    global _catalog
+    _catalog = catalog
+    return catalog
@@ -0,0 +1,337 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from .catalog import DESTINATION_DATA, DestinationCatalog, _freeze, normalize_destination
+from .interest_index import InterestIndex
+
+logger = logging.getLogger(__name__)
+
+# Bump when the pack schema changes; older packs are rejected instead of misread
+PACK_FORMAT_VERSION = 1
+
+REQUIRED_FIELDS = ("attractions", "activities", "best_season", "cost_level", "description", "costs",
+                   "climate", "seasons")
+
+# Separator for list columns (attractions, activities, recommendations) in CSV sources
+LIST_SEPARATOR = "|"
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(LIST_SEPARATOR) if item.strip()]
+
+
+def _number(value: str) -> float:
+    # Keep integral amounts as ints, like the built-in catalog, so reports render the same
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _entry_from_csv(row: Dict[str, str]) -> Dict[str, Any]:
+    entry = {
+        "attractions": _split(row.get("attractions")),
+        "activities": _split(row.get("activities")),
+        "best_season": row.get("best_season", ""),
+        "cost_level": row.get("cost_level", ""),
+        "description": row.get("description", ""),
+        "costs": {"base_daily": _number(row["base_daily"]), "multiplier": _number(row.get("multiplier") or 1)},
+        "climate": row.get("climate", ""),
+        "seasons": {},
+    }
+    if row.get("map_color"):
+        entry["map_position"] = {"x": _number(row["map_x"]), "y": _number(row["map_y"]), "color": row["map_color"]}
+    return entry
+
+
+def _season_from_csv(row: Dict[str, str]) -> Dict[str, Any]:
+    season = {
+        "temperature": row["temperature"],
+        "conditions": row["conditions"],
+        "recommendations": _split(row.get("recommendations")),
+        "avg_rainfall": row["avg_rainfall"],
+        "sunlight_hours": row["sunlight_hours"],
+    }
+    if row.get("season_note"):
+        season["season_note"] = row["season_note"]
+    return season
+
+
+def _validate(destination_id: str, entry: Mapping[str, Any]):
+    from .weather_checker import CLIMATE_REGIMES
+
+    missing = [field for field in REQUIRED_FIELDS if field not in entry]
+    if missing:
+        raise ValueError(f"{destination_id}: missing fields {', '.join(missing)}")
+    if entry["climate"] not in CLIMATE_REGIMES:
+        raise ValueError(f"{destination_id}: unknown climate {entry['climate']!r}")
+    if "base_daily" not in entry["costs"]:
+        raise ValueError(f"{destination_id}: costs need a base_daily amount")
+
+
+def load_sources(paths: Iterable[str], base: Mapping[str, Mapping[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """Merge JSON and CSV sources into catalog entries keyed by destination id.
+
+    - JSON: ``{id: entry}`` (or ``{"destinations": {id: entry}}``) in the
+      DESTINATION_DATA format
+    - CSV with a ``season`` column: one row per (id, season)
+    - any other CSV: one row per destination (list columns separated by "|")
+
+    Later sources replace earlier entries with the same id; season rows are
+    applied last, onto entries from any source (or ``base``).
+    """
+    entries = {normalize_destination(key): json.loads(json.dumps(entry)) for key, entry in (base or {}).items()}
+    season_rows = []
+    for path in paths:
+        if path.endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for destination_id, entry in data.get("destinations", data).items():
+                entries[normalize_destination(destination_id)] = dict(entry)
+        elif path.endswith(".csv"):
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                reader = csv.DictReader(f)
+                if "season" in (reader.fieldnames or ()):
+                    season_rows.extend(reader)
+                else:
+                    for row in reader:
+                        entries[normalize_destination(row["id"])] = _entry_from_csv(row)
+        else:
+            raise ValueError(f"Unsupported data source (expected .json or .csv): {path}")
+
+    for row in season_rows:
+        destination_id = normalize_destination(row["id"])
+        if destination_id not in entries:
+            raise ValueError(f"Season row for unknown destination: {row['id']}")
+        entries[destination_id].setdefault("seasons", {})[row["season"]] = _season_from_csv(row)
+
+    for destination_id, entry in entries.items():
+        _validate(destination_id, entry)
+    return entries
+
+
+def build_data_pack(sources: Iterable[str], output: str, include_builtin: bool = False) -> Dict[str, Any]:
+    """Compile sources into a SQLite data pack at ``output``.
+
+    The pack is written next to ``output`` and moved into place atomically,
+    so running catalogs pick it up on their next reload check and never see
+    a partial file.
+    """
+    start = time.perf_counter()
+    entries = load_sources(sources, DESTINATION_DATA if include_builtin else None)
+    tmp_path = "%s.%d.tmp" % (output, os.getpid())
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("CREATE TABLE destinations (id TEXT PRIMARY KEY, entry TEXT NOT NULL) WITHOUT ROWID")
+            conn.executemany("INSERT INTO destinations (id, entry) VALUES (?, ?)", (
+                (destination_id, json.dumps(entry, separators=(",", ":"), ensure_ascii=False))
+                for destination_id, entry in sorted(entries.items())
+            ))
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+                ("format_version", str(PACK_FORMAT_VERSION)),
+                ("built_at", str(time.time())),
+                ("destinations", str(len(entries))),
+            ])
+            conn.commit()
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        os.replace(tmp_path, output)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return {"destinations": len(entries), "bytes": os.path.getsize(output),
+            "seconds": time.perf_counter() - start}
+
+
+class DataPackCatalog(DestinationCatalog):
+    """Destination catalog backed by a compiled SQLite data pack.
+
+    Entries are queried on demand and kept in a bounded LRU of decoded,
+    read-only entries (interest indexes in a second LRU of the same size), so
+    RSS does not grow with the size of the pack. The
+    pack is opened read-only and memory-mapped: worker processes share its
+    pages through the OS page cache. When a new pack is moved into place
+    (see build_data_pack) it is picked up within ``reload_interval`` seconds.
+    """
+
+    def __init__(self, path: str, max_cached_entries: int = 4096, reload_interval: float = 1.0,
+                 mmap_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_cached_entries = max_cached_entries
+        self.reload_interval = reload_interval
+        self.mmap_bytes = mmap_bytes
+        self._init_shared()
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Mapping[str, Any]]" = OrderedDict()
+        self._interest_indexes: "OrderedDict[str, InterestIndex]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._ids: Optional[Tuple[str, ...]] = None
+        self._last_check = time.monotonic()
+        self.reloads = 0
+        with self._lock:
+            # Fail fast on a missing or incompatible pack
+            self._open()
+
+    @staticmethod
+    def _file_signature(path: str) -> Tuple[int, int, int]:
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _open(self):
+        signature = self._file_signature(self.path)
+        # immutable=1: the file never changes in place (new packs replace it),
+        # so SQLite can skip locking and read it straight from the page cache
+        uri = "file:%s?mode=ro&immutable=1" % quote(os.path.abspath(self.path))
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA mmap_size = %d" % int(self.mmap_bytes))
+            row = conn.execute("SELECT value FROM meta WHERE key = 'format_version'").fetchone()
+            if row is None or int(row[0]) != PACK_FORMAT_VERSION:
+                raise ValueError(f"unsupported data pack format {row[0] if row else None!r}")
+        except Exception:
+            conn.close()
+            raise
+        old, self._conn = self._conn, conn
+        self._signature = signature
+        self._cache.clear()
+        self._ids = None
+        with self._index_lock:
+            self._interest_indexes.clear()
+        if old is not None:
+            old.close()
+
+    def _maybe_reload(self):
+        # Called with the lock held; stat() at most once per reload_interval
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        self._last_check = now
+        try:
+            signature = self._file_signature(self.path)
+        except OSError:
+            return  # keep serving the current pack while the file is being swapped
+        if signature != self._signature:
+            try:
+                self._open()
+                self.reloads += 1
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning("⚠️ Keeping the current data pack, cannot load %s: %s", self.path, e)
+                self._signature = signature
+
+    def reload(self):
+        """Check for a new pack now instead of waiting for reload_interval"""
+        with self._lock:
+            self._last_check = 0.0
+            self._maybe_reload()
+
+    def get(self, destination: str) -> Optional[Mapping[str, Any]]:
+        """Return the read-only entry for a destination, or None if unknown"""
+        destination_id = normalize_destination(destination)
+        with self._lock:
+            self._maybe_reload()
+            entry = self._cache.get(destination_id)
+            if entry is not None:
+                self._cache.move_to_end(destination_id)
+                return entry
+            row = self._conn.execute("SELECT entry FROM destinations WHERE id = ?", (destination_id,)).fetchone()
+            if row is None:
+                return None
+            entry = self._cache[destination_id] = _freeze(json.loads(row[0]))
+            while len(self._cache) > self.max_cached_entries:
+                self._cache.popitem(last=False)
+        return entry
+
+    def interest_index(self, destination: str) -> Optional[InterestIndex]:
+        """Return the interest index for a destination, building it on first use"""
+        destination_id = normalize_destination(destination)
+        with self._index_lock:
+            index = self._interest_indexes.get(destination_id)
+            if index is not None:
+                self._interest_indexes.move_to_end(destination_id)
+                return index
+        entry = self.get(destination_id)
+        if entry is None:
+            return None
+        with self._index_lock:
+            index = self._interest_indexes.get(destination_id)
+            if index is None:
+                index = self._interest_indexes[destination_id] = InterestIndex(entry["activities"],
+                                                                               entry["attractions"])
+                while len(self._interest_indexes) > self.max_cached_entries:
+                    self._interest_indexes.popitem(last=False)
+        return index
+
+    def __contains__(self, destination: str) -> bool:
+        return self.get(destination) is not None
+
+    def ids(self) -> Tuple[str, ...]:
+        """Return all destination ids in pack (sorted) order"""
+        with self._lock:
+            self._maybe_reload()
+            if self._ids is None:
+                self._ids = tuple(row[0] for row in self._conn.execute("SELECT id FROM destinations ORDER BY id"))
+            return self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids())
+
+    def __len__(self) -> int:
+        return len(self.ids())
+
+    def metadata(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.tools.datapack",
+                                     description="Build or inspect destination data packs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="compile JSON/CSV sources into a data pack")
+    build.add_argument("sources", nargs="*", help=".json or .csv source files")
+    build.add_argument("-o", "--output", required=True, help="data pack path")
+    build.add_argument("--builtin", action="store_true", help="start from the built-in destinations")
+    info = commands.add_parser("info", help="show a data pack's metadata")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if not args.sources and not args.builtin:
+            parser.error("nothing to build: give source files and/or --builtin")
+        try:
+            stats = build_data_pack(args.sources, args.output, include_builtin=args.builtin)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Data pack build failed: {e}")
+            return 1
+        print(f"✅ Built {args.output}: {stats['destinations']} destinations, "
+              f"{stats['bytes'] / 1024:.0f} KiB in {stats['seconds'] * 1000:.0f} ms")
+        return 0
+
+    catalog = DataPackCatalog(args.path)
+    for key, value in sorted(catalog.metadata().items()):
+        print(f"{key}: {value}")
+    catalog.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .catalog import normalize_destination
+from .paths import cache_path
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "data", "gazetteer.json")
+
+Coordinates = Tuple[float, float]
+
+# Sentinel: an online lookup failed (as opposed to finding nothing)
+_FAILED = object()
+
+
+class Gazetteer:
+    """Bundled, read-only place coordinates: destination centers and attractions.
+
+    The JSON file is loaded on first lookup. Attraction names are matched
+    case- and whitespace-insensitively, within a destination or across all
+    destinations when none is given.
+    """
+
+    def __init__(self, path: str = GAZETTEER_PATH):
+        self.path = path
+        self._centers: Optional[Dict[str, Coordinates]] = None
+        self._places: Dict[Tuple[str, str], Coordinates] = {}
+        self._any_destination: Dict[str, Coordinates] = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._centers is not None:
+            return
+        with self._lock:
+            if self._centers is not None:
+                return
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            centers = {}
+            for destination, entry in data["destinations"].items():
+                destination_id = normalize_destination(destination)
+                centers[destination_id] = tuple(entry["center"])
+                for name, coordinates in entry.get("attractions", {}).items():
+                    place = normalize_destination(name)
+                    self._places[(destination_id, place)] = tuple(coordinates)
+                    self._any_destination.setdefault(place, tuple(coordinates))
+            self._centers = centers
+
+    def center(self, destination: str) -> Optional[Coordinates]:
+        self._load()
+        return self._centers.get(normalize_destination(destination))
+
+    def lookup(self, name: str, destination: Optional[str] = None) -> Optional[Coordinates]:
+        self._load()
+        place = normalize_destination(name)
+        if destination is not None:
+            return self._places.get((normalize_destination(destination), place))
+        return self._any_destination.get(place)
+
+
+class GeocodeCache:
+    """SQLite-backed persistent cache of geocoding results.
+
+    Misses are stored too (as NULL coordinates), so a place that could not be
+    geocoded is not looked up again. The database defaults to
+    geocode_cache.sqlite3 in the user cache directory (see paths); use
+    ``path=":memory:"`` for a process-local cache.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        path = cache_path("geocode_cache.sqlite3", path)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode_cache ("
+            " key TEXT PRIMARY KEY, lat REAL, lon REAL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Coordinates]]:
+        """Return the cached result for every known key (None for cached misses)"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT key, lat, lon FROM geocode_cache WHERE key IN (%s)" % ",".join("?" * len(chunk)),
+                    chunk
+                ).fetchall()
+                for key, lat, lon in rows:
+                    found[key] = None if lat is None else (lat, lon)
+        return found
+
+    def put_many(self, results: Dict[str, Optional[Coordinates]]):
+        now = time.time()
+        rows = [(key, *(coordinates or (None, None)), now) for key, coordinates in results.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO geocode_cache (key, lat, lon, created_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Geocoder:
+    """Resolves attraction names to (lat, lon) without per-attraction network calls.
+
+    Lookups go to the bundled gazetteer first, then to the persistent cache
+    (one query per batch). Only with ``online=True`` are the remaining names
+    geocoded through geopy's Nominatim client (rate limited), and every
+    result, including misses, is written back to the cache.
+    """
+
+    def __init__(self, gazetteer: Optional[Gazetteer] = None, cache: Optional[GeocodeCache] = None,
+                 online: bool = False, user_agent: str = "travel-itinerary-agent"):
+        self.gazetteer = gazetteer or Gazetteer()
+        self.cache = cache
+        self.online = online
+        self.user_agent = user_agent
+        self._geocode = None
+        # Tools resolve coordinates from worker threads; counters are updated under the lock
+        self._lock = threading.Lock()
+        self._stats = {"gazetteer": 0, "cache": 0, "online": 0, "unresolved": 0}
+
+    @staticmethod
+    def cache_key(name: str, destination: Optional[str]) -> str:
+        return f"{normalize_destination(destination or '')}|{normalize_destination(name)}"
+
+    def center(self, destination: str) -> Optional[Coordinates]:
+        """Return the coordinates of a destination itself"""
+        center = self.gazetteer.center(destination)
+        if center is None:
+            center = self.lookup_many([destination]).get(destination)
+        return center
+
+    def lookup(self, name: str, destination: Optional[str] = None) -> Optional[Coordinates]:
+        return self.lookup_many([name], destination).get(name)
+
+    def lookup_many(self, names: Iterable[str], destination: Optional[str] = None) -> Dict[str, Optional[Coordinates]]:
+        """Resolve a batch of names; unresolved names map to None"""
+        results: Dict[str, Optional[Coordinates]] = {}
+        counts = {"gazetteer": 0, "cache": 0, "online": 0}
+        missing: List[str] = []
+        for name in dict.fromkeys(names):
+            coordinates = self.gazetteer.lookup(name, destination)
+            if coordinates is None:
+                missing.append(name)
+            else:
+                results[name] = coordinates
+                counts["gazetteer"] += 1
+
+        if missing and self.cache is not None:
+            cached = self.cache.get_many(self.cache_key(name, destination) for name in missing)
+            still_missing = []
+            for name in missing:
+                key = self.cache_key(name, destination)
+                if key in cached:
+                    results[name] = cached[key]
+                    counts["cache"] += 1
+                else:
+                    still_missing.append(name)
+            missing = still_missing
+
+        if missing and self.online:
+            fetched = {name: self._geocode_online(name, destination) for name in missing}
+            # Failed requests are not cached, so they are retried next time
+            fetched = {name: coordinates for name, coordinates in fetched.items() if coordinates is not _FAILED}
+            counts["online"] = len(fetched)
+            results.update(fetched)
+            if self.cache is not None:
+                self.cache.put_many({self.cache_key(name, destination): coordinates
+                                     for name, coordinates in fetched.items()})
+            missing = [name for name in missing if name not in fetched]
+
+        for name in missing:
+            results[name] = None
+        counts["unresolved"] = sum(1 for name in results if results[name] is None)
+        with self._lock:
+            for source, count in counts.items():
+                self._stats[source] += count
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many names each source resolved (and how many stayed unresolved)"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _geocode_online(self, name: str, destination: Optional[str]) -> Optional[Coordinates]:
+        if self._geocode is None:
+            # Imported lazily: offline runs never need geopy
+            from geopy.extra.rate_limiter import RateLimiter
+            from geopy.geocoders import Nominatim
+            self._geocode = RateLimiter(Nominatim(user_agent=self.user_agent).geocode, min_delay_seconds=1)
+        query = f"{name}, {destination}" if destination else name
+        try:
+            location = self._geocode(query)
+        except Exception as e:
+            logger.warning("⚠️ Geocoding failed for %s: %s", query, e)
+            return _FAILED
+        return None if location is None else (location.latitude, location.longitude)
+
+
+_geocoder: Optional[Geocoder] = None
+_geocoder_lock = threading.Lock()
+
+
+def get_geocoder() -> Geocoder:
+    """Return the process-wide geocoder (gazetteer only, no cache or network by default)"""
+    global _geocoder
+    if _geocoder is None:
+        with _geocoder_lock:
+            if _geocoder is None:
+                _geocoder = Geocoder()
+    return _geocoder
+
+
+def set_geocoder(geocoder: Geocoder) -> Geocoder:
+    """Install a different geocoder, e.g. with a persistent cache or online lookups enabled"""
+    global _geocoder
+    _geocoder = geocoder
+    return geocoder
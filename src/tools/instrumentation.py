@@ -0,0 +1,336 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
+import itertools
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Prometheus histogram buckets for span durations, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("travel_current_span", default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """A timed operation: a graph node, tool call, LLM call or chart render.
+
+    Spans nest through a context variable, so a span started inside another
+    (in the same thread or task, or in a copied context) records it as its
+    parent. Finished spans are handed to every registered exporter.
+    """
+
+    __slots__ = ("name", "kind", "attributes", "span_id", "parent_id", "trace_id", "start_time",
+                 "duration", "error", "_start", "_token")
+
+    def __init__(self, name: str, kind: str, attributes: Dict[str, Any]):
+        parent = _current_span.get()
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.span_id = "%x" % next(_span_ids)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else self.span_id
+        self.start_time = 0.0
+        self.duration = 0.0
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException):
+        """Mark the span failed, e.g. when the error is caught inside it"""
+        self.error = f"{type(error).__name__}: {error}"
+
+    def __enter__(self) -> "Span":
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration = time.perf_counter() - self._start
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.set_error(exc)
+        _export(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "trace_id": self.trace_id,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration * 1000, 3),
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Shared stand-in returned while no exporter is registered"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_error(self, error: BaseException):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(ABC):
+    """Base class for span exporters; ``export`` is called once per finished span.
+
+    ``count`` receives counter increments (see ``increment``); exporters
+    that only handle spans can leave it as is.
+    """
+
+    @abstractmethod
+    def export(self, span: Span):
+        ...
+
+    def count(self, name: str, value: int, labels: Dict[str, str]):
+        pass
+
+
+_exporters: Tuple[SpanExporter, ...] = ()
+_exporters_lock = threading.Lock()
+
+
+def span(name: str, kind: str = "internal", **attributes) -> Union[Span, _NoopSpan]:
+    """Start a span, for use as a context manager.
+
+    With no exporter registered this returns a shared no-op span, so
+    instrumented code costs one call and a check when tracing is off.
+    """
+    if not _exporters:
+        return NOOP_SPAN
+    return Span(name, kind, attributes)
+
+
+def increment(name: str, value: int = 1, **labels):
+    """Add ``value`` to the counter ``name`` on every registered exporter.
+
+    Counters track events that are not operations of their own, e.g.
+    speculative tool call hits; like spans they cost one check when
+    tracing is off.
+    """
+    if not _exporters or not value:
+        return
+    for exporter in _exporters:
+        try:
+            exporter.count(name, value, labels)
+        except Exception as e:
+            logger.warning("⚠️ Span exporter %s failed: %s", type(exporter).__name__, e)
+
+
+def current_span() -> Union[Span, _NoopSpan]:
+    """Return the innermost active span, or the no-op span"""
+    return _current_span.get() or NOOP_SPAN
+
+
+def add_exporter(exporter: SpanExporter) -> SpanExporter:
+    """Register an exporter; spans are recorded while at least one is registered"""
+    global _exporters
+    with _exporters_lock:
+        _exporters = _exporters + (exporter,)
+    return exporter
+
+
+def remove_exporter(exporter: SpanExporter):
+    global _exporters
+    with _exporters_lock:
+        _exporters = tuple(registered for registered in _exporters if registered is not exporter)
+
+
+def _export(finished: Span):
+    for exporter in _exporters:
+        try:
+            exporter.export(finished)
+        except Exception as e:
+            # Broken telemetry must never fail a plan
+            logger.warning("⚠️ Span exporter %s failed: %s", type(exporter).__name__, e)
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps the most recent finished spans in memory, e.g. for tests and notebooks"""
+
+    def __init__(self, max_spans: int = 10000):
+        self._spans: "deque[Span]" = deque(maxlen=max_spans)
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def count(self, name: str, value: int, labels: Dict[str, str]):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def counters(self) -> Dict[str, int]:
+        """Return counter totals by name, summed over labels"""
+        with self._lock:
+            return dict(self._counters)
+
+    def spans(self, kind: Optional[str] = None, name: Optional[str] = None) -> List[Span]:
+        """Return finished spans in completion order, optionally filtered"""
+        with self._lock:
+            return [span for span in self._spans
+                    if (kind is None or span.kind == kind) and (name is None or span.name == name)]
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+
+class JSONLinesExporter(SpanExporter):
+    """Appends one JSON object per finished span to a file or text stream"""
+
+    def __init__(self, target: Union[str, TextIO]):
+        if isinstance(target, str):
+            self._stream = open(target, "a", encoding="utf-8")
+            self._owned = True
+        else:
+            self._stream = target
+            self._owned = False
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._stream.write(line)
+            self._stream.flush()
+
+    def close(self):
+        if self._owned:
+            self._stream.close()
+
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class PrometheusExporter(SpanExporter):
+    """Aggregates spans into Prometheus metrics served in the text format.
+
+    - ``<namespace>_span_duration_seconds``: histogram per (kind, name)
+    - ``<namespace>_span_errors_total``: failed spans per (kind, name)
+    - ``<namespace>_llm_tokens_total``: LLM tokens per (name, type)
+    - ``<namespace>_<counter>_total``: each ``increment`` counter, per label set
+
+    ``render`` returns the exposition text; ``serve`` exposes it over HTTP
+    at ``/metrics``.
+    """
+
+    def __init__(self, namespace: str = "travel_agent", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._durations: Dict[Tuple[str, str], List[Any]] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], int]] = {}
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        key = (span.kind, span.name)
+        with self._lock:
+            # [bucket counts..., sum, count]
+            histogram = self._durations.get(key)
+            if histogram is None:
+                histogram = self._durations[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if span.duration <= bound:
+                    histogram[i] += 1
+            histogram[-2] += span.duration
+            histogram[-1] += 1
+            if span.error is not None:
+                self._errors[key] = self._errors.get(key, 0) + 1
+            if span.kind == "llm":
+                for token_type in ("input", "output"):
+                    count = span.attributes.get(f"{token_type}_tokens")
+                    if count:
+                        token_key = (span.name, token_type)
+                        self._tokens[token_key] = self._tokens.get(token_key, 0) + count
+
+    def count(self, name: str, value: int, labels: Dict[str, str]):
+        key = tuple(sorted((label, str(label_value)) for label, label_value in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def render(self) -> str:
+        prefix = self.namespace
+        lines = [f"# HELP {prefix}_span_duration_seconds Duration of graph nodes, tools, LLM calls and renders",
+                 f"# TYPE {prefix}_span_duration_seconds histogram"]
+        with self._lock:
+            for (kind, name), histogram in sorted(self._durations.items()):
+                labels = f'kind="{_label(kind)}",name="{_label(name)}"'
+                for bound, count in zip(self.buckets, histogram):
+                    lines.append(f'{prefix}_span_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{prefix}_span_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram[-1]}')
+                lines.append(f"{prefix}_span_duration_seconds_sum{{{labels}}} {histogram[-2]}")
+                lines.append(f"{prefix}_span_duration_seconds_count{{{labels}}} {histogram[-1]}")
+            lines += [f"# HELP {prefix}_span_errors_total Failed spans",
+                      f"# TYPE {prefix}_span_errors_total counter"]
+            for (kind, name), count in sorted(self._errors.items()):
+                lines.append(f'{prefix}_span_errors_total{{kind="{_label(kind)}",name="{_label(name)}"}} {count}')
+            lines += [f"# HELP {prefix}_llm_tokens_total Tokens reported by LLM calls",
+                      f"# TYPE {prefix}_llm_tokens_total counter"]
+            for (name, token_type), count in sorted(self._tokens.items()):
+                lines.append(f'{prefix}_llm_tokens_total{{name="{_label(name)}",type="{token_type}"}} {count}')
+            for name, series in sorted(self._counters.items()):
+                lines += [f"# HELP {prefix}_{name}_total {name.replace('_', ' ').capitalize()}",
+                          f"# TYPE {prefix}_{name}_total counter"]
+                for key, count in sorted(series.items()):
+                    labels = ",".join(f'{label}="{_label(value)}"' for label, value in key)
+                    lines.append(f"{prefix}_{name}_total{{{labels}}} {count}" if labels
+                                 else f"{prefix}_{name}_total {count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1"):
+        """Serve ``/metrics`` on a daemon thread; call ``shutdown()`` on the result to stop"""
+        # Imported lazily: only processes exposing metrics need the HTTP server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("metrics: " + format, *args)
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="travel-metrics", daemon=True).start()
+        logger.info("📈 Serving metrics on http://%s:%d/metrics", host, server.server_address[1])
+        return server
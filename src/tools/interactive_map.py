@@ -0,0 +1,127 @@
+from typing import Any, Dict, Iterable, List, Optional
+import html
+import json
+
+from .artifacts import get_or_render_artifact
+from .catalog import get_catalog
+from .geocoding import get_geocoder
+from .render_cache import make_cache_key
+
+INTERACTIVE_MAP_OUTPUTS = {"html": "text/html", "geojson": "application/geo+json"}
+
+# Marker colors cycled by itinerary day
+DAY_COLORS = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFB347", "#6A0572", "#2E86AB"]
+
+def generate_interactive_map(destination: str, attractions: List[str] = None, itinerary: Iterable[Dict] = None,
+                             output: str = "html") -> Dict[str, Any]:
+    """Generate an interactive map of the attractions (HTML or GeoJSON)
+
+    Coordinates come from the geocoder (bundled gazetteer plus persistent
+    cache), looked up in one batch. Attractions are tagged with the itinerary
+    day that visits them, and routed days are drawn as lines.
+    """
+    if output not in INTERACTIVE_MAP_OUTPUTS:
+        raise ValueError(f"Unknown interactive map output: {output}")
+
+    geojson = build_geojson(destination, attractions or [], itinerary)
+    key = make_cache_key("interactive_map", {"geojson": geojson, "output": output})
+    if output == "geojson":
+        render = lambda: json.dumps(geojson, separators=(",", ":")).encode("utf-8")
+    else:
+        render = lambda: _render_html(destination, geojson)
+    return get_or_render_artifact(key, render, INTERACTIVE_MAP_OUTPUTS[output], name="interactive_map")
+
+def _day_assignments(itinerary: Optional[Iterable[Dict]], names: List[str]) -> Dict[str, Any]:
+    """Map attraction names to the first day visiting them, plus each routed day's stops"""
+    days = {}
+    routes = {}
+    for day in itinerary or ():
+        route = day.get("route")
+        if route:
+            routes[day["day"]] = list(route)
+            for name in route:
+                days.setdefault(name, day["day"])
+        else:
+            text = f"{day.get('morning', '')} {day.get('afternoon', '')}"
+            for name in names:
+                if name not in days and name in text:
+                    days[name] = day["day"]
+    return {"days": days, "routes": routes}
+
+def build_geojson(destination: str, attractions: List[str], itinerary: Iterable[Dict] = None) -> Dict[str, Any]:
+    """Build a GeoJSON FeatureCollection of the destination, attractions and day routes"""
+    geocoder = get_geocoder()
+    assignments = _day_assignments(itinerary, attractions)
+    routed_names = [name for route in assignments["routes"].values() for name in route]
+    names = list(dict.fromkeys(attractions + routed_names))
+    coordinates = geocoder.lookup_many(names, destination)
+
+    features = []
+    center = geocoder.center(destination)
+    if center is not None:
+        features.append(_point(center, {"name": destination, "kind": "destination",
+                                        "color": get_catalog().map_position(destination)["color"]}))
+    for name in names:
+        if coordinates.get(name) is None:
+            continue
+        day = assignments["days"].get(name)
+        color = DAY_COLORS[(day - 1) % len(DAY_COLORS)] if day else "#495057"
+        features.append(_point(coordinates[name], {"name": name, "kind": "attraction", "day": day,
+                                                   "color": color}))
+    for day, route in sorted(assignments["routes"].items()):
+        line = [coordinates[name] for name in route if coordinates.get(name) is not None]
+        if len(line) > 1:
+            features.append({
+                "type": "Feature",
+                # GeoJSON positions are [longitude, latitude]
+                "geometry": {"type": "LineString", "coordinates": [[lon, lat] for lat, lon in line]},
+                "properties": {"name": f"Day {day}", "kind": "route", "day": day,
+                               "color": DAY_COLORS[(day - 1) % len(DAY_COLORS)]},
+            })
+    return {"type": "FeatureCollection", "features": features}
+
+def _point(coordinates, properties: Dict[str, Any]) -> Dict[str, Any]:
+    lat, lon = coordinates
+    return {"type": "Feature", "geometry": {"type": "Point", "coordinates": [lon, lat]}, "properties": properties}
+
+def _escape_label(text: str) -> str:
+    """Escape a tooltip or popup label for folium
+
+    folium inserts labels as raw HTML inside JavaScript template literals, and
+    names come from the LLM or user input, so backticks and ``$`` are encoded
+    along with the usual HTML characters.
+    """
+    return html.escape(text).replace("`", "&#96;").replace("$", "&#36;")
+
+def _render_html(destination: str, geojson: Dict[str, Any]) -> bytes:
+    """Render the GeoJSON as a self-contained folium (Leaflet) HTML page"""
+    # Imported lazily so planning without this map never pays for folium
+    import folium
+
+    points = [feature["geometry"]["coordinates"] for feature in geojson["features"]
+              if feature["geometry"]["type"] == "Point"]
+    fmap = folium.Map(tiles="OpenStreetMap", zoom_start=12,
+                      location=[points[0][1], points[0][0]] if points else [20, 0])
+    if not points:
+        fmap.options["zoom"] = 2
+
+    for feature in geojson["features"]:
+        properties = feature["properties"]
+        geometry = feature["geometry"]
+        if geometry["type"] == "LineString":
+            folium.PolyLine([[lat, lon] for lon, lat in geometry["coordinates"]], color=properties["color"],
+                            weight=3, opacity=0.8, tooltip=_escape_label(properties["name"])).add_to(fmap)
+            continue
+        lon, lat = geometry["coordinates"]
+        label = properties["name"] if not properties.get("day") else f"Day {properties['day']}: {properties['name']}"
+        label = _escape_label(label)
+        folium.CircleMarker([lat, lon], radius=10 if properties["kind"] == "destination" else 7,
+                            color=properties["color"], fill=True, fill_opacity=0.8,
+                            tooltip=label, popup=folium.Popup(label)).add_to(fmap)
+
+    if len(points) > 1:
+        lons = [lon for lon, _ in points]
+        lats = [lat for _, lat in points]
+        fmap.fit_bounds([[min(lats), min(lons)], [max(lats), max(lons)]])
+    fmap.get_root().title = f"{destination} travel map"
+    return fmap.get_root().render().encode("utf-8")
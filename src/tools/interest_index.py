@@ -0,0 +1,121 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+import re
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words that never carry an interest on their own
+STOP_WORDS = frozenset({"a", "an", "and", "at", "for", "in", "of", "on", "the", "to", "with"})
+
+# Interest synonym groups; every word in a group matches the others
+SYNONYM_GROUPS = [
+    ["museum", "gallery", "exhibition", "art"],
+    ["food", "cuisine", "dining", "restaurant", "culinary", "tasting", "seafood", "sushi", "eat"],
+    ["history", "historical", "heritage", "fort", "palace", "monument", "ancient"],
+    ["nature", "hiking", "trekking", "mountain", "lake", "forest", "garden", "waterfall", "valley"],
+    ["beach", "island", "sea", "swimming", "water"],
+    ["culture", "cultural", "traditional", "ceremony", "show", "immersion"],
+    ["temple", "mosque", "shrine", "stupa", "religious", "spiritual"],
+    ["adventure", "hiking", "trekking", "skiing", "sport"],
+    ["shopping", "shop", "bazaar", "market", "souvenir"],
+    ["relaxation", "relax", "spa", "yoga", "wellness"],
+    ["photography", "photo", "camera", "view"],
+    ["nightlife", "karaoke", "entertainment", "bar"],
+    ["sightseeing", "tour", "landmark", "cruise", "crossing"],
+]
+
+# Relative weight of a synonym match compared to a direct match
+SYNONYM_WEIGHT = 0.5
+
+
+def stem(token: str) -> str:
+    """Reduce a lowercase token to a crude stem so plurals and verb forms match"""
+    if len(token) > 4 and token.endswith("ies"):
+        token = token[:-3] + "y"
+    elif len(token) > 4 and token.endswith(("sses", "xes", "ches", "shes")):
+        token = token[:-2]
+    elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+
+    for suffix in ("ing", "ed"):
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            token = token[:-len(suffix)]
+            # "shopping" -> "shopp" -> "shop"
+            if token[-1] == token[-2] and token[-1] not in "lsz":
+                token = token[:-1]
+            break
+
+    if len(token) > 3 and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into stemmed tokens, dropping stop words"""
+    return [stem(token) for token in _TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def _build_synonyms() -> Dict[str, Tuple[str, ...]]:
+    synonyms: Dict[str, set] = {}
+    for group in SYNONYM_GROUPS:
+        stems = {stem(word) for word in group}
+        for word_stem in stems:
+            synonyms.setdefault(word_stem, set()).update(stems - {word_stem})
+    return {word_stem: tuple(sorted(others)) for word_stem, others in synonyms.items()}
+
+
+SYNONYMS = _build_synonyms()
+
+
+@lru_cache(maxsize=4096)
+def expand_interest(interest: str) -> Tuple[Tuple[str, float], ...]:
+    """Expand an interest into weighted stems, including its synonyms"""
+    weights: Dict[str, float] = {}
+    for token in tokenize(interest):
+        weights[token] = 1.0
+        for synonym in SYNONYMS.get(token, ()):
+            weights.setdefault(synonym, SYNONYM_WEIGHT)
+    return tuple(weights.items())
+
+
+class InterestIndex:
+    """Inverted index from interest stems to a destination's activities and attractions.
+
+    Postings are built once, so a lookup only touches the stems of the
+    requested interests and the items that actually match them.
+    """
+
+    def __init__(self, activities: Sequence[str], attractions: Sequence[str] = ()):
+        self._items = {
+            "activities": tuple(activities),
+            "attractions": tuple(attractions),
+        }
+        self._postings = {kind: self._index(items) for kind, items in self._items.items()}
+
+    @staticmethod
+    def _index(items: Sequence[str]) -> Dict[str, Tuple[int, ...]]:
+        postings: Dict[str, List[int]] = {}
+        for position, item in enumerate(items):
+            for token in set(tokenize(item)):
+                postings.setdefault(token, []).append(position)
+        return {token: tuple(positions) for token, positions in postings.items()}
+
+    def search(self, interests: Iterable[str], kind: str = "activities") -> List[str]:
+        """Return items matching any interest, best matches first.
+
+        Each interest contributes its strongest match (direct or synonym) to
+        an item's score; ties keep the catalog order.
+        """
+        postings = self._postings[kind]
+        scores: Dict[int, float] = {}
+        for interest in interests:
+            matched: Dict[int, float] = {}
+            for token, weight in expand_interest(str(interest)):
+                for position in postings.get(token, ()):
+                    if weight > matched.get(position, 0.0):
+                        matched[position] = weight
+            for position, weight in matched.items():
+                scores[position] = scores.get(position, 0.0) + weight
+
+        items = self._items[kind]
+        return [items[position] for position in sorted(scores, key=lambda position: (-scores[position], position))]
@@ -1,51 +1,120 @@
-from typing import List, Dict
-import random
+from typing import Dict, Iterator, List, Sequence
 
-def build_daily_itinerary(destination: str, duration: int, travel_style: str, attractions: List[str]) -> List[Dict]:
-    """Build a detailed daily itinerary"""
+from .records import DayPlan, RoutedDayPlan, intern_text
+from .routing import DEFAULT_DAY_MINUTES, plan_routes
+
+# Different templates based on travel style
+ITINERARY_TEMPLATES = {
+    "adventure": {
+        "morning": "Adventure activity and exploration",
+        "afternoon": "Outdoor experiences and local adventures", 
+        "evening": "Relaxation and local dining"
+    },
+    "cultural": {
+        "morning": "Museum and historical site visits",
+        "afternoon": "Cultural workshops and local experiences",
+        "evening": "Traditional performances and dining"
+    },
+    "relaxation": {
+        "morning": "Spa treatments and leisurely breakfast",
+        "afternoon": "Beach time or peaceful gardens", 
+        "evening": "Fine dining and sunset views"
+    },
+    "mixed": {
+        "morning": "Sightseeing and main attractions",
+        "afternoon": "Local experiences and exploration",
+        "evening": "Entertainment and dining"
+    }
+}
+
+MEALS = intern_text("Breakfast at accommodation, Lunch at local restaurant, Dinner at recommended spot")
+
+def build_daily_itinerary(destination: str, duration: int, travel_style: str, attractions: List[str],
+                          coordinates: Dict[str, Sequence[float]] = None,
+                          day_minutes: float = DEFAULT_DAY_MINUTES,
+                          visit_minutes: Dict[str, float] = None) -> List[Dict]:
+    """Build a detailed daily itinerary
+    
+    With ``coordinates`` (attraction name -> (lat, lon)) the days are routed:
+    nearby attractions are grouped into the same day within ``day_minutes``
+    and visited in a short order (see routing.plan_routes).
+    """
+    return list(iter_daily_itinerary(destination, duration, travel_style, attractions, coordinates,
+                                     day_minutes, visit_minutes))
+
+def iter_daily_itinerary(destination: str, duration: int, travel_style: str, attractions: List[str],
+                         coordinates: Dict[str, Sequence[float]] = None,
+                         day_minutes: float = DEFAULT_DAY_MINUTES,
+                         visit_minutes: Dict[str, float] = None) -> Iterator[Dict]:
+    """Yield the days of build_daily_itinerary one at a time
+    
+    Memory stays constant in ``duration``, so 90-365 day plans can be written
+    out (e.g. with ReportRenderer.write) without building the whole list.
+    """
+    for day in iter_daily_itinerary_records(destination, duration, travel_style, attractions, coordinates,
+                                            day_minutes, visit_minutes):
+        yield day.to_dict()
+
+def build_daily_itinerary_records(destination: str, duration: int, travel_style: str, attractions: List[str],
+                                  coordinates: Dict[str, Sequence[float]] = None,
+                                  day_minutes: float = DEFAULT_DAY_MINUTES,
+                                  visit_minutes: Dict[str, float] = None) -> List[DayPlan]:
+    """Like build_daily_itinerary, as compact read-only DayPlan records"""
+    return list(iter_daily_itinerary_records(destination, duration, travel_style, attractions, coordinates,
+                                             day_minutes, visit_minutes))
+
+def iter_daily_itinerary_records(destination: str, duration: int, travel_style: str, attractions: List[str],
+                                 coordinates: Dict[str, Sequence[float]] = None,
+                                 day_minutes: float = DEFAULT_DAY_MINUTES,
+                                 visit_minutes: Dict[str, float] = None) -> Iterator[DayPlan]:
+    """Yield the days of build_daily_itinerary_records one at a time"""
     
+    if coordinates:
+        yield from _iter_routed_itinerary(destination, duration, travel_style, attractions, coordinates,
+                                          day_minutes, visit_minutes)
+        return
+    yield from _iter_standard_itinerary(destination, duration, travel_style, attractions)
+
+def _iter_standard_itinerary(destination: str, duration: int, travel_style: str, attractions: List[str],
+                             first_day: int = 1) -> Iterator[DayPlan]:
     if not attractions:
         attractions = ["main attractions", "local experiences", "cultural sites"]
     
-    itineraries = []
-    
-    # Different templates based on travel style
-    templates = {
-        "adventure": {
-            "morning": "Adventure activity and exploration",
-            "afternoon": "Outdoor experiences and local adventures", 
-            "evening": "Relaxation and local dining"
-        },
-        "cultural": {
-            "morning": "Museum and historical site visits",
-            "afternoon": "Cultural workshops and local experiences",
-            "evening": "Traditional performances and dining"
-        },
-        "relaxation": {
-            "morning": "Spa treatments and leisurely breakfast",
-            "afternoon": "Beach time or peaceful gardens", 
-            "evening": "Fine dining and sunset views"
-        },
-        "mixed": {
-            "morning": "Sightseeing and main attractions",
-            "afternoon": "Local experiences and exploration",
-            "evening": "Entertainment and dining"
-        }
-    }
+    template = ITINERARY_TEMPLATES.get(travel_style, ITINERARY_TEMPLATES["mixed"])
     
-    template = templates.get(travel_style, templates["mixed"])
+    # Only the morning depends on the day; build every distinct string once and
+    # share it between days instead of formatting the same text per day
+    mornings = [intern_text(f"{template['morning']} at {attraction}") for attraction in attractions[:duration]]
+    afternoon = intern_text(f"{template['afternoon']} in {destination}")
+    evening = intern_text(f"{template['evening']} with local cuisine")
+    accommodation_type = "Hotel" if travel_style != "budget" else "Hostel/Guesthouse"
     
     for day in range(1, duration + 1):
-        attraction = attractions[(day - 1) % len(attractions)]
-        
-        daily_plan = {
-            "day": day,
-            "morning": f"{template['morning']} at {attraction}",
-            "afternoon": f"{template['afternoon']} in {destination}",
-            "evening": f"{template['evening']} with local cuisine",
-            "meals": "Breakfast at accommodation, Lunch at local restaurant, Dinner at recommended spot",
-            "accommodation_type": "Hotel" if travel_style != "budget" else "Hostel/Guesthouse"
-        }
-        itineraries.append(daily_plan)
-    
-    return itineraries
\ No newline at end of file
+        yield DayPlan(first_day + day - 1, mornings[(day - 1) % len(mornings)], afternoon, evening, MEALS,
+                      accommodation_type)
+
+def _iter_routed_itinerary(destination: str, duration: int, travel_style: str, attractions: List[str],
+                           coordinates: Dict[str, Sequence[float]], day_minutes: float,
+                           visit_minutes: Dict[str, float]) -> Iterator[DayPlan]:
+    template = ITINERARY_TEMPLATES.get(travel_style, ITINERARY_TEMPLATES["mixed"])
+    # Without a ranked list, route every attraction that has coordinates. The
+    # routes are bounded by the number of attractions, not by the duration.
+    routes = plan_routes(attractions or list(coordinates), coordinates, duration, day_minutes, visit_minutes)
+    if not routes:
+        yield from _iter_standard_itinerary(destination, duration, travel_style, attractions)
+        return
+    
+    evening = intern_text(f"{template['evening']} with local cuisine")
+    accommodation_type = "Hotel" if travel_style != "budget" else "Hostel/Guesthouse"
+    for day, (route, travel_km) in enumerate(routes, start=1):
+        # The first half of the route fills the morning, the rest the afternoon
+        split = (len(route) + 1) // 2
+        morning = f"{template['morning']} at {', '.join(route[:split])}"
+        afternoon = (f"{template['afternoon']} at {', '.join(route[split:])}" if route[split:]
+                     else f"{template['afternoon']} in {destination}")
+        yield RoutedDayPlan(day, morning, afternoon, evening, MEALS, accommodation_type,
+                            route, round(travel_km, 2))
+    
+    # Days left once every attraction is scheduled use the standard template
+    yield from _iter_standard_itinerary(destination, duration - len(routes), travel_style, [],
+                                        first_day=len(routes) + 1)
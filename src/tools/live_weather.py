@@ -0,0 +1,174 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+import logging
+import threading
+import time
+
+from .catalog import normalize_destination
+from .geocoding import get_geocoder
+
+logger = logging.getLogger(__name__)
+
+DAILY_FIELDS = ("temperature_2m_max", "temperature_2m_min", "precipitation_sum", "daylight_duration")
+
+
+class WeatherProvider(ABC):
+    """Base class for live weather backends used by get_seasonal_weather.
+
+    ``forecast`` returns a summary dict (``temperature``, ``rain_mm_per_day``,
+    ``daylight_hours``, ``days``, ``start``) or None when no forecast is
+    available, in which case the seasonal table is used instead.
+    """
+
+    @abstractmethod
+    def forecast(self, destination: str) -> Optional[Dict[str, Any]]:
+        ...
+
+
+def summarize_daily(daily: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an Open-Meteo style ``daily`` block to the fields a trip plan needs"""
+    days = len(daily["time"])
+    if not days:
+        raise ValueError("empty forecast")
+    rain = [value or 0.0 for value in daily["precipitation_sum"]]
+    return {
+        "temperature": f"{min(daily['temperature_2m_min']):.0f}-{max(daily['temperature_2m_max']):.0f}°C",
+        "rain_mm_per_day": round(sum(rain) / days, 1),
+        "daylight_hours": round(sum(daily["daylight_duration"]) / days / 3600, 1),
+        "days": days,
+        "start": daily["time"][0],
+    }
+
+
+class HTTPWeatherProvider(WeatherProvider):
+    """Daily forecasts from an Open-Meteo compatible HTTP API.
+
+    Built to sit on the planning hot path:
+
+    - one pooled ``requests.Session``, so connections are reused across calls
+    - a TTL cache per (destination, date); failures are cached briefly too, so
+      a down or rate limiting upstream is not hammered
+    - singleflight: concurrent lookups of the same key share one request
+    - any error or timeout returns None, so callers fall back to seasonal data
+
+    ``base_url`` can point at any compatible server, e.g. a local stub.
+    """
+
+    def __init__(self, base_url: str = "https://api.open-meteo.com", timeout: float = 2.0,
+                 ttl_seconds: float = 30 * 60, failure_ttl_seconds: float = 60, max_entries: int = 1024,
+                 pool_size: int = 16, forecast_days: int = 7, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.ttl_seconds = ttl_seconds
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self.max_entries = max_entries
+        self.forecast_days = forecast_days
+        if session is None:
+            # Imported lazily: the seasonal-only default never needs requests
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fallbacks = 0
+
+    def forecast(self, destination: str) -> Optional[Dict[str, Any]]:
+        key = (normalize_destination(destination), date.today().isoformat())
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            try:
+                # A read and a connect timeout can both elapse before the leader gives up
+                return future.result(timeout=2 * self.timeout)
+            except FutureTimeoutError:
+                with self._lock:
+                    self.fallbacks += 1
+                return None
+
+        try:
+            try:
+                value = self._fetch(destination)
+            except Exception as e:
+                logger.warning("⚠️ Live weather unavailable for %s: %s", destination, e)
+                value = None
+            except BaseException as e:
+                # e.g. KeyboardInterrupt: wake the followers instead of leaving them waiting
+                future.set_exception(e)
+                raise
+            ttl = self.ttl_seconds if value is not None else self.failure_ttl_seconds
+            with self._lock:
+                self._cache[key] = (time.monotonic() + ttl, value)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+                if value is None:
+                    self.fallbacks += 1
+            future.set_result(value)
+            return value
+        finally:
+            # Always release the key, or every later miss would wait on a dead future
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _fetch(self, destination: str) -> Optional[Dict[str, Any]]:
+        center = get_geocoder().center(destination)
+        if center is None:
+            return None
+        with self._lock:
+            self.requests += 1
+        response = self.session.get(f"{self.base_url}/v1/forecast", timeout=self.timeout, params={
+            "latitude": center[0],
+            "longitude": center[1],
+            "daily": ",".join(DAILY_FIELDS),
+            "timezone": "auto",
+            "forecast_days": self.forecast_days,
+        })
+        response.raise_for_status()
+        return summarize_daily(response.json()["daily"])
+
+    def clear(self):
+        """Drop every cached forecast and reset the counters"""
+        with self._lock:
+            self._cache.clear()
+            self.requests = self.hits = self.misses = self.coalesced = self.fallbacks = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return upstream request, cache and coalescing counters"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "requests": self.requests,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+                "fallbacks": self.fallbacks,
+                "entries": len(self._cache),
+            }
+
+    def close(self):
+        self.session.close()
@@ -1,61 +1,234 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch
-import numpy as np
-from typing import List, Dict
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, CancelledError, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 import io
-import base64
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
 
-def generate_itinerary_map(destination: str, itinerary: List[Dict], attractions: List[str] = None) -> str:
-    """Generate a visual itinerary map/timeline"""
+from .catalog import get_catalog
+from .artifacts import get_or_render_artifact, load_artifact, lookup_artifact, store_artifact
+from .instrumentation import span
+from .render_cache import make_cache_key, share_signature
+
+logger = logging.getLogger(__name__)
+
+# Every itinerary map page has the same fixed layout of DAYS_PER_PAGE day rows
+DAYS_PER_PAGE = 5
+MAP_OUTPUTS = ("auto", "png", "pdf")
+MAP_DPI = 120
+# Seconds between checks for pages cancelled by another thread's pool shutdown
+CANCEL_POLL_SECONDS = 0.25
+
+# Default number of page render processes, e.g. "4" or "auto" (one per core)
+RENDER_WORKERS_ENV = "TRAVEL_MAP_RENDER_WORKERS"
+
+def _default_render_workers() -> int:
+    value = os.environ.get(RENDER_WORKERS_ENV, "").strip()
+    if not value:
+        return 1
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning("⚠️ Ignoring $%s=%r: expected a number or \"auto\"", RENDER_WORKERS_ENV, value)
+        return 1
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+# Pages render in the calling process unless $TRAVEL_MAP_RENDER_WORKERS or
+# set_map_render_workers (TravelPlannerAgent(max_render_workers=...)) ask for more
+_render_workers = _default_render_workers()
+_pool_lock = threading.Lock()
+
+def set_map_render_workers(max_workers: Optional[int] = None):
+    """Set how many processes render map pages (1 renders in the calling process)
+    
+    ``max_workers`` defaults to one process per core. Workers are spawned, so
+    they re-import the main module: scripts that enable them must keep their
+    top-level code under an ``if __name__ == "__main__":`` guard. If the
+    workers cannot start, pages fall back to rendering in-process.
+    """
+    global _render_pool, _render_workers
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    with _pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown()
+            _render_pool = None
+        _render_workers = max(1, max_workers)
+
+def _get_render_pool() -> Optional[ProcessPoolExecutor]:
+    global _render_pool
+    with _pool_lock:
+        if _render_pool is None and _render_workers > 1:
+            # Tools run on worker threads, and forking a threaded process is unsafe
+            _render_pool = ProcessPoolExecutor(_render_workers, mp_context=multiprocessing.get_context("spawn"))
+        return _render_pool
+
+def _disable_render_pool(error: BaseException):
+    """Stop using worker processes after the pool broke; pages render in-process"""
+    global _render_pool, _render_workers
+    with _pool_lock:
+        if _render_pool is not None:
+            logger.warning("⚠️ Map render workers failed (%s); rendering pages in-process", error)
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+        _render_workers = 1
+
+def _submit_page(pool: ProcessPoolExecutor, args: tuple) -> Optional[Future]:
+    try:
+        return pool.submit(_render_itinerary_page, *args)
+    except BrokenProcessPool as e:
+        _disable_render_pool(e)
+        return None
+    except RuntimeError:
+        # Another thread shut this pool down (set_map_render_workers); render in-process
+        return None
+
+def generate_itinerary_map(destination: str, itinerary: Iterable[Dict], attractions: List[str] = None,
+                           days_per_page: int = DAYS_PER_PAGE, output: str = "auto") -> Dict[str, Any]:
+    """Generate a visual itinerary map/timeline
+    
+    The days are laid out ``days_per_page`` to a page. Pages are cached one by
+    one and rendered in parallel worker processes. ``output`` is "png" (one
+    PNG per page, listed under "pages"), "pdf" (a single multi-page PDF) or
+    "auto" (a PNG when the trip fits on one page, else a PDF).
+    """
+    if output not in MAP_OUTPUTS:
+        raise ValueError(f"Unknown map output: {output}")
+    if days_per_page < 1:
+        raise ValueError("days_per_page must be at least 1")
+    
+    with span("itinerary_map_pages", "render", destination=destination) as render_span:
+        pages = _render_pages(destination, itinerary, attractions, days_per_page)
+        render_span.set_attribute("pages", len(pages))
+    if output == "png" or (output == "auto" and len(pages) == 1):
+        return pages[0] if len(pages) == 1 else dict(pages[0], pages=pages)
+    
+    key = make_cache_key("itinerary_map_pdf", [page["artifact_id"] for page in pages])
+    ref = get_or_render_artifact(key, lambda: _pages_to_pdf(pages), "application/pdf", name="itinerary_map_pdf")
+    return dict(ref, page_count=len(pages))
+
+def _iter_pages(itinerary: Iterable[Dict], days_per_page: int) -> Iterator[List[Dict]]:
+    days = iter(itinerary)
+    page = list(itertools.islice(days, days_per_page))
+    yield page  # an empty itinerary still gets a (destination only) page
+    while page:
+        page = list(itertools.islice(days, days_per_page))
+        if page:
+            yield page
+
+def _render_pages(destination: str, itinerary: Iterable[Dict], attractions: Optional[List[str]],
+                  days_per_page: int) -> List[Dict[str, Any]]:
+    """Return one artifact reference per page, rendering uncached pages in parallel
     
-    # Destination coordinates (simplified for demo)
-    destination_coords = {
-        "paris": {"x": 50, "y": 50, "color": "#FF6B6B"},
-        "tokyo": {"x": 80, "y": 30, "color": "#4ECDC4"}, 
-        "bali": {"x": 60, "y": 70, "color": "#45B7D1"},
-        "default": {"x": 50, "y": 50, "color": "#96CEB4"}
-    }
+    The itinerary is consumed page by page and only a bounded number of pages
+    are in flight, so iterators (iter_daily_itinerary) are never materialized.
+    """
+    # A plain dict pickles into worker processes; the catalog entry is read-only
+    dest_data = dict(get_catalog().map_position(destination))
+    refs: List[Optional[Dict[str, Any]]] = []
+    pending = {}
+    deferred = None
     
-    dest_data = destination_coords.get(destination.lower(), destination_coords["default"])
+    for number, days in enumerate(_iter_pages(itinerary, days_per_page)):
+        key = make_cache_key("itinerary_map_page", {
+            "destination": destination,
+            "days": days,
+            "attractions": attractions,
+            "days_per_page": days_per_page,
+            "dpi": MAP_DPI
+        })
+        refs.append(lookup_artifact(key))
+        if refs[-1] is not None:
+            continue
+        job = (number, key, (destination, days, attractions, days_per_page, dest_data))
+        if deferred is None and not pending:
+            # Hold the first page back: a single missing page renders in-process
+            deferred = job
+            continue
+        pool = _get_render_pool()
+        for job_number, job_key, job_args in filter(None, (deferred, job)):
+            future = _submit_page(pool, job_args) if pool is not None else None
+            if future is None:
+                refs[job_number] = store_artifact(job_key, _render_itinerary_page(*job_args))
+            else:
+                pending[job_number] = (job_key, job_args, future)
+        deferred = None
+        if len(pending) >= 2 * _render_workers:
+            _store_finished(pending, refs, FIRST_COMPLETED)
+    
+    if deferred is not None:
+        job_number, job_key, job_args = deferred
+        refs[job_number] = store_artifact(job_key, _render_itinerary_page(*job_args))
+    _store_finished(pending, refs, ALL_COMPLETED)
+    return refs
+
+def _store_finished(pending: Dict[int, Any], refs: List[Optional[Dict[str, Any]]], return_when: str):
+    if not pending:
+        return
+    futures = [future for _, _, future in pending.values()]
+    while True:
+        # Futures cancelled by shutdown(cancel_futures=True) never wake wait(),
+        # so poll for them and count them as done
+        done, not_done = wait(futures, timeout=CANCEL_POLL_SECONDS, return_when=return_when)
+        done |= {future for future in not_done if future.cancelled()}
+        if len(done) == len(futures) or (done and return_when == FIRST_COMPLETED):
+            break
+    for number in [number for number, (_, _, future) in pending.items() if future in done]:
+        key, args, future = pending.pop(number)
+        try:
+            data = future.result()
+        except BrokenProcessPool as e:
+            _disable_render_pool(e)
+            data = _render_itinerary_page(*args)
+        except CancelledError:
+            # Another thread's _disable_render_pool cancelled the pending pages
+            data = _render_itinerary_page(*args)
+        refs[number] = store_artifact(key, data)
+
+def _pages_to_pdf(pages: List[Dict[str, Any]]) -> bytes:
+    """Combine page PNGs into one PDF, decoding a single page at a time"""
+    from PIL import Image
+    
+    buf = io.BytesIO()
+    for number, page in enumerate(pages):
+        with Image.open(io.BytesIO(load_artifact(page))) as image:
+            image.convert("RGB").save(buf, format="PDF", append=number > 0, resolution=MAP_DPI)
+    return buf.getvalue()
+
+def _clip(text: str, length: int) -> str:
+    return text if len(text) <= length else text[:length] + "..."
+
+def _render_itinerary_page(destination: str, days: List[Dict], attractions: Optional[List[str]],
+                           days_per_page: int, dest_data: Dict[str, Any]) -> bytes:
+    """Render one itinerary map page as PNG bytes (runs in worker processes)"""
+    # Imported lazily so spawned workers and in-process renders only load matplotlib when a page is drawn
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Circle, FancyBboxPatch
     
     # Create figure and axis
-    fig, ax = plt.subplots(1, 1, figsize=(12, 8))
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots(1, 1)
+    fig.subplots_adjust(left=0.02, right=0.98, bottom=0.02, top=0.88)
     
     # Set background color
     fig.patch.set_facecolor('#F8F9FA')
     ax.set_facecolor('#F8F9FA')
     
-    # Draw destination circle
-    destination_circle = patches.Circle(
-        (dest_data["x"], dest_data["y"]), 
-        radius=15, 
-        facecolor=dest_data["color"],
-        edgecolor='white',
-        linewidth=3,
-        alpha=0.8
-    )
-    ax.add_patch(destination_circle)
-    
-    # Add destination text
-    ax.text(
-        dest_data["x"], dest_data["y"], 
-        destination.upper(), 
-        ha='center', va='center', 
-        fontsize=16, fontweight='bold', 
-        color='white'
-    )
+    # Draw itinerary timeline: fixed rows on the left, top to bottom
+    row_height = 100 / days_per_page
+    box_height = row_height * 0.8
     
-    # Draw itinerary timeline
-    day_height = 60
-    start_y = 20
-    
-    for i, day in enumerate(itinerary):
-        day_y = start_y + (i * day_height)
+    for i, day in enumerate(days):
+        day_y = 100 - (i + 1) * row_height + (row_height - box_height) / 2
         
         # Day box
         day_box = FancyBboxPatch(
-            (10, day_y), 80, 15,
+            (2, day_y), 100, box_height,
             boxstyle="round,pad=0.02",
             facecolor='#E9ECEF',
             edgecolor='#495057',
@@ -64,52 +237,88 @@ def generate_itinerary_map(destination: str, itinerary: List[Dict], attractions:
         ax.add_patch(day_box)
         
         # Day number
-        ax.text(15, day_y + 7.5, f"DAY {day['day']}", 
+        ax.text(5, day_y + box_height / 2, f"DAY {day['day']}", va='center',
                 fontsize=12, fontweight='bold', color='#495057')
         
         # Activities for the day
         activities = [
-            f"🌅 {day['morning'][:25]}...",
-            f"🌇 {day['afternoon'][:25]}...", 
-            f"🌃 {day['evening'][:25]}..."
+            f"🌅 {_clip(day['morning'], 60)}",
+            f"🌇 {_clip(day['afternoon'], 60)}", 
+            f"🌃 {_clip(day['evening'], 60)}"
         ]
         
         for j, activity in enumerate(activities):
-            ax.text(25, day_y + 11 - (j * 3), activity, 
+            ax.text(20, day_y + box_height * (3 - j) / 4, activity, va='center',
                     fontsize=9, color='#6C757D')
     
+    # Draw destination circle in the right-hand panel
+    destination_circle = Circle(
+        (128, 78), 
+        radius=14, 
+        facecolor=dest_data["color"],
+        edgecolor='white',
+        linewidth=3,
+        alpha=0.8
+    )
+    ax.add_patch(destination_circle)
+    
+    # Add destination text
+    ax.text(
+        128, 78, 
+        destination.upper(), 
+        ha='center', va='center', 
+        fontsize=16, fontweight='bold', 
+        color='white'
+    )
+    
     # Add attractions if provided
     if attractions:
-        ax.text(5, start_y + len(itinerary) * day_height + 10, 
+        ax.text(108, 54, 
                 "🏛️ KEY ATTRACTIONS:", fontsize=12, fontweight='bold', color='#495057')
         
         for i, attraction in enumerate(attractions[:4]):  # Show max 4 attractions
-            ax.text(5, start_y + len(itinerary) * day_height + 5 - (i * 4), 
-                    f"• {attraction}", fontsize=9, color='#6C757D')
+            ax.text(108, 48 - (i * 5), 
+                    f"• {_clip(attraction, 26)}", fontsize=9, color='#6C757D')
     
     # Set limits and remove axes
-    ax.set_xlim(0, 100)
+    ax.set_xlim(0, 150)
     ax.set_ylim(0, 100)
     ax.set_aspect('equal')
     ax.axis('off')
     
-    # Add title
-    plt.suptitle(f'{destination.upper()} TRAVEL ITINERARY', 
-                 fontsize=20, fontweight='bold', color='#343A40', y=0.95)
+    # Add title, with the page's day range
+    title = f'{destination.upper()} TRAVEL ITINERARY'
+    if days:
+        first, last = days[0]['day'], days[-1]['day']
+        title += f' · DAY {first}' if first == last else f' · DAYS {first}-{last}'
+    fig.suptitle(title, fontsize=20, fontweight='bold', color='#343A40', y=0.95)
     
-    # Convert to base64
+    # Convert to PNG bytes for the artifact store. No tight bounding box: every
+    # page keeps the same size, so PDF pages line up.
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight', dpi=120, facecolor=fig.get_facecolor())
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode()
-    plt.close()
+    fig.savefig(buf, format='png', dpi=MAP_DPI, facecolor=fig.get_facecolor())
     
-    return f"data:image/png;base64,{img_str}"
+    return buf.getvalue()
 
-def generate_budget_vs_duration_chart(destination: str, budget_data: Dict) -> str:
+def generate_budget_vs_duration_chart(destination: str, budget_data: Dict) -> Dict[str, Any]:
     """Generate a chart showing budget distribution"""
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    # Pie shares plus the labelled daily bars fully determine the figure
+    key = make_cache_key("budget_vs_duration_chart", {
+        "shares": share_signature(budget_data['budget_breakdown']),
+        "order": list(budget_data['budget_breakdown']),
+        "daily": [[category, repr(amount)] for category, amount in budget_data['daily_breakdown'].items()],
+        "dpi": 120
+    })
+    return get_or_render_artifact(key, lambda: _render_budget_vs_duration_chart(budget_data),
+                                  name="budget_vs_duration_chart")
+
+def _render_budget_vs_duration_chart(budget_data: Dict) -> bytes:
+    """Render the budget pie and daily bar charts as PNG bytes"""
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=(15, 6))
+    ax1, ax2 = fig.subplots(1, 2)
     fig.patch.set_facecolor('#F8F9FA')
     
     # Pie chart for budget breakdown
@@ -146,13 +355,10 @@ def generate_budget_vs_duration_chart(destination: str, budget_data: Dict) -> st
         ax2.text(bar.get_x() + bar.get_width()/2., height + 0.5,
                 f'${amount}', ha='center', va='bottom', fontweight='bold')
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    # Convert to base64
+    # Convert to PNG bytes for the artifact store
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight', dpi=120, facecolor=fig.get_facecolor())
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode()
-    plt.close()
+    fig.savefig(buf, format='png', bbox_inches='tight', dpi=120, facecolor=fig.get_facecolor())
     
-    return f"data:image/png;base64,{img_str}"
\ No newline at end of file
+    return buf.getvalue()
\ No newline at end of file
@@ -0,0 +1,24 @@
+from typing import Optional
+import os
+
+# Overrides the directory persistent caches default to
+CACHE_DIR_ENV = "TRAVEL_CACHE_DIR"
+
+
+def cache_dir() -> str:
+    """Return (and create) the per-user directory for persistent caches.
+
+    $TRAVEL_CACHE_DIR when set, else travel-itinerary-agent under
+    $XDG_CACHE_HOME (default ~/.cache), never the working directory.
+    """
+    path = os.environ.get(CACHE_DIR_ENV)
+    if not path:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        path = os.path.join(base, "travel-itinerary-agent")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_path(filename: str, path: Optional[str] = None) -> str:
+    """Return ``path`` if given, else ``filename`` inside cache_dir()"""
+    return path if path else os.path.join(cache_dir(), filename)
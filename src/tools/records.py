@@ -0,0 +1,148 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Tuple
+import sys
+
+
+def intern_text(value: Any) -> Any:
+    """Intern strings so identical template text is stored once across all plans"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record(Mapping):
+    """Base class for compact, immutable tool results.
+
+    Records are frozen dataclasses with ``__slots__``, but also read-only
+    mappings, so existing ``result["key"]`` / ``.get`` / ``.items()`` callers
+    keep working. ``to_dict`` returns the plain-dict form the public tools
+    return. Records come from the ``*_record`` APIs (e.g.
+    calculate_budget_breakdown_record), for callers holding many results.
+    """
+
+    __slots__ = ()
+    _field_names: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Subclasses of a record only list their own new slots
+        cls._field_names = cls._field_names + tuple(cls.__dict__.get("__slots__", ()))
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_names:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._field_names)
+
+    def __len__(self) -> int:
+        return len(self._field_names)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._field_names)
+        return f"{type(self).__name__}({values})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: to_plain(getattr(self, name)) for name in self._field_names}
+
+    def __reduce__(self):
+        # Frozen instances cannot be restored through __setattr__; rebuild them
+        # from their field values instead (also the compact pickle form)
+        return type(self), tuple(getattr(self, name) for name in self._field_names)
+
+
+class Amounts(Mapping):
+    """Read-only category -> amount mapping sharing one key tuple between instances"""
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys: Tuple[str, ...], values: Tuple[float, ...]):
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: str) -> float:
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"Amounts({dict(zip(self._keys, self._values))!r})"
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(zip(self._keys, self._values))
+
+    def __reduce__(self):
+        return Amounts, (self._keys, self._values)
+
+
+@dataclass(frozen=True, eq=False)
+class DayPlan(Record):
+    __slots__ = ("day", "morning", "afternoon", "evening", "meals", "accommodation_type")
+    day: int
+    morning: str
+    afternoon: str
+    evening: str
+    meals: str
+    accommodation_type: str
+
+
+@dataclass(frozen=True, eq=False)
+class RoutedDayPlan(DayPlan):
+    """A day built by geo routing: attractions in visiting order and the travel distance"""
+    __slots__ = ("route", "travel_km")
+    route: Tuple[str, ...]
+    travel_km: float
+
+
+@dataclass(frozen=True, eq=False)
+class BudgetBreakdown(Record):
+    __slots__ = ("total_budget", "trip_duration", "traveler_count", "budget_breakdown",
+                 "daily_breakdown", "budget_per_day", "budget_per_person", "budget_level")
+    total_budget: float
+    trip_duration: int
+    traveler_count: int
+    budget_breakdown: Amounts
+    daily_breakdown: Amounts
+    budget_per_day: float
+    budget_per_person: float
+    budget_level: str
+
+
+@dataclass(frozen=True, eq=False)
+class WeatherInfo(Record):
+    __slots__ = ("destination", "season", "travel_month", "temperature", "weather_conditions",
+                 "packing_recommendations", "average_rainfall", "daily_sunlight", "special_notes")
+    destination: str
+    season: str
+    travel_month: str
+    temperature: str
+    weather_conditions: str
+    packing_recommendations: Tuple[str, ...]
+    average_rainfall: str
+    daily_sunlight: str
+    special_notes: str
+
+
+def to_plain(value: Any) -> Any:
+    """Convert records (recursively) into the plain dicts and lists tools used to return"""
+    if isinstance(value, (Record, Amounts)):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """``default=`` hook letting json.dumps serialize records"""
+    if isinstance(value, (Record, Amounts)):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,199 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import importlib
+import inspect
+import json
+import threading
+
+
+class LazyTool:
+    """A travel planning tool whose implementation is imported on first call.
+
+    The JSON schema is declared up front, so tools can be bound to an LLM
+    without importing heavy implementation modules (matplotlib, numpy, ...).
+
+    ``depends_on`` maps an argument name to ``(tool_name, result_key)``: when
+    both tools are called in the same batch, this tool runs after ``tool_name``
+    and the argument is taken from its result (the whole result when
+    ``result_key`` is None), since the caller could not have seen it yet.
+    """
+
+    def __init__(self, name: str, module: str, description: str, parameters: Dict[str, Any],
+                 depends_on: Dict[str, Tuple[str, Optional[str]]] = None):
+        self.name = name
+        self.__name__ = name
+        self.module = module
+        self.description = description
+        self.parameters = parameters
+        self.depends_on = depends_on or {}
+        self._func: Optional[Callable] = None
+        self._lock = threading.Lock()
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        """OpenAI function-calling schema accepted by ``bind_tools``"""
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": self.parameters,
+            },
+        }
+
+    @property
+    def loaded(self) -> bool:
+        return self._func is not None
+
+    def load(self) -> Callable:
+        """Import the implementation module and return the tool function"""
+        if self._func is None:
+            with self._lock:
+                if self._func is None:
+                    module = importlib.import_module("." + self.module, __package__)
+                    self._func = getattr(module, self.name)
+        return self._func
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def canonical_args(self, args: Dict[str, Any]) -> Optional[str]:
+        """Serialize call arguments with the function defaults applied.
+
+        Two calls with equal canonical args produce the same result. Returns
+        None when the arguments do not bind to the tool's signature.
+        """
+        try:
+            bound = inspect.signature(self.load()).bind(**args)
+        except TypeError:
+            return None
+        bound.apply_defaults()
+        return json.dumps(bound.arguments, sort_keys=True, default=str)
+
+    @property
+    def dependency_names(self) -> frozenset:
+        """Names of the tools this tool must run after"""
+        return frozenset(tool_name for tool_name, _ in self.depends_on.values())
+
+    def __repr__(self) -> str:
+        return f"LazyTool({self.name!r}, loaded={self.loaded})"
+
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+TOOL_REGISTRY: Dict[str, LazyTool] = {tool.name: tool for tool in [
+    LazyTool(
+        "research_destination", "destination_research",
+        "Research destination attractions and activities",
+        {
+            "type": "object",
+            "properties": {
+                "destination": {"type": "string"},
+                "interests": _STRING_LIST,
+            },
+            "required": ["destination"],
+        },
+    ),
+    LazyTool(
+        "build_daily_itinerary", "itinerary_builder",
+        "Build a detailed daily itinerary",
+        {
+            "type": "object",
+            "properties": {
+                "destination": {"type": "string"},
+                "duration": {"type": "integer"},
+                "travel_style": {"type": "string"},
+                "attractions": _STRING_LIST,
+                "coordinates": {
+                    "type": "object",
+                    "description": "Optional attraction name -> [lat, lon]; enables geo routing of days",
+                    "additionalProperties": {"type": "array", "items": {"type": "number"}},
+                },
+                "day_minutes": {"type": "number", "description": "Time budget per day when routing"},
+            },
+            "required": ["destination", "duration", "travel_style", "attractions"],
+        },
+        depends_on={"attractions": ("research_destination", "attractions")},
+    ),
+    LazyTool(
+        "calculate_budget_breakdown", "budget_calculator",
+        "Calculate detailed budget breakdown for a trip",
+        {
+            "type": "object",
+            "properties": {
+                "destination": {"type": "string"},
+                "duration": {"type": "integer"},
+                "total_budget": {"type": "number"},
+                "travel_style": {"type": "string"},
+                "traveler_count": {"type": "integer"},
+            },
+            "required": ["destination", "duration", "total_budget", "travel_style"],
+        },
+    ),
+    LazyTool(
+        "get_seasonal_weather", "weather_checker",
+        "Get seasonal weather information for a destination",
+        {
+            "type": "object",
+            "properties": {
+                "destination": {"type": "string"},
+                "travel_month": {"type": "string"},
+            },
+            "required": ["destination"],
+        },
+    ),
+    LazyTool(
+        "generate_itinerary_map", "map_visualizer",
+        "Generate a visual itinerary map/timeline",
+        {
+            "type": "object",
+            "properties": {
+                "destination": {"type": "string"},
+                "itinerary": {"type": "array", "items": {"type": "object"}},
+                "attractions": _STRING_LIST,
+                "days_per_page": {"type": "integer", "minimum": 1},
+                "output": {"type": "string", "enum": ["auto", "png", "pdf"],
+                           "description": "png pages, one multi-page pdf, or auto (pdf only when paged)"},
+            },
+            "required": ["destination", "itinerary"],
+        },
+        depends_on={
+            "itinerary": ("build_daily_itinerary", None),
+            "attractions": ("research_destination", "attractions"),
+        },
+    ),
+    LazyTool(
+        "generate_budget_chart", "budget_calculator",
+        "Generate a pie chart visualization of the budget breakdown",
+        {
+            "type": "object",
+            "properties": {
+                "budget_breakdown": {"type": "object", "additionalProperties": {"type": "number"}},
+            },
+            "required": ["budget_breakdown"],
+        },
+        depends_on={"budget_breakdown": ("calculate_budget_breakdown", "budget_breakdown")},
+    ),
+    LazyTool(
+        "generate_interactive_map", "interactive_map",
+        "Generate an interactive HTML (or GeoJSON) map of the attractions and daily routes",
+        {
+            "type": "object",
+            "properties": {
+                "destination": {"type": "string"},
+                "attractions": _STRING_LIST,
+                "itinerary": {"type": "array", "items": {"type": "object"}},
+                "output": {"type": "string", "enum": ["html", "geojson"]},
+            },
+            "required": ["destination"],
+        },
+        depends_on={
+            "attractions": ("research_destination", "attractions"),
+            "itinerary": ("build_daily_itinerary", None),
+        },
+    ),
+]}
+
+
+def get_tools() -> List[LazyTool]:
+    """Return all registered tools in registration order"""
+    return list(TOOL_REGISTRY.values())
@@ -0,0 +1,213 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import json
+import os
+import threading
+
+from .records import Amounts, Record
+
+
+def _canonical_default(value: Any) -> Any:
+    # Records hash like the plain dicts they replace, so both share cache entries
+    if isinstance(value, (Record, Amounts)):
+        return value.to_dict()
+    return str(value)
+
+
+def make_cache_key(kind: str, payload: Any) -> str:
+    """Build a canonical content hash for a render request"""
+    canonical = json.dumps({"kind": kind, "payload": payload}, sort_keys=True, separators=(",", ":"),
+                           default=_canonical_default)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def share_signature(values: Dict[str, float], precision: int = 12) -> Dict[str, float]:
+    """Express amounts as shares of their total so proportional inputs hash the same"""
+    total = sum(values.values())
+    if not total:
+        return dict(values)
+    return {key: round(value / total, precision) for key, value in values.items()}
+
+
+class RenderCache:
+    """Two-tier (memory LRU + optional disk) cache for rendered charts.
+
+    Values are strings, such as serialized artifact references. Both tiers
+    are bounded by total size in bytes and evict least recently used entries
+    first.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._scan_disk()
+
+    def _scan_disk(self):
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".cache"):
+                continue
+            stat = os.stat(os.path.join(self.disk_dir, name))
+            entries.append((stat.st_mtime, name[:-len(".cache")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._remove_files(self._evict_disk())
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + ".cache")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached value, promoting disk hits into memory"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+            if key not in self._disk:
+                self.misses += 1
+                return None
+
+        # Disk I/O happens outside the lock, so memory hits on other threads
+        # never wait behind a file read
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = f.read().decode("utf-8")
+            os.utime(path)
+        except OSError:
+            value = None
+        with self._lock:
+            if value is None:
+                if key in self._disk:
+                    self._disk_bytes -= self._disk.pop(key)
+                self.misses += 1
+                return None
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._store_memory(key, value)
+            self.hits += 1
+            self.disk_hits += 1
+            return value
+
+    def put(self, key: str, value: str):
+        """Store a value in memory and, when configured, on disk"""
+        with self._lock:
+            self._store_memory(key, value)
+            if not self.disk_dir or key in self._disk:
+                return
+
+        # Write outside the lock (readers never see a partial file thanks to
+        # os.replace), then take the lock only to index the entry. Sizes are
+        # in encoded bytes, matching what _scan_disk reads back from stat().
+        data = value.encode("utf-8")
+        path = self._disk_path(key)
+        tmp_path = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            if key in self._disk:
+                return  # another thread stored the same entry meanwhile
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            evicted = self._evict_disk()
+        self._remove_files(evicted)
+
+    def get_or_render(self, key: str, render: Callable[[], str]) -> str:
+        """Return the cached value for key, rendering and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = render()
+            self.put(key, value)
+        return value
+
+    def _store_memory(self, key: str, value: str):
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = value
+        self._memory_bytes += len(value)
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _evict_disk(self) -> List[str]:
+        # Called with the lock held; returns the evicted keys, whose files the
+        # caller removes after releasing it
+        evicted = []
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            evicted.append(key)
+        return evicted
+
+    def _remove_files(self, keys: List[str]):
+        for key in keys:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Drop every cached entry (including disk files) and reset counters"""
+        with self._lock:
+            keys = list(self._disk)
+            self._memory.clear()
+            self._disk.clear()
+            self._memory_bytes = self._disk_bytes = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self._remove_files(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current tier sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+_render_cache = RenderCache()
+
+
+def get_render_cache() -> RenderCache:
+    """Return the process-wide chart render cache"""
+    return _render_cache
+
+
+def configure_render_cache(**kwargs) -> RenderCache:
+    """Replace the process-wide render cache, e.g. to enable the disk tier"""
+    global _render_cache
+    _render_cache = RenderCache(**kwargs)
+    return _render_cache
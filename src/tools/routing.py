@@ -0,0 +1,215 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import math
+
+# Kilometres per degree of latitude / of longitude at the equator
+KM_PER_DEG_LAT = 110.57
+KM_PER_DEG_LON = 111.32
+
+DEFAULT_DAY_MINUTES = 8 * 60
+DEFAULT_VISIT_MINUTES = 90
+DEFAULT_SPEED_KMH = 20.0  # door-to-door city travel, walking and transit mixed
+
+# Days with more stops than this only get segments of up to TWO_OPT_WINDOW
+# stops reversed, so 2-opt stays linear (not quadratic) in the day's length
+TWO_OPT_FULL_STOPS = 64
+TWO_OPT_WINDOW = 32
+# Segment reversals tried per day across all passes; long days narrow the
+# window and stop early instead of scaling with the number of stops
+TWO_OPT_MAX_CHECKS = 20_000
+
+
+def project(coordinates: Sequence[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """Project (lat, lon) pairs onto a local plane in kilometres.
+
+    An equirectangular projection around the mean latitude is accurate to well
+    under a percent at city scale, and keeps distances plain Euclidean.
+    """
+    if not coordinates:
+        return []
+    mean_lat = sum(lat for lat, _ in coordinates) / len(coordinates)
+    lon_scale = KM_PER_DEG_LON * math.cos(math.radians(mean_lat))
+    return [(lon * lon_scale, lat * KM_PER_DEG_LAT) for lat, lon in coordinates]
+
+
+class GridIndex:
+    """Uniform grid over projected points answering nearest-remaining-point queries.
+
+    Cells are sized for about two points each, so a nearest neighbour search
+    only scans a few rings of cells around the query point. Cells are kept in
+    a flat row-major list, so lookups are plain list indexing. Points are
+    removed as they get scheduled; ``indices`` restricts the index to a subset.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, float]], indices: Optional[Iterable[int]] = None):
+        self.points = points
+        indices = list(range(len(points)) if indices is None else indices)
+        xs = [points[i][0] for i in indices]
+        ys = [points[i][1] for i in indices]
+        self.min_x, self.min_y = min_x, min_y = min(xs), min(ys)
+        width = max(max(xs) - min_x, 1e-9)
+        height = max(max(ys) - min_y, 1e-9)
+        self.cell = cell = max(math.sqrt(width * height / max(len(indices) / 2, 1)), 1e-6)
+        self.cols = cols = int(width / cell) + 1
+        self.rows = int(height / cell) + 1
+        self.cells: List[List[int]] = [[] for _ in range(cols * self.rows)]
+        cells = self.cells
+        for index, x, y in zip(indices, xs, ys):
+            cells[int((y - min_y) / cell) * cols + int((x - min_x) / cell)].append(index)
+        self.size = self.remaining = len(indices)
+
+    def _cell_of(self, point: Tuple[float, float]) -> int:
+        return (int((point[1] - self.min_y) / self.cell) * self.cols
+                + int((point[0] - self.min_x) / self.cell))
+
+    def remaining_indices(self) -> List[int]:
+        return [index for cell in self.cells for index in cell]
+
+    def remove(self, index: int):
+        self.cells[self._cell_of(self.points[index])].remove(index)
+        self.remaining -= 1
+
+    def nearest(self, point: Tuple[float, float]) -> Optional[int]:
+        """Return the index of the closest remaining point, or None if none remain"""
+        if not self.remaining:
+            return None
+        qx, qy = point
+        cell, cells, points = self.cell, self.cells, self.points
+        cols, rows = self.cols, self.rows
+        # Query points outside the grid (possible after a re-grid) start from the
+        # closest cell inside it; projecting onto the grid never increases
+        # distances, so the ring bound below still holds
+        cx = min(max(int((qx - self.min_x) / cell), 0), cols - 1)
+        cy = min(max(int((qy - self.min_y) / cell), 0), rows - 1)
+        # Distance from the query point to the nearest side of its own cell
+        margin = max(min(qx - self.min_x - cx * cell, (cx + 1) * cell - qx + self.min_x,
+                         qy - self.min_y - cy * cell, (cy + 1) * cell - qy + self.min_y), 0.0)
+        best, best_sq = None, math.inf
+        # Past this ring every cell of the grid has been visited
+        max_ring = max(cx, cols - 1 - cx, cy, rows - 1 - cy)
+        for ring in range(max_ring + 1):
+            # Every point in this ring is at least (ring - 1) cells plus the margin away
+            if ring and best is not None and ((ring - 1) * cell + margin) ** 2 > best_sq:
+                break
+            for key in _ring_cells(cx, cy, ring, cols, rows):
+                for index in cells[key]:
+                    px, py = points[index]
+                    dist_sq = (px - qx) * (px - qx) + (py - qy) * (py - qy)
+                    if dist_sq < best_sq:
+                        best, best_sq = index, dist_sq
+        return best
+
+
+def _ring_cells(cx: int, cy: int, ring: int, cols: int, rows: int) -> List[int]:
+    """Flat indices of the in-grid cells exactly ``ring`` cells from (cx, cy)"""
+    if ring == 0:
+        return [cy * cols + cx]
+    left, right = max(cx - ring, 0), min(cx + ring, cols - 1)
+    top, bottom = max(cy - ring + 1, 0), min(cy + ring - 1, rows - 1)
+    keys = []
+    for gy in (cy - ring, cy + ring):
+        if 0 <= gy < rows:
+            keys.extend(range(gy * cols + left, gy * cols + right + 1))
+    for gx in (cx - ring, cx + ring):
+        if 0 <= gx < cols:
+            keys.extend(range(top * cols + gx, bottom * cols + gx + 1, cols))
+    return keys
+
+
+def path_length(order: Sequence[int], points: Sequence[Tuple[float, float]]) -> float:
+    return sum(math.dist(points[a], points[b]) for a, b in zip(order, order[1:]))
+
+
+def two_opt(order: List[int], points: Sequence[Tuple[float, float]], max_passes: int = 20,
+            window: Optional[int] = None, max_checks: int = TWO_OPT_MAX_CHECKS) -> List[int]:
+    """Improve an open path by reversing segments while that shortens it
+
+    Only segments of up to ``window`` stops are tried; by default every
+    segment for paths of up to TWO_OPT_FULL_STOPS stops, else TWO_OPT_WINDOW,
+    narrowed so a pass fits in ``max_checks``. Passes stop once ``max_checks``
+    reversals have been tried, so long paths (e.g. a day of many short
+    visits) keep mostly their nearest-neighbour order instead of going
+    quadratic.
+    """
+    order = list(order)
+    n = len(order)
+    if n < 3:
+        return order
+    if window is None:
+        window = n if n <= TWO_OPT_FULL_STOPS else TWO_OPT_WINDOW
+        window = max(2, min(window, max_checks // n))
+    path = [points[index] for index in order]
+    dist = math.dist
+    checks = 0
+    for _ in range(max_passes):
+        improved = False
+        for i in range(0, n - 1):
+            for j in range(i + 1, min(n, i + window)):
+                # Reversing path[i..j] swaps the edges entering i and leaving j
+                before = after = 0.0
+                if i > 0:
+                    before += dist(path[i - 1], path[i])
+                    after += dist(path[i - 1], path[j])
+                if j < n - 1:
+                    before += dist(path[j], path[j + 1])
+                    after += dist(path[i], path[j + 1])
+                if after < before - 1e-12:
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    path[i:j + 1] = reversed(path[i:j + 1])
+                    improved = True
+            checks += min(n, i + window) - i - 1
+        if not improved or checks >= max_checks:
+            break
+    return order
+
+
+def plan_routes(names: Sequence[str], coordinates: Mapping[str, Sequence[float]], days: int,
+                day_minutes: float = DEFAULT_DAY_MINUTES,
+                visit_minutes: Optional[Mapping[str, float]] = None,
+                speed_kmh: float = DEFAULT_SPEED_KMH) -> List[Tuple[Tuple[str, ...], float]]:
+    """Group attractions into at most ``days`` compact day routes.
+
+    Attractions are taken in priority order (the order of ``names``): each day
+    starts from the highest-priority attraction not yet scheduled and grows by
+    nearest neighbour until the day's time budget (visits plus travel) is
+    spent; each day's order is then tightened with 2-opt. Names without
+    coordinates are skipped, and attractions that do not fit in ``days`` are
+    left out. Returns ``(route, travel_km)`` per day.
+    """
+    names = [name for name in dict.fromkeys(names) if name in coordinates]
+    if not names or days <= 0:
+        return []
+    points = project([(float(coordinates[name][0]), float(coordinates[name][1])) for name in names])
+    visit_minutes = visit_minutes or {}
+    visit = [float(visit_minutes.get(name, DEFAULT_VISIT_MINUTES)) for name in names]
+    minutes_per_km = 60.0 / speed_kmh
+
+    index = GridIndex(points)
+    scheduled = [False] * len(names)
+    next_seed = 0
+    routes = []
+    for _ in range(days):
+        while next_seed < len(names) and scheduled[next_seed]:
+            next_seed += 1
+        if next_seed == len(names):
+            break
+        day = [next_seed]
+        scheduled[next_seed] = True
+        index.remove(next_seed)
+        used = visit[next_seed]
+        while True:
+            if index.remaining and index.remaining * 4 < index.size:
+                # Mostly empty grids make searches walk empty cells; re-grid the rest
+                index = GridIndex(points, index.remaining_indices())
+            candidate = index.nearest(points[day[-1]])
+            if candidate is None:
+                break
+            cost = math.dist(points[day[-1]], points[candidate]) * minutes_per_km + visit[candidate]
+            if used + cost > day_minutes:
+                break
+            day.append(candidate)
+            scheduled[candidate] = True
+            index.remove(candidate)
+            used += cost
+        day = two_opt(day, points)
+        routes.append((tuple(names[i] for i in day), path_length(day, points)))
+    return routes
@@ -1,240 +1,200 @@
-import requests
-from typing import Dict, List
-import datetime
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+import threading
 
-def get_seasonal_weather(destination: str, travel_month: str = None) -> Dict[str, any]:
-    """Get seasonal weather information for a destination"""
-    
-    # Seasonal weather patterns by destination
-    seasonal_data = {
-        "paris": {
-            "spring": {
-                "temperature": "10-18°C",
-                "conditions": "Mild with occasional rain",
-                "recommendations": ["Light jacket", "Umbrella", "Layered clothing"],
-                "avg_rainfall": "Moderate",
-                "sunlight_hours": "12-14 hours"
-            },
-            "summer": {
-                "temperature": "18-25°C", 
-                "conditions": "Warm and pleasant",
-                "recommendations": ["Light clothing", "Sunglasses", "Sun protection"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "14-16 hours"
-            },
-            "autumn": {
-                "temperature": "8-15°C",
-                "conditions": "Cool and crisp",
-                "recommendations": ["Sweaters", "Waterproof jacket", "Comfortable shoes"],
-                "avg_rainfall": "Moderate", 
-                "sunlight_hours": "10-12 hours"
-            },
-            "winter": {
-                "temperature": "2-8°C",
-                "conditions": "Cold with possible snow",
-                "recommendations": ["Warm coat", "Scarf", "Gloves", "Boots"],
-                "avg_rainfall": "Low to Moderate",
-                "sunlight_hours": "8-9 hours"
-            }
-        },
-        "tokyo": {
-            "spring": {
-                "temperature": "12-20°C",
-                "conditions": "Mild with cherry blossoms",
-                "recommendations": ["Light layers", "Comfortable walking shoes", "Camera"],
-                "avg_rainfall": "Moderate",
-                "sunlight_hours": "12-14 hours"
-            },
-            "summer": {
-                "temperature": "22-30°C",
-                "conditions": "Hot and humid",
-                "recommendations": ["Light breathable clothing", "Hat", "Water bottle", "Sunscreen"],
-                "avg_rainfall": "High",
-                "sunlight_hours": "13-15 hours"
-            },
-            "autumn": {
-                "temperature": "15-22°C", 
-                "conditions": "Cool and comfortable",
-                "recommendations": ["Light jacket", "Layered clothing", "Walking shoes"],
-                "avg_rainfall": "Moderate",
-                "sunlight_hours": "11-13 hours"
-            },
-            "winter": {
-                "temperature": "2-10°C",
-                "conditions": "Cold and dry",
-                "recommendations": ["Warm coat", "Thermal layers", "Scarf", "Gloves"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "9-10 hours"
-            }
-        },
-        "bali": {
-            "dry_season": {
-                "temperature": "26-32°C",
-                "conditions": "Warm and sunny",
-                "recommendations": ["Light clothing", "Swimwear", "Sunscreen", "Hat"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "12 hours",
-                "season_note": "Dry Season (April-September)"
-            },
-            "wet_season": {
-                "temperature": "24-30°C", 
-                "conditions": "Warm with heavy rainfall",
-                "recommendations": ["Light rain jacket", "Quick-dry clothing", "Waterproof bag"],
-                "avg_rainfall": "High",
-                "sunlight_hours": "10-11 hours", 
-                "season_note": "Wet Season (October-March)"
-            }
-        },
-        # PAKISTAN CITIES - ADDED NEW DATA WITHOUT REMOVING ORIGINAL
-        "islamabad": {
-            "spring": {
-                "temperature": "15-25°C",
-                "conditions": "Pleasant with blooming flowers",
-                "recommendations": ["Light jacket", "Comfortable shoes", "Sunglasses"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "12-14 hours"
-            },
-            "summer": {
-                "temperature": "25-35°C", 
-                "conditions": "Warm with occasional rain",
-                "recommendations": ["Light clothing", "Umbrella", "Sunscreen"],
-                "avg_rainfall": "Moderate",
-                "sunlight_hours": "14-15 hours"
-            },
-            "autumn": {
-                "temperature": "18-28°C",
-                "conditions": "Mild and pleasant",
-                "recommendations": ["Light layers", "Walking shoes", "Camera"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "11-13 hours"
-            },
-            "winter": {
-                "temperature": "5-18°C",
-                "conditions": "Cool and crisp",
-                "recommendations": ["Warm jacket", "Sweaters", "Comfortable boots"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "10-11 hours"
-            }
-        },
-        "karachi": {
-            "summer": {
-                "temperature": "28-35°C",
-                "conditions": "Hot and humid",
-                "recommendations": ["Light cotton clothing", "Sunscreen", "Water bottle", "Hat"],
-                "avg_rainfall": "Very Low",
-                "sunlight_hours": "13-14 hours"
-            },
-            "winter": {
-                "temperature": "15-25°C",
-                "conditions": "Mild and pleasant",
-                "recommendations": ["Light jacket", "Comfortable clothing", "Sunglasses"],
-                "avg_rainfall": "Very Low", 
-                "sunlight_hours": "10-12 hours"
-            }
+from .catalog import get_catalog, normalize_destination
+from .records import WeatherInfo
+
+# Month to season mapping for each climate regime in the catalog
+CLIMATE_REGIMES = {
+    "four_season": {
+        "months": {
+            "december": "winter", "january": "winter", "february": "winter",
+            "march": "spring", "april": "spring", "may": "spring",
+            "june": "summer", "july": "summer", "august": "summer",
+            "september": "autumn", "october": "autumn", "november": "autumn"
         },
-        "lahore": {
-            "summer": {
-                "temperature": "25-40°C",
-                "conditions": "Hot and dry",
-                "recommendations": ["Light breathable fabric", "Hat", "Sunscreen", "Water"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "14-15 hours"
-            },
-            "winter": {
-                "temperature": "5-20°C", 
-                "conditions": "Cool with fog",
-                "recommendations": ["Warm layers", "Jacket", "Scarf", "Comfortable shoes"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "9-11 hours"
-            }
+        "default": "spring"
+    },
+    # Pakistan cities mainly have summer/winter seasons
+    "two_season": {
+        "months": {
+            "november": "winter", "december": "winter", "january": "winter",
+            "february": "winter", "march": "winter",
+            "april": "summer", "may": "summer", "june": "summer",
+            "july": "summer", "august": "summer", "september": "summer", "october": "summer"
         },
-        "hunza": {
-            "summer": {
-                "temperature": "10-25°C",
-                "conditions": "Pleasant with clear skies",
-                "recommendations": ["Layered clothing", "Warm jacket", "Sunglasses", "Hiking boots"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "14-16 hours"
-            },
-            "winter": {
-                "temperature": "-10 to 10°C",
-                "conditions": "Cold with snow",
-                "recommendations": ["Heavy winter coat", "Thermal wear", "Gloves", "Warm boots"],
-                "avg_rainfall": "Moderate snow",
-                "sunlight_hours": "9-10 hours"
-            }
+        "default": "summer"
+    },
+    # Tropical climate (Bali) with dry and wet seasons
+    "tropical": {
+        "months": {
+            "april": "dry_season", "may": "dry_season", "june": "dry_season",
+            "july": "dry_season", "august": "dry_season", "september": "dry_season",
+            "october": "wet_season", "november": "wet_season", "december": "wet_season",
+            "january": "wet_season", "february": "wet_season", "march": "wet_season"
         },
-        "swat": {
-            "summer": {
-                "temperature": "15-30°C", 
-                "conditions": "Pleasant with cool breezes",
-                "recommendations": ["Light layers", "Comfortable shoes", "Light jacket", "Camera"],
-                "avg_rainfall": "Low",
-                "sunlight_hours": "13-15 hours"
-            },
-            "winter": {
-                "temperature": "-5 to 15°C",
-                "conditions": "Cold with snow in mountains",
-                "recommendations": ["Warm clothing", "Winter jacket", "Boots", "Gloves"],
-                "avg_rainfall": "Moderate snow",
-                "sunlight_hours": "9-11 hours"
-            }
-        }
+        "default": "wet_season"
     }
+}
+
+# Month name to month index; index 0 stands for a missing or unknown month
+MONTH_INDEX = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12
+}
+
+# Default response for unknown destinations
+DEFAULT_WEATHER = WeatherInfo(
+    destination=None,
+    season="unknown",
+    travel_month=None,
+    temperature="15-25°C",
+    weather_conditions="Moderate weather conditions",
+    packing_recommendations=("Versatile clothing", "Comfortable shoes", "Light jacket"),
+    average_rainfall="Moderate",
+    daily_sunlight="10-12 hours",
+    special_notes="Check local weather forecast before travel"
+)
+
+
+def _compile_weather_entries(profile: Mapping[str, Any]) -> Tuple[WeatherInfo, ...]:
+    """Prebuild a destination's results for every month index (0 = missing or unknown month)"""
+    month_names = [None] + list(MONTH_INDEX)
+    regime = CLIMATE_REGIMES[profile["climate"]]
+    entries = []
+    for month_name in month_names:
+        season_key = regime["months"].get(month_name, regime["default"])
+        weather_info = profile["seasons"].get(season_key)
+        if not weather_info:
+            entries.append(DEFAULT_WEATHER)
+            continue
+        entries.append(WeatherInfo(
+            destination=None,
+            season=season_key,
+            travel_month=None,
+            temperature=weather_info["temperature"],
+            weather_conditions=weather_info["conditions"],
+            packing_recommendations=tuple(weather_info["recommendations"]),
+            average_rainfall=weather_info["avg_rainfall"],
+            daily_sunlight=weather_info["sunlight_hours"],
+            special_notes=weather_info.get("season_note", "")
+        ))
+    return tuple(entries)
+
+
+# Compiled entries per destination id, built on first use. Each is kept with the
+# catalog profile it came from, so a reloaded data pack is recompiled.
+MAX_COMPILED_DESTINATIONS = 4096
+_compiled: "OrderedDict[str, Tuple[Mapping[str, Any], Tuple[WeatherInfo, ...]]]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def weather_entry(destination_id: str, month: int) -> WeatherInfo:
+    """Return the shared seasonal entry for a destination id and month index"""
+    profile = get_catalog().get(destination_id)
+    if profile is None:
+        return DEFAULT_WEATHER
+    with _compiled_lock:
+        cached = _compiled.get(destination_id)
+        if cached is not None and cached[0] is profile:
+            _compiled.move_to_end(destination_id)
+            return cached[1][month]
+    entries = _compile_weather_entries(profile)
+    with _compiled_lock:
+        _compiled[destination_id] = (profile, entries)
+        while len(_compiled) > MAX_COMPILED_DESTINATIONS:
+            _compiled.popitem(last=False)
+    return entries[month]
+
+
+def month_index(travel_month: str = None) -> int:
+    """Return the 1-12 index of a month name, or 0 when missing or unknown"""
+    return MONTH_INDEX.get(travel_month.lower(), 0) if travel_month else 0
+
+
+def _weather_result(entry: WeatherInfo, destination: str, travel_month: str) -> WeatherInfo:
+    # Everything but the two request fields is shared with the table entry
+    return WeatherInfo(destination, entry.season, travel_month, entry.temperature, entry.weather_conditions,
+                       entry.packing_recommendations, entry.average_rainfall, entry.daily_sunlight,
+                       entry.special_notes)
+
+
+def _live_weather_result(entry: WeatherInfo, forecast: Dict[str, Any], destination: str,
+                         travel_month: str) -> WeatherInfo:
+    rain = forecast["rain_mm_per_day"]
+    if rain < 1:
+        conditions, rainfall = "Mostly dry", "Low"
+    elif rain < 5:
+        conditions, rainfall = "Showers likely", "Moderate"
+    else:
+        conditions, rainfall = "Wet with frequent rain", "High"
+    packing = entry.packing_recommendations
+    if rain >= 1 and not any("umbrella" in item.lower() for item in packing):
+        packing = packing + ("Umbrella",)
+    return WeatherInfo(destination, entry.season, travel_month, forecast["temperature"], conditions, packing,
+                       rainfall, f"{forecast['daylight_hours']:.0f} hours",
+                       f"Live {forecast['days']}-day forecast from {forecast['start']}")
+
+
+_weather_provider = None
+
+
+def get_weather_provider():
+    """Return the live weather provider, or None when only seasonal data is used"""
+    return _weather_provider
+
+
+def set_weather_provider(provider):
+    """Install a live weather provider (see live_weather), or None for seasonal data only"""
+    global _weather_provider
+    _weather_provider = provider
+    return provider
+
+
+def _lookup(destination_id: str, destination: str, travel_month: Optional[str]) -> WeatherInfo:
+    month = month_index(travel_month)
+    entry = weather_entry(destination_id, month)
+    provider = _weather_provider
+    # A forecast only describes the coming days: use it for trips this month
+    if provider is not None and month in (0, date.today().month):
+        forecast = provider.forecast(destination)
+        if forecast is not None:
+            return _live_weather_result(entry, forecast, destination, travel_month)
+    return _weather_result(entry, destination, travel_month)
+
+
+def get_seasonal_weather(destination: str, travel_month: str = None) -> Dict:
+    """Get seasonal weather information for a destination
     
-    # Month to season mapping
-    month_to_season = {
-        "december": "winter", "january": "winter", "february": "winter",
-        "march": "spring", "april": "spring", "may": "spring", 
-        "june": "summer", "july": "summer", "august": "summer",
-        "september": "autumn", "october": "autumn", "november": "autumn"
-    }
+    With a live provider installed (set_weather_provider), trips in the
+    current month get the live forecast; the seasonal table is the fallback.
+    """
     
-    # Handle Bali separately (tropical climate)
-    if destination.lower() == "bali":
-        if travel_month and travel_month.lower() in ["april", "may", "june", "july", "august", "september"]:
-            season_key = "dry_season"
-        else:
-            season_key = "wet_season"
-    # Handle Pakistan cities with different climate patterns
-    elif destination.lower() in ["karachi", "lahore", "hunza", "swat"]:
-        # Pakistan cities mainly have summer/winter seasons
-        if travel_month and travel_month.lower() in ["november", "december", "january", "february", "march"]:
-            season_key = "winter"
-        else:
-            season_key = "summer"
-    else:
-        # For other destinations
-        if travel_month:
-            season_key = month_to_season.get(travel_month.lower(), "spring")
-        else:
-            season_key = "spring"  # Default
+    return get_seasonal_weather_record(destination, travel_month).to_dict()
+
+
+def get_seasonal_weather_many(pairs: Iterable[Tuple[str, str]]) -> List[Dict]:
+    """Get seasonal weather for many (destination, travel_month) pairs in one call"""
     
-    # Get weather data
-    if destination.lower() in seasonal_data:
-        weather_info = seasonal_data[destination.lower()].get(season_key, {})
-        if weather_info:
-            return {
-                "destination": destination,
-                "season": season_key,
-                "travel_month": travel_month,
-                "temperature": weather_info["temperature"],
-                "weather_conditions": weather_info["conditions"],
-                "packing_recommendations": weather_info["recommendations"],
-                "average_rainfall": weather_info["avg_rainfall"],
-                "daily_sunlight": weather_info["sunlight_hours"],
-                "special_notes": weather_info.get("season_note", "")
-            }
+    return [record.to_dict() for record in get_seasonal_weather_records(pairs)]
+
+
+def get_seasonal_weather_record(destination: str, travel_month: str = None) -> WeatherInfo:
+    """Like get_seasonal_weather, as a compact read-only WeatherInfo record"""
+    
+    return _lookup(normalize_destination(destination), destination, travel_month)
+
+
+def get_seasonal_weather_records(pairs: Iterable[Tuple[str, str]]) -> List[WeatherInfo]:
+    """Like get_seasonal_weather_many, as WeatherInfo records sharing the seasonal table's values"""
     
-    # Default response for unknown destinations
-    return {
-        "destination": destination,
-        "season": "unknown",
-        "travel_month": travel_month,
-        "temperature": "15-25°C",
-        "weather_conditions": "Moderate weather conditions",
-        "packing_recommendations": ["Versatile clothing", "Comfortable shoes", "Light jacket"],
-        "average_rainfall": "Moderate",
-        "daily_sunlight": "10-12 hours",
-        "special_notes": "Check local weather forecast before travel"
-    }
\ No newline at end of file
+    destination_ids = {}
+    results = []
+    for destination, travel_month in pairs:
+        destination_id = destination_ids.get(destination)
+        if destination_id is None:
+            destination_id = destination_ids[destination] = normalize_destination(destination)
+        results.append(_lookup(destination_id, destination, travel_month))
+    return results
@@ -3,12 +3,16 @@
 Fixed test for the agent structure
 """
 
+import logging
 import sys
 import os
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(__file__))
 
+# Show the agent's progress log lines, as the script's output did before
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 print("🧪 Testing Agent Structure...")
 
 try: